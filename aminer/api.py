@@ -4,15 +4,30 @@ aminer/api.py
 本模块封装了与AMiner平台相关的API调用方法，便于在Python项目中集成学者、论文、专利等信息的检索功能。
 
 包含的API及简要介绍：
-- get_token: 读取AMiner API的Token（从aminer/TOKEN文件）。
+- get_token: 获取AMiner API的Token（环境变量AMINER_TOKEN或aminer/TOKEN文件，内存缓存）。
 - search_person_by_name: 按姓名、机构等条件检索学者信息。
 - search_paper_by_title: 按论文标题检索论文详细信息。
 - search_papers_by_scholar_free: 根据学者ID（person_id）检索其论文（免费API）。
+- iter_paper_pages / iter_papers_by_scholar: 按页惰性遍历学者的全部论文，支持预取下一页。
+- stream_papers_by_scholar: 单页论文检索的流式版本，边下载边逐条产出论文，内存占用不随页大小增长。
 - search_patents_by_scholar_free: 根据学者ID（person_id）检索其专利（免费API）。
+- iter_patent_pages / iter_patents_by_scholar: 读取首页 hitsTotal 后并发拉取剩余页，按 pub_date 顺序产出。
+- stream_patents_by_scholar: 单页专利检索的流式版本。
 - search_papers_by_scholar_paid: 根据学者ID（person_id）检索其论文（付费API）。
+- get_person_detail_by_id: 根据学者ID获取学者详细信息。
+- get_person_details_by_ids: 批量获取学者详细信息，每次请求携带多个ID，并报告缺失的ID。
+- 检索论文/专利与获取学者详情的函数支持 as_records=True，返回 aminer/records.py 中的类型化记录而非dict。
 
 注意事项：
-- 需将Token存放于aminer/TOKEN文件中。
+- 需将Token存放于aminer/TOKEN文件中，或通过环境变量AMINER_TOKEN提供；修改文件后无需重启即可生效。
+- 所有请求经由 aminer/client.py 的共享客户端发出，按主机复用 keep-alive 连接池。
+- search_paper_by_title、search_papers_by_scholar_free、search_patents_by_scholar_free、get_person_detail_by_id 与
+  get_person_details_by_ids（逐个ID）经 aminer/cache.py 的共享缓存调用，各接口的过期时间见 cache.DEFAULT_TTLS；
+  命中时返回的dict为缓存中的共享对象，调用方不应修改。search_person_by_name 返回原始响应对象，不缓存。
+- 请求构造（_xxx_request）与响应解析（_parse_xxx_response）与发送解耦，aminer/async_api.py 复用同一套实现。
+- AMiner 各服务的根地址可通过环境变量 AMINER_BASE_URL（全部服务）或 AMINER_DATACENTER_URL / AMINER_APIV2_URL /
+  AMINER_SEARCH_URL（单个服务）覆盖，例如指向本地替身服务 aminer/fake_server.py 进行压测。
+- 设置 AMINER_CASSETTE_MODE=record/replay 可录制全部请求与响应，或从录制文件回放而不访问网络，详见 aminer/cassette.py。
 - 本模块配合独立的测试用例文件（如tests/test_aminer_api.py）进行功能验证。
 - 修改本模块后，务必运行pytest以确保功能正确。
 
@@ -20,19 +35,44 @@ aminer/api.py
 
 
 from deprecated import deprecated
-import requests
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
+from aminer import cache as response_cache
+from aminer import cassette, token_provider
+from aminer.client import get_client
+from aminer.records import PaperHit, PatentHit, PersonDetail, decode_hits
+from aminer.streaming import HitStream
+
+# 并发分页拉取时同时进行的页请求数
+DEFAULT_PAGE_PARALLELISM = int(os.getenv("AMINER_PAGE_PARALLELISM", "4"))
+# 批量获取学者详情时每次请求携带的ID数
+DEFAULT_DETAIL_CHUNK_SIZE = 50
+
+# AMiner 各服务的根地址，未设置环境变量时使用线上地址
+_BASE_URL = os.getenv("AMINER_BASE_URL", "")
+DATACENTER_URL = (os.getenv("AMINER_DATACENTER_URL") or _BASE_URL or "https://datacenter.aminer.cn").rstrip("/")
+APIV2_URL = (os.getenv("AMINER_APIV2_URL") or _BASE_URL or "https://apiv2.aminer.cn").rstrip("/")
+SEARCH_URL = (os.getenv("AMINER_SEARCH_URL") or _BASE_URL or "https://searchtest.aminer.cn").rstrip("/")
+
 
 def get_token():
     """
-    从 aminer/TOKEN 文件中读取 API Token。
+    获取 API Token（优先环境变量 AMINER_TOKEN，其次 aminer/TOKEN 文件）。
+    Token 缓存在内存中，仅当文件修改时间变化时重新读取，详见 aminer/token_provider.py。
+    cassette 回放模式下 Token 不会被发送，未配置时返回占位值。
     返回：
         str: API Token 字符串。
     """
-    with open("aminer/TOKEN", "r", encoding="utf-8") as f:
-        return f.read().strip()
+    try:
+        return token_provider.default_provider.get()
+    except FileNotFoundError:
+        current = cassette.get_cassette()
+        if current is not None and current.replaying:
+            return cassette.REPLAY_TOKEN
+        raise
 
 
 def search_person_by_name(name="", offset=0, org="", size=1):
@@ -64,7 +104,13 @@ def search_person_by_name(name="", offset=0, org="", size=1):
             ]
         }
     """
-    API_URL = "https://datacenter.aminer.cn/gateway/open_platform/api/person/search"
+    method, url, kwargs = _person_search_request(name, offset, org, size)
+    return get_client().request(method, url, **kwargs)
+
+
+def _person_search_request(name, offset, org, size):
+    """构造学者检索请求，返回 (method, url, kwargs)，供同步与异步客户端共用。"""
+    API_URL = DATACENTER_URL + "/gateway/open_platform/api/person/search"
     headers = {
         "Content-Type": "application/json;charset=utf-8",
         "Authorization": get_token()
@@ -75,8 +121,7 @@ def search_person_by_name(name="", offset=0, org="", size=1):
         "org": org,
         "size": size
     }
-    response = requests.post(API_URL, headers=headers, data=json.dumps(payload))
-    return response
+    return "POST", API_URL, {"headers": headers, "json": payload}
 
 @deprecated("付费API，请使用search_papers_by_scholar_free替代")
 def search_papers_by_scholar_paid(scholar_id):
@@ -94,14 +139,14 @@ def search_papers_by_scholar_paid(scholar_id):
             "total": float    # 总数
         }
     """
-    PAPER_RELATION_API_URL = "https://datacenter.aminer.cn/gateway/open_platform/api/person/paper/relation"
+    PAPER_RELATION_API_URL = DATACENTER_URL + "/gateway/open_platform/api/person/paper/relation"
     headers = {
         "Authorization": get_token()
     }
     params = {
         "id": scholar_id
     }
-    response = requests.get(PAPER_RELATION_API_URL, headers=headers, params=params)
+    response = get_client().get(PAPER_RELATION_API_URL, headers=headers, params=params)
     return response
 
 @deprecated("该API只能返回论文的id和title，作用不大")
@@ -117,7 +162,11 @@ def search_paper_by_title(title: str, page: int = 1, size: int = 1) -> Optional[
     Returns:
         Optional[Dict]: A dictionary with 'id', 'title', and 'doi' if found, else None.
     """
-    API_URL = "https://datacenter.aminer.cn/gateway/open_platform/api/paper/search"
+    return response_cache.cached_call("paper_search", _search_paper_by_title, title, page, size)
+
+
+def _search_paper_by_title(title, page=1, size=1):
+    API_URL = DATACENTER_URL + "/gateway/open_platform/api/paper/search"
     headers = {
         "Authorization": get_token()
     }
@@ -127,7 +176,7 @@ def search_paper_by_title(title: str, page: int = 1, size: int = 1) -> Optional[
         "title": title
     }
     try:
-        response = requests.get(API_URL, headers=headers, params=params, timeout=10)
+        response = get_client().get(API_URL, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("code") == 200 and data.get("success") and data.get("data"):
@@ -149,7 +198,7 @@ def search_paper_by_title(title: str, page: int = 1, size: int = 1) -> Optional[
         return None 
 
 
-def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
+def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True, page=0, as_records=False):
     """
     Search for papers authored by a specific scholar using the free AMiner API. Refer to aminer/demo/paper.json for raw network response.
 
@@ -157,6 +206,8 @@ def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
         scholar_id (str): The AMiner person_id of the scholar whose papers are to be searched.
         size (int, optional): The number of results to return. Defaults to 10.
         needDetails (bool, optional): Whether to include detailed information in the results. Defaults to True.
+        page (int, optional): Page index (0-based) of size results each. Defaults to 0.
+        as_records (bool, optional): Return hitList items as aminer.records.PaperHit instead of dicts. Defaults to False.
 
     Returns:
         dict: 返回格式示例：
@@ -181,7 +232,44 @@ def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
                 "hitsTotal": int
             }
     """
-    url = "https://apiv2.aminer.cn/n"
+    result = response_cache.cached_call("papers", _papers_by_scholar, scholar_id, size, needDetails, page)
+    return decode_hits(result, PaperHit) if as_records else result
+
+
+def _papers_by_scholar(scholar_id, size=10, needDetails=True, page=0):
+    method, url, kwargs = _papers_by_scholar_request(scholar_id, size, needDetails, page)
+    return _parse_papers_by_scholar_response(get_client().request(method, url, **kwargs))
+
+
+def _papers_by_scholar_request(scholar_id, size, needDetails, page=0):
+    """构造学者论文检索请求（person.SearchPersonPaper），返回 (method, url, kwargs)。"""
+    return _gateway_request([_papers_by_scholar_action(scholar_id, size, needDetails, page)])
+
+
+def _papers_by_scholar_action(scholar_id, size, needDetails, page=0):
+    """构造 person.SearchPersonPaper 网关 action。"""
+    return {
+        "action": "person.SearchPersonPaper",
+        "parameters": {
+            "person_id": scholar_id,
+            "search_param": {
+                "needDetails": needDetails,
+                "page": page,
+                "size": size,
+                "sort": [
+                    {
+                        "field": "year",
+                        "asc": False
+                    }
+                ]
+            }
+        }
+    }
+
+
+def _gateway_request(actions):
+    """构造 apiv2.aminer.cn/n 网关请求，请求体为 action 数组，响应的 data[i] 对应第i个 action。"""
+    url = APIV2_URL + "/n"
     
     headers = {
         "Accept": "application/json, text/plain, */*",
@@ -189,7 +277,6 @@ def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
         "Accept-Language": "zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7",
         "Connection": "keep-alive",
         "Content-Type": "application/json",
-        "Host": "apiv2.aminer.cn",
         "Origin": "https://www.aminer.cn",
         "Referer": "https://www.aminer.cn/",
         "Sec-Fetch-Dest": "empty",
@@ -203,28 +290,21 @@ def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
         "sec-ch-ua-platform": "\"Windows\""
     }
 
-    payload = [
-        {
-            "action": "person.SearchPersonPaper",
-            "parameters": {
-                "person_id": scholar_id,
-                "search_param": {
-                    "needDetails": needDetails,
-                    "page": 0,
-                    "size": size,
-                    "sort": [
-                        {
-                            "field": "year",
-                            "asc": False
-                        }
-                    ]
-                }
-            }
-        }
-    ]
+    return "POST", url, {"headers": headers, "json": list(actions)}
 
-    response = requests.post(url, headers=headers, json=payload)
-    
+
+def _parse_papers_by_scholar_response(response):
+    """解析学者论文检索响应，返回 {"hitList": [...], "hitsTotal": int}，异常时抛出异常。"""
+    return _papers_from_gateway_item(_parse_gateway_response(response)[0])
+
+
+def _papers_from_envelope(result):
+    """由已解析的论文检索响应体（dict）提取 {"hitList": [...], "hitsTotal": int}，供流式解析校验外层结构。"""
+    return _papers_from_gateway_item(_gateway_data(result)[0])
+
+
+def _parse_gateway_response(response):
+    """解析网关响应，返回 data 列表（每个元素对应一个 action 的结果），异常时抛出异常。"""
     if response.status_code != 200:
         # 如果响应状态码不是200，抛出异常并包含错误信息
         raise Exception(f"AMiner API请求失败，状态码: {response.status_code}, 响应内容: {response.text}")
@@ -234,16 +314,111 @@ def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True):
     except Exception as e:
         # 如果解析JSON失败，抛出异常
         raise Exception(f"响应内容不是有效的JSON格式: {e}")
+    return _gateway_data(result)
+
 
+def _gateway_data(result):
+    """检查网关响应体结构并返回 data 列表，异常时抛出异常。"""
     # 检查返回结构，提取data字段
     if "data" in result and isinstance(result["data"], list) and len(result["data"]) > 0:
-        return result["data"][0].get("data", {})
+        return result["data"]
     else:
         # 如果data字段不存在或格式不正确，抛出异常
         raise Exception(f"AMiner API返回数据格式异常: {result}")
-    
 
-def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails: bool = True, page: int = 0, query: str = ""):
+
+def _papers_from_gateway_item(item):
+    """从 person.SearchPersonPaper 的单个 action 结果中提取 {"hitList": [...], "hitsTotal": int}。"""
+    if not isinstance(item, dict):
+        raise Exception(f"AMiner API返回数据格式异常: {item}")
+    return item.get("data", {})
+
+
+def stream_papers_by_scholar(scholar_id, size=10, needDetails=True, page=0) -> HitStream:
+    """
+    search_papers_by_scholar_free 的流式版本：响应体边下载边解析，逐条产出论文，
+    不在内存中构建完整的 hitList，适合单页很大的拉取（下载尚未完成时即可开始入库）。
+    参数同 search_papers_by_scholar_free。
+    返回：
+        HitStream: 可迭代一次，逐条产出论文dict（结构同 hitList 元素）；遍历结束后 hits_total 为论文总数。
+    异常：
+        请求失败或返回格式异常时，在遍历过程中抛出异常（格式异常可能在已产出部分论文后才发现）。
+    示例：
+        hits = stream_papers_by_scholar(scholar_id, size=1000)
+        for hit in hits:
+            ...
+        total = hits.hits_total
+    """
+    method, url, kwargs = _papers_by_scholar_request(scholar_id, size, needDetails, page)
+    response, chunks = get_client().stream(method, url, **kwargs)
+    return HitStream(response, chunks, _parse_papers_by_scholar_response, _papers_from_envelope)
+
+
+def iter_paper_pages(scholar_id, page_size=100, needDetails=True, limit=None, prefetch=True):
+    """
+    逐页拉取学者的全部论文，返回生成器，每次产出一页，取到 hitsTotal（或 limit）条后停止。
+    开启 prefetch 时，在调用方消费当前页的同时由后台线程拉取下一页。
+
+    参数：
+        scholar_id (str): 学者AMiner person_id。
+        page_size (int): 每页条数，默认100。
+        needDetails (bool): 是否需要详细信息，默认True。
+        limit (int, 可选): 最多返回的论文条数，默认不限。
+        prefetch (bool): 是否预取下一页，默认True。
+    返回：
+        Iterator[dict]: 每页结构同 search_papers_by_scholar_free：{"hitList": [...], "hitsTotal": int}。
+    异常：
+        任一页请求失败时抛出异常（已产出的页不受影响）。
+    """
+    def fetch(page):
+        return search_papers_by_scholar_free(scholar_id, size=page_size, needDetails=needDetails, page=page)
+    return _iter_pages(fetch, limit, prefetch)
+
+
+def iter_papers_by_scholar(scholar_id, page_size=100, needDetails=True, limit=None, prefetch=True):
+    """
+    逐条产出学者的全部论文（hitList 中的元素），参数同 iter_paper_pages。
+    返回：
+        Iterator[dict]: 单篇论文，结构同 search_papers_by_scholar_free 的 hitList 元素。
+    """
+    for page in iter_paper_pages(scholar_id, page_size, needDetails, limit, prefetch):
+        yield from page["hitList"]
+
+
+def _iter_pages(fetch, limit=None, prefetch=True):
+    """
+    通用分页遍历：fetch(page) 返回 {"hitList": [...], "hitsTotal": int}，页码从0开始。
+    取满 hitsTotal/limit 条或遇到空页时停止；prefetch 时用单个后台线程提前请求下一页。
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = 0
+        fetched = 0
+        result = fetch(page)
+        while True:
+            hits = result.get("hitList") or []
+            total = result.get("hitsTotal") or 0
+            if limit is not None:
+                total = min(total, limit)
+                hits = hits[:max(limit - fetched, 0)]
+            fetched += len(hits)
+            has_more = bool(hits) and fetched < total
+            pending = None
+            if has_more:
+                page += 1
+                if executor is not None:
+                    pending = executor.submit(fetch, page)
+            yield {"hitList": hits, "hitsTotal": result.get("hitsTotal") or 0}
+            if not has_more:
+                return
+            result = pending.result() if pending is not None else fetch(page)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails: bool = True, page: int = 0, query: str = "",
+                                   as_records: bool = False):
     """
     使用AMiner免费API，根据学者ID查询其相关专利。 Refer to aminer/demo/patents.json for raw network response.
 
@@ -253,6 +428,7 @@ def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails:
         needDetails (bool, optional): 是否需要详细信息，默认为True。
         page (int, optional): 分页页码，默认为0。
         query (str, optional): 关键词查询，默认为空字符串。
+        as_records (bool, optional): 为True时 hitList 元素为 aminer.records.PatentHit，默认为False。
 
     返回：
         dict: 返回格式如下：
@@ -285,7 +461,18 @@ def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails:
     异常：
         请求失败或返回格式异常时抛出异常。
     """
-    url = "https://searchtest.aminer.cn/aminer-search/search/patentV2"
+    result = response_cache.cached_call("patents", _patents_by_scholar, scholar_id, size, needDetails, page, query)
+    return decode_hits(result, PatentHit) if as_records else result
+
+
+def _patents_by_scholar(scholar_id, size=10, needDetails=True, page=0, query=""):
+    method, url, kwargs = _patents_by_scholar_request(scholar_id, size, needDetails, page, query)
+    return _parse_patents_by_scholar_response(get_client().request(method, url, **kwargs))
+
+
+def _patents_by_scholar_request(scholar_id, size, needDetails, page, query):
+    """构造学者专利检索请求（patentV2），返回 (method, url, kwargs)。"""
+    url = SEARCH_URL + "/aminer-search/search/patentV2"
     headers = {
         "Accept": "application/json, text/plain, */*",
         "Accept-Encoding": "gzip, deflate, br, zstd",
@@ -319,7 +506,11 @@ def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails:
         "page": page,
         "size": size
     }
-    response = requests.post(url, headers=headers, json=data)
+    return "POST", url, {"headers": headers, "json": data}
+
+
+def _parse_patents_by_scholar_response(response):
+    """解析学者专利检索响应，返回 {"hitList": [...], "hitsTotal": int}，异常时抛出异常。"""
     if response.status_code != 200:
         # 如果响应状态码不是200，抛出异常并包含错误信息
         raise Exception(f"AMiner专利API请求失败，状态码: {response.status_code}, 响应内容: {response.text}")
@@ -328,6 +519,11 @@ def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails:
     except Exception as e:
         # 如果解析JSON失败，抛出异常
         raise Exception(f"专利API响应内容不是有效的JSON格式: {e}")
+    return _patents_from_result(result)
+
+
+def _patents_from_result(result):
+    """由已解析的专利检索响应体（dict）提取 {"hitList": [...], "hitsTotal": int}，格式异常时抛出异常。"""
     # 检查返回结构，提取hitList和hitsTotal
     if (
         isinstance(result, dict)
@@ -345,12 +541,100 @@ def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails:
         raise Exception(f"AMiner专利API返回数据格式异常: {result}")
 
 
-def get_person_detail_by_id(person_id: str):
+def stream_patents_by_scholar(scholar_id: str, size: int = 10, needDetails: bool = True, page: int = 0, query: str = "") -> HitStream:
+    """
+    search_patents_by_scholar_free 的流式版本，用法同 stream_papers_by_scholar。
+    返回：
+        HitStream: 逐条产出专利dict；遍历结束后 hits_total 为专利总数。
+    """
+    method, url, kwargs = _patents_by_scholar_request(scholar_id, size, needDetails, page, query)
+    response, chunks = get_client().stream(method, url, **kwargs)
+    return HitStream(response, chunks, _parse_patents_by_scholar_response, _patents_from_result)
+
+
+def iter_patent_pages(scholar_id: str, page_size: int = 100, needDetails: bool = True, limit: int = None,
+                      max_workers: int = DEFAULT_PAGE_PARALLELISM, query: str = ""):
+    """
+    拉取发明人的全部专利：先请求第0页得到 hitsTotal，再以最多 max_workers 个线程并发请求剩余页。
+    按页码顺序（即 pub_date 倒序）产出，某页先到达时缓存等待前序页，整体耗时约为一次往返。
+
+    参数：
+        scholar_id (str): 发明人AMiner person_id。
+        page_size (int): 每页条数，默认100。
+        needDetails (bool): 是否需要详细信息，默认True。
+        limit (int, 可选): 最多返回的专利条数，默认不限。
+        max_workers (int): 同时进行的页请求数上限，默认取 AMINER_PAGE_PARALLELISM（4）。
+        query (str): 关键词查询，默认为空字符串。
+    返回：
+        Iterator[dict]: 每页结构同 search_patents_by_scholar_free：{"hitList": [...], "hitsTotal": int}。
+    异常：
+        任一页请求失败时抛出异常（已产出的页不受影响）。
+    """
+    def fetch(page):
+        return search_patents_by_scholar_free(scholar_id, size=page_size, needDetails=needDetails, page=page, query=query)
+    return _iter_pages_parallel(fetch, page_size, limit, max_workers)
+
+
+def iter_patents_by_scholar(scholar_id: str, page_size: int = 100, needDetails: bool = True, limit: int = None,
+                            max_workers: int = DEFAULT_PAGE_PARALLELISM, query: str = ""):
+    """
+    逐条产出发明人的全部专利（pub_date 倒序），参数同 iter_patent_pages。
+    返回：
+        Iterator[dict]: 单个专利，结构同 search_patents_by_scholar_free 的 hitList 元素。
+    """
+    for page in iter_patent_pages(scholar_id, page_size, needDetails, limit, max_workers, query):
+        yield from page["hitList"]
+
+
+def _page_count(first_page, page_size, limit):
+    """根据首页的 hitsTotal 与 limit 计算需要请求的总页数。"""
+    total = first_page.get("hitsTotal") or 0
+    if limit is not None:
+        total = min(total, limit)
+    return max(-(-total // page_size), 1)
+
+
+def _trim_page(result, fetched, limit):
+    """按 limit 截断一页结果，返回 (page, 截断后条数)。"""
+    hits = result.get("hitList") or []
+    if limit is not None:
+        hits = hits[:max(limit - fetched, 0)]
+    return {"hitList": hits, "hitsTotal": result.get("hitsTotal") or 0}, len(hits)
+
+
+def _iter_pages_parallel(fetch, page_size, limit=None, max_workers=DEFAULT_PAGE_PARALLELISM):
+    """
+    通用并发分页遍历：首页确定总页数后，以 max_workers 为窗口并发请求后续页，按页码顺序产出。
+    窗口随消费滑动，已完成但未消费的页最多 max_workers 个。
+    """
+    first = fetch(0)
+    page, fetched = _trim_page(first, 0, limit)
+    yield page
+    pages = _page_count(first, page_size, limit)
+    if pages <= 1:
+        return
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {}
+        next_page = 1
+        for current in range(1, pages):
+            while next_page < pages and next_page < current + max_workers:
+                futures[next_page] = executor.submit(fetch, next_page)
+                next_page += 1
+            page, count = _trim_page(futures.pop(current).result(), fetched, limit)
+            fetched += count
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_person_detail_by_id(person_id: str, as_records: bool = False):
     """
     使用AMiner免费API，根据学者ID获取学者详细信息。
 
     参数：
         person_id (str): 学者AMiner person_id。
+        as_records (bool, optional): 为True时返回 aminer.records.PersonDetail，默认为False。
     返回：
         dict: 学者详细信息，主要结构如下（参考person_detail.json）：
             {
@@ -415,7 +699,28 @@ def get_person_detail_by_id(person_id: str):
     异常：
         请求失败或返回格式异常时抛出异常。
     """
-    url = "https://apiv2.aminer.cn/magic?a=getPerson__personapi.get___"
+    detail = response_cache.cached_call("person_detail", _person_detail, person_id)
+    return _person_detail_result(detail, as_records)
+
+
+def _person_detail(person_id):
+    method, url, kwargs = _person_detail_request(person_id)
+    return _parse_person_detail_response(get_client().request(method, url, **kwargs))
+
+
+def _person_detail_result(detail, as_records):
+    """as_records 时将学者详情dict解码为 PersonDetail，None 保持不变。"""
+    return PersonDetail.from_json(detail) if as_records and detail is not None else detail
+
+
+def _person_detail_request(person_id):
+    """构造学者详情请求（personapi.get），返回 (method, url, kwargs)。"""
+    return _person_details_request([person_id])
+
+
+def _person_details_request(person_ids):
+    """构造批量学者详情请求（personapi.get 的 ids 支持多个ID），返回 (method, url, kwargs)。"""
+    url = APIV2_URL + "/magic?a=getPerson__personapi.get___"
     headers = {
         "accept": "application/json, text/plain, */*",
         "content-type": "application/json",
@@ -429,7 +734,7 @@ def get_person_detail_by_id(person_id: str):
         {
             "action": "personapi.get",
             "parameters": {
-                "ids": [person_id]
+                "ids": list(person_ids)
             },
             "schema": {
                 "person": [
@@ -454,7 +759,11 @@ def get_person_detail_by_id(person_id: str):
             }
         }
     ]
-    response = requests.post(url, headers=headers, json=payload)
+    return "POST", url, {"headers": headers, "json": payload}
+
+
+def _parse_person_detail_response(response):
+    """解析学者详情响应，返回首个学者详情dict，无结果时返回None，异常时抛出异常。"""
     if response.status_code != 200:
         raise Exception(f"AMiner get_person_detail_by_id API请求失败，状态码: {response.status_code}, 响应内容: {response.text}")
     try:
@@ -468,6 +777,74 @@ def get_person_detail_by_id(person_id: str):
         raise Exception(f"AMiner get_person_detail_by_id API返回数据格式异常: {result}")
 
 
+def get_person_details_by_ids(person_ids, chunk_size: int = DEFAULT_DETAIL_CHUNK_SIZE, as_records: bool = False):
+    """
+    使用AMiner免费API批量获取学者详细信息：每次请求携带 chunk_size 个ID，结果按ID映射回来。
+
+    参数：
+        person_ids (Iterable[str]): 学者AMiner person_id 列表，重复ID只请求一次。
+        chunk_size (int): 每次请求的ID数量，默认50。
+        as_records (bool): 为True时学者详情为 aminer.records.PersonDetail，默认为False。
+    返回：
+        dict: {
+            "data": {person_id: dict},  # 学者详细信息，结构同 get_person_detail_by_id
+            "missing": [person_id, ...]  # AMiner未返回的ID，保持输入顺序
+        }
+    异常：
+        任一批次请求失败或返回格式异常时抛出异常。
+    注意：
+        每个ID单独查询缓存（与 get_person_detail_by_id 共用缓存项），只请求未命中的ID；缺失的ID不缓存。
+    """
+    ids = list(dict.fromkeys(person_ids))
+    cache = response_cache.default_cache
+    found = {}
+    pending = ids
+    if cache.enabled:
+        pending = []
+        for person_id in ids:
+            hit, detail = cache.get("person_detail", _person_detail_key(person_id))
+            if hit:
+                found[person_id] = detail
+            else:
+                pending.append(person_id)
+    requested = set(pending)
+    for start in range(0, len(pending), chunk_size):
+        method, url, kwargs = _person_details_request(pending[start:start + chunk_size])
+        response = get_client().request(method, url, **kwargs)
+        for person in _parse_person_details_response(response):
+            found[person.get("id")] = person
+            if cache.enabled and person.get("id") in requested:
+                cache.set("person_detail", _person_detail_key(person["id"]), person)
+    return _map_person_details(ids, found, as_records)
+
+
+def _person_detail_key(person_id):
+    """学者详情的缓存键，与 get_person_detail_by_id 经 cached_call 生成的键相同。"""
+    return response_cache.make_key("person_detail", _person_detail, (person_id,), {})
+
+
+def _parse_person_details_response(response):
+    """解析批量学者详情响应，返回学者详情列表（可能少于请求的ID数），异常时抛出异常。"""
+    if response.status_code != 200:
+        raise Exception(f"AMiner get_person_details_by_ids API请求失败，状态码: {response.status_code}, 响应内容: {response.text}")
+    try:
+        result = response.json()
+    except Exception as e:
+        raise Exception(f"响应内容不是有效的JSON格式: {e}")
+    if "data" in result and isinstance(result["data"], list) and len(result["data"]) > 0:
+        return [p for p in (result["data"][0].get("data") or []) if isinstance(p, dict)]
+    else:
+        raise Exception(f"AMiner get_person_details_by_ids API返回数据格式异常: {result}")
+
+
+def _map_person_details(ids, found, as_records=False):
+    """将返回的学者详情按请求ID顺序映射（as_records 时解码为 PersonDetail），并列出缺失的ID。"""
+    return {
+        "data": {pid: _person_detail_result(found[pid], as_records) for pid in ids if pid in found},
+        "missing": [pid for pid in ids if pid not in found],
+    }
+
+
 if __name__ == "__main__":
     
     # # 测试search_papers_by_scholar_free
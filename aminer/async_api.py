@@ -0,0 +1,372 @@
+"""
+aminer/async_api.py
+
+aminer/api.py 的 asyncio 版本，函数名、参数与返回结构与同步版本一致，便于在事件循环中并发检索大量学者。
+两个模块共用 aminer/api.py 中的请求构造（_xxx_request）与响应解析（_parse_xxx_response），只有发送方式不同。
+
+包含的对象及简要介绍：
+- AsyncAMinerClient: 基于 httpx.AsyncClient 的共享连接池，按主机限速（aminer/ratelimit.py）并用信号量限制并发请求数，
+  超时、重试、熔断与录制/回放（aminer/resilience.py、aminer/cassette.py）与同步客户端相同。
+- get_async_client: 获取当前事件循环对应的共享客户端。
+- search_person_by_name: 按姓名、机构等条件检索学者信息，返回 httpx.Response。
+- search_papers_by_scholar_free: 根据学者ID检索其论文（免费API）。
+- iter_paper_pages / iter_papers_by_scholar: 按页惰性遍历学者的全部论文（异步生成器），支持预取下一页。
+- stream_papers_by_scholar: 单页论文检索的流式版本，边下载边逐条产出论文。
+- search_patents_by_scholar_free: 根据学者ID检索其专利（免费API）。
+- iter_patent_pages / iter_patents_by_scholar: 读取首页 hitsTotal 后并发拉取剩余页，按 pub_date 顺序产出。
+- stream_patents_by_scholar: 单页专利检索的流式版本。
+- get_person_detail_by_id: 根据学者ID获取学者详细信息。
+- get_person_details_by_ids: 批量获取学者详细信息，各批次并发请求。
+
+环境变量：
+- AMINER_ASYNC_PER_HOST: 每个主机允许同时进行的请求数，默认20。
+
+注意事项：
+- 已废弃的付费接口（search_papers_by_scholar_paid、search_paper_by_title）不提供异步版本。
+"""
+
+import asyncio
+import os
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+from aminer import api
+from aminer.records import PaperHit, PatentHit, decode_hits
+from aminer import cassette as aminer_cassette
+from aminer.streaming import AsyncHitStream
+from aminer.ratelimit import HostRateLimiter, get_rate_limiter
+from aminer.resilience import CONNECT_TIMEOUT, READ_TIMEOUT, RETRY_STATUSES, CircuitOpenError, RetryPolicy, get_breaker
+
+DEFAULT_PER_HOST = int(os.getenv("AMINER_ASYNC_PER_HOST", "20"))
+
+
+class AsyncAMinerClient:
+    """
+    异步 AMiner HTTP 客户端。
+
+    参数：
+        per_host (int): 每个主机允许同时进行的请求数，超出的请求在信号量上等待。
+        max_connections (int): 连接池总连接数上限，默认 per_host 的4倍（覆盖 datacenter/apiv2/searchtest 三个主机）。
+        limiter (HostRateLimiter, 可选): 按主机限速器，默认使用 aminer.ratelimit 的共享限速器。
+        retry (RetryPolicy, 可选): 重试策略，默认按 AMINER_MAX_ATTEMPTS 创建。
+        timeout (httpx.Timeout, 可选): 默认连接超时 AMINER_CONNECT_TIMEOUT、读取超时 AMINER_READ_TIMEOUT。
+    """
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, max_connections: int = None, limiter: HostRateLimiter = None,
+                 retry: RetryPolicy = None, timeout: httpx.Timeout = None):
+        self.per_host = per_host
+        self.limiter = limiter or get_rate_limiter()
+        self.retry = retry or RetryPolicy()
+        max_connections = max_connections or per_host * 4
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout or httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+        self._semaphores = {}
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，录制/回放行为同 AMinerClient.request。"""
+        cassette = aminer_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            return aminer_cassette.to_httpx_response(cassette.replay(method, url, kwargs))
+        response = await self._send(method, url, **kwargs)
+        if cassette is not None:
+            cassette.record(method, url, kwargs, response.status_code, response.headers, response.content)
+        return response
+
+    async def stream(self, method: str, url: str, chunk_size: int = 65536, **kwargs):
+        """
+        流式发送请求，响应体按块读取，不在内存中保留完整响应（录制模式下除外）。
+        返回：
+            tuple: (httpx.Response, AsyncIterator[bytes])，先检查状态码再遍历字节块；遍历结束或关闭迭代器时释放连接。
+        """
+        cassette = aminer_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            response = aminer_cassette.to_httpx_response(cassette.replay(method, url, kwargs))
+            return response, _achunked(response.content, chunk_size)
+        response = await self._send(method, url, stream=True, **kwargs)
+        return response, self._aiter_body(response, chunk_size, cassette, method, url, kwargs)
+
+    @staticmethod
+    async def _aiter_body(response, chunk_size, cassette, method, url, kwargs):
+        recorded = [] if cassette is not None else None
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                if recorded is not None:
+                    recorded.append(chunk)
+                yield chunk
+        finally:
+            await response.aclose()
+        if recorded is not None:
+            cassette.record(method, url, kwargs, response.status_code, response.headers, b"".join(recorded))
+
+    async def _send(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        等待限速令牌后在对应主机的信号量内发送请求，连接从共享连接池中获取。
+        stream 为 True 时只读取响应头，响应体由调用方读取。
+        重试与熔断行为同 AMinerClient.request。
+        异常：
+            CircuitOpenError: 主机处于熔断状态。
+            httpx.TransportError: 重试用尽后仍无法连接或超时。
+        """
+        breaker = get_breaker(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            error = None
+            # 熔断期间直接失败，不排队等待令牌
+            breaker.check()
+            await self.limiter.acquire_async(url)
+            async with self._semaphore(url):
+                # 拿到限速令牌与主机信号量后才占用熔断器：half_open 只有一个试探名额，不能在排队期间被占住
+                try:
+                    breaker.before_request()
+                except CircuitOpenError:
+                    # 等待期间熔断器打开或试探名额被占用，请求未发出，归还令牌
+                    self.limiter.refund(url)
+                    raise
+                try:
+                    response = await self._client.send(self._client.build_request(method, url, **kwargs), stream=stream)
+                except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as exc:
+                    breaker.record_failure()
+                    error = exc
+                except BaseException:
+                    breaker.release()
+                    raise
+            if error is not None:
+                if not self.retry.can_retry(method, attempt):
+                    raise error
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if not self.retry.can_retry(method, attempt):
+                return response
+            await response.aclose()
+            await asyncio.sleep(self.retry.delay(attempt, response.headers.get("Retry-After")))
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+async def _achunked(content: bytes, chunk_size: int):
+    for i in range(0, len(content), chunk_size):
+        yield content[i:i + chunk_size]
+
+
+# 每个事件循环一个客户端：httpx 连接与 asyncio 信号量都绑定在创建它们的事件循环上
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncAMinerClient:
+    """
+    获取当前事件循环对应的共享客户端，首次调用时创建。
+    返回：
+        AsyncAMinerClient: 共享客户端实例。
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncAMinerClient()
+    return client
+
+
+async def search_person_by_name(name="", offset=0, org="", size=1):
+    """
+    异步版 api.search_person_by_name。
+    返回：
+        httpx.Response: API 的 HTTP 响应对象（status_code、json() 与 requests.Response 用法一致）。
+    """
+    method, url, kwargs = api._person_search_request(name, offset, org, size)
+    return await get_async_client().request(method, url, **kwargs)
+
+
+async def search_papers_by_scholar_free(scholar_id, size=10, needDetails=True, page=0, batcher=None, as_records=False):
+    """
+    异步版 api.search_papers_by_scholar_free。
+    参数：
+        batcher (GatewayBatcher, 可选): 传入时，请求交由 aminer.batching 的合并器与其他 action 合并发送。
+        as_records (bool, 可选): 为True时 hitList 元素为 aminer.records.PaperHit。
+    返回：
+        dict: {"hitList": [...], "hitsTotal": int}，结构同同步版本。
+    """
+    if batcher is not None:
+        item = await batcher.submit(api._papers_by_scholar_action(scholar_id, size, needDetails, page))
+        result = api._papers_from_gateway_item(item)
+    else:
+        method, url, kwargs = api._papers_by_scholar_request(scholar_id, size, needDetails, page)
+        response = await get_async_client().request(method, url, **kwargs)
+        result = api._parse_papers_by_scholar_response(response)
+    return decode_hits(result, PaperHit) if as_records else result
+
+
+async def stream_papers_by_scholar(scholar_id, size=10, needDetails=True, page=0) -> AsyncHitStream:
+    """
+    异步版 api.stream_papers_by_scholar。
+    返回：
+        AsyncHitStream: 以 async for 逐条产出论文dict；遍历结束后 hits_total 为论文总数。
+    """
+    method, url, kwargs = api._papers_by_scholar_request(scholar_id, size, needDetails, page)
+    response, chunks = await get_async_client().stream(method, url, **kwargs)
+    return AsyncHitStream(response, chunks, api._parse_papers_by_scholar_response, api._papers_from_envelope)
+
+
+async def iter_paper_pages(scholar_id, page_size=100, needDetails=True, limit=None, prefetch=True, batcher=None, search=None):
+    """
+    异步版 api.iter_paper_pages：逐页产出学者的全部论文，prefetch 时在消费当前页的同时请求下一页。
+    batcher 参数同 search_papers_by_scholar_free；search 可替换单页检索函数（如带缓存的版本），
+    签名须与 search_papers_by_scholar_free 一致。
+    返回：
+        AsyncIterator[dict]: 每页 {"hitList": [...], "hitsTotal": int}。
+    """
+    async def fetch(page):
+        return await (search or search_papers_by_scholar_free)(scholar_id, size=page_size, needDetails=needDetails, page=page, batcher=batcher)
+    async for page in _iter_pages(fetch, limit, prefetch):
+        yield page
+
+
+async def iter_papers_by_scholar(scholar_id, page_size=100, needDetails=True, limit=None, prefetch=True, batcher=None):
+    """
+    异步版 api.iter_papers_by_scholar：逐条产出学者的全部论文。
+    """
+    async for page in iter_paper_pages(scholar_id, page_size, needDetails, limit, prefetch, batcher):
+        for hit in page["hitList"]:
+            yield hit
+
+
+async def _iter_pages(fetch, limit=None, prefetch=True):
+    """异步版 api._iter_pages，预取通过后台任务完成，提前结束遍历时取消未完成的预取。"""
+    pending = None
+    try:
+        page = 0
+        fetched = 0
+        result = await fetch(page)
+        while True:
+            hits = result.get("hitList") or []
+            total = result.get("hitsTotal") or 0
+            if limit is not None:
+                total = min(total, limit)
+                hits = hits[:max(limit - fetched, 0)]
+            fetched += len(hits)
+            has_more = bool(hits) and fetched < total
+            pending = None
+            if has_more:
+                page += 1
+                if prefetch:
+                    pending = asyncio.ensure_future(fetch(page))
+            yield {"hitList": hits, "hitsTotal": result.get("hitsTotal") or 0}
+            if not has_more:
+                return
+            result = await pending if pending is not None else await fetch(page)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+async def search_patents_by_scholar_free(scholar_id: str, size: int = 10, needDetails: bool = True, page: int = 0, query: str = "",
+                                         as_records: bool = False):
+    """
+    异步版 api.search_patents_by_scholar_free。
+    返回：
+        dict: {"hitList": [...], "hitsTotal": int}，结构同同步版本；as_records 时 hitList 元素为 aminer.records.PatentHit。
+    """
+    method, url, kwargs = api._patents_by_scholar_request(scholar_id, size, needDetails, page, query)
+    response = await get_async_client().request(method, url, **kwargs)
+    result = api._parse_patents_by_scholar_response(response)
+    return decode_hits(result, PatentHit) if as_records else result
+
+
+async def stream_patents_by_scholar(scholar_id: str, size: int = 10, needDetails: bool = True, page: int = 0, query: str = "") -> AsyncHitStream:
+    """
+    异步版 api.stream_patents_by_scholar。
+    返回：
+        AsyncHitStream: 以 async for 逐条产出专利dict；遍历结束后 hits_total 为专利总数。
+    """
+    method, url, kwargs = api._patents_by_scholar_request(scholar_id, size, needDetails, page, query)
+    response, chunks = await get_async_client().stream(method, url, **kwargs)
+    return AsyncHitStream(response, chunks, api._parse_patents_by_scholar_response, api._patents_from_result)
+
+
+async def iter_patent_pages(scholar_id: str, page_size: int = 100, needDetails: bool = True, limit: int = None,
+                            max_workers: int = api.DEFAULT_PAGE_PARALLELISM, query: str = "", search=None):
+    """
+    异步版 api.iter_patent_pages：首页确定 hitsTotal 后，最多 max_workers 个页请求并发进行，按页码顺序产出。
+    search 可替换单页检索函数（如带缓存的版本），签名须与 search_patents_by_scholar_free 一致。
+    返回：
+        AsyncIterator[dict]: 每页 {"hitList": [...], "hitsTotal": int}。
+    """
+    async def fetch(page):
+        return await (search or search_patents_by_scholar_free)(scholar_id, size=page_size, needDetails=needDetails, page=page, query=query)
+    async for page in _iter_pages_parallel(fetch, page_size, limit, max_workers):
+        yield page
+
+
+async def iter_patents_by_scholar(scholar_id: str, page_size: int = 100, needDetails: bool = True, limit: int = None,
+                                  max_workers: int = api.DEFAULT_PAGE_PARALLELISM, query: str = ""):
+    """
+    异步版 api.iter_patents_by_scholar：逐条产出发明人的全部专利（pub_date 倒序）。
+    """
+    async for page in iter_patent_pages(scholar_id, page_size, needDetails, limit, max_workers, query):
+        for hit in page["hitList"]:
+            yield hit
+
+
+async def _iter_pages_parallel(fetch, page_size, limit=None, max_workers=api.DEFAULT_PAGE_PARALLELISM):
+    """异步版 api._iter_pages_parallel，以后台任务滑动窗口并发请求后续页，提前结束时取消未完成的任务。"""
+    first = await fetch(0)
+    page, fetched = api._trim_page(first, 0, limit)
+    yield page
+    pages = api._page_count(first, page_size, limit)
+    tasks = {}
+    try:
+        next_page = 1
+        for current in range(1, pages):
+            while next_page < pages and next_page < current + max_workers:
+                tasks[next_page] = asyncio.ensure_future(fetch(next_page))
+                next_page += 1
+            page, count = api._trim_page(await tasks.pop(current), fetched, limit)
+            fetched += count
+            yield page
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def get_person_detail_by_id(person_id: str, as_records: bool = False):
+    """
+    异步版 api.get_person_detail_by_id。
+    返回：
+        dict: 学者详细信息，结构同同步版本（as_records 时为 aminer.records.PersonDetail）；无结果时返回None。
+    """
+    method, url, kwargs = api._person_detail_request(person_id)
+    response = await get_async_client().request(method, url, **kwargs)
+    return api._person_detail_result(api._parse_person_detail_response(response), as_records)
+
+
+async def get_person_details_by_ids(person_ids, chunk_size: int = api.DEFAULT_DETAIL_CHUNK_SIZE, as_records: bool = False):
+    """
+    异步版 api.get_person_details_by_ids，各批次并发请求（受每主机并发上限约束）。
+    返回：
+        dict: {"data": {person_id: dict}, "missing": [person_id, ...]}，结构同同步版本。
+    """
+    ids = list(dict.fromkeys(person_ids))
+
+    async def fetch(chunk):
+        method, url, kwargs = api._person_details_request(chunk)
+        response = await get_async_client().request(method, url, **kwargs)
+        return api._parse_person_details_response(response)
+
+    batches = await asyncio.gather(*[fetch(ids[i:i + chunk_size]) for i in range(0, len(ids), chunk_size)])
+    found = {person.get("id"): person for batch in batches for person in batch}
+    return api._map_person_details(ids, found, as_records)
@@ -0,0 +1,106 @@
+"""
+aminer/batching.py
+
+apiv2.aminer.cn/n 网关请求合并器。网关的请求体是 action 数组，响应的 data[i] 对应第i个 action，
+因此可以把短时间内不同调用方（如不同学者的论文检索）提交的 action 合并为一次 POST，
+减少批量刷新论文时的请求数与每次请求的固定开销。
+
+包含的对象及简要介绍：
+- GatewayBatcher: 收集待发送的 action，达到 max_batch 个或等待 max_wait 秒后一次性发送，
+  并把 data[i] 分发给对应调用方的 future。
+- get_gateway_batcher: 获取当前事件循环对应的共享合并器。
+
+环境变量：
+- AMINER_GATEWAY_BATCH: 每次合并的最大 action 数，默认16。
+- AMINER_GATEWAY_WAIT_MS: 收集 action 的最长等待时间（毫秒），默认10。
+"""
+
+import asyncio
+import os
+import weakref
+
+from aminer import api, async_api
+
+DEFAULT_MAX_BATCH = int(os.getenv("AMINER_GATEWAY_BATCH", "16"))
+DEFAULT_MAX_WAIT = float(os.getenv("AMINER_GATEWAY_WAIT_MS", "10")) / 1000
+
+
+class GatewayBatcher:
+    """
+    网关 action 合并器，只能在创建它的事件循环中使用。
+
+    参数：
+        max_batch (int): 每次 POST 最多携带的 action 数，达到后立即发送。
+        max_wait (float): 第一个 action 进入队列后最多等待的秒数。
+    """
+
+    def __init__(self, max_batch: int = DEFAULT_MAX_BATCH, max_wait: float = DEFAULT_MAX_WAIT):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self.requests_sent = 0
+        self.actions_sent = 0
+
+    async def submit(self, action: dict):
+        """
+        提交一个 action，等待其所在批次返回。
+        返回：
+            网关响应中与该 action 对应的 data[i]。
+        异常：
+            整批请求失败时，批内所有调用方收到同一异常。
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((action, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        self.requests_sent += 1
+        self.actions_sent += len(batch)
+        try:
+            method, url, kwargs = api._gateway_request([action for action, _ in batch])
+            response = await async_api.get_async_client().request(method, url, **kwargs)
+            items = api._parse_gateway_response(response)
+            if len(items) != len(batch):
+                raise Exception(f"AMiner网关返回结果数({len(items)})与请求action数({len(batch)})不一致")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), item in zip(batch, items):
+            if not future.done():
+                future.set_result(item)
+
+
+_batchers = weakref.WeakKeyDictionary()
+
+
+def get_gateway_batcher() -> GatewayBatcher:
+    """
+    获取当前事件循环对应的共享合并器，首次调用时按默认参数创建。
+    返回：
+        GatewayBatcher: 共享合并器实例。
+    """
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = GatewayBatcher()
+    return batcher
@@ -0,0 +1,99 @@
+"""
+aminer/benchmarks/bench_connection_pool.py
+
+对比“每次调用 requests.post（新建连接）”与“经由 aminer.client 共享连接池”两种方式的吞吐量。
+在本机启动一个支持 HTTP/1.1 keep-alive 的桩服务，返回与 person.SearchPersonPaper 相同结构的小响应，
+并发线程反复请求，输出每秒请求数（req/s）。
+
+用法：
+    python -m aminer.benchmarks.bench_connection_pool --requests 2000 --threads 8
+
+说明：
+    桩服务为明文 HTTP。为模拟到 AMiner 的 TLS 握手开销，桩服务在每个新连接建立时等待
+    --handshake-ms 毫秒（默认20ms，约为一次跨地域 TLS 握手的往返耗时）；设为0则只体现本机 TCP 建连开销。
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from aminer.client import AMinerClient
+
+STUB_BODY = json.dumps({"data": [{"data": {"hitList": [], "hitsTotal": 0}}]}).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake_delay = 0.0
+
+    def setup(self):
+        # 每个新连接只执行一次，用于模拟 TLS 握手耗时
+        if self.handshake_delay:
+            time.sleep(self.handshake_delay)
+        super().setup()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(handshake_delay: float = 0.0):
+    """在随机端口启动桩服务，返回 (server, base_url)。"""
+    handler = type("StubHandler", (_StubHandler,), {"handshake_delay": handshake_delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run(post, url, total, threads):
+    """用 threads 个线程共发送 total 次 POST，返回 req/s。"""
+    payload = [{"action": "person.SearchPersonPaper", "parameters": {"person_id": "bench"}}]
+
+    def one(_):
+        resp = post(url, json=payload)
+        resp.json()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AMiner 连接池吞吐量对比")
+    parser.add_argument("--requests", type=int, default=2000, help="每种方式的请求总数")
+    parser.add_argument("--threads", type=int, default=8, help="并发线程数")
+    parser.add_argument("--handshake-ms", type=float, default=20.0, help="模拟每个新连接的握手耗时(毫秒)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.handshake_ms / 1000)
+    url = f"{base_url}/n"
+    try:
+        before = run(requests.post, url, args.requests, args.threads)
+        client = AMinerClient(pool_size=args.threads)
+        after = run(client.post, url, args.requests, args.threads)
+        client.close()
+    finally:
+        server.shutdown()
+    print(f"requests.post (无连接复用): {before:8.1f} req/s")
+    print(f"AMinerClient (连接池):      {after:8.1f} req/s")
+    print(f"提升: x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+aminer/benchmarks/bench_incremental_parse.py
+
+对比大页检索时“response.json() 整体解析”（search_papers_by_scholar_free / search_patents_by_scholar_free）
+与“流式增量解析”（stream_papers_by_scholar / stream_patents_by_scholar）的峰值内存（RSS）与耗时。
+在独立子进程中启动 aminer/fake_server.py 替身服务生成大响应，每种方式也在独立子进程中运行，
+逐条消费 hit 后丢弃（模拟边下载边入库），子进程报告进程峰值 RSS 以及相对于导入完成时的增量。
+
+用法：
+    python -m aminer.benchmarks.bench_incremental_parse --hits 20000 --kind papers
+
+说明：
+    峰值 RSS 取自 resource.getrusage(RUSAGE_SELF).ru_maxrss，仅支持 Linux/macOS。
+    Linux 下 ru_maxrss 在 fork/exec 后会继承父进程的 RSS，因此替身服务不能运行在发起测量的父进程中。
+"""
+
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+
+PERSON_ID = "56066a5245cedb339687488b"
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为KB，macOS 为字节
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def child(mode: str, kind: str, base_url: str, hits: int):
+    """子进程：按 mode 拉取一页 hits 条数据并逐条消费，输出 JSON 结果。"""
+    from aminer import api
+    for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+        setattr(api, name, base_url)
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    count = 0
+    if mode == "full":
+        search = api.search_papers_by_scholar_free if kind == "papers" else api.search_patents_by_scholar_free
+        result = search(PERSON_ID, size=hits)
+        for hit in result["hitList"]:
+            count += 1
+        del result
+    else:
+        stream = api.stream_papers_by_scholar if kind == "papers" else api.stream_patents_by_scholar
+        for hit in stream(PERSON_ID, size=hits):
+            count += 1
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss_mb()
+    print(json.dumps({"hits": count, "seconds": elapsed, "peak_rss_mb": peak, "growth_mb": peak - baseline}))
+
+
+def run_child(mode: str, kind: str, base_url: str, hits: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "aminer.benchmarks.bench_incremental_parse",
+         "--child", mode, "--kind", kind, "--base-url", base_url, "--hits", str(hits)],
+        check=True, capture_output=True, text=True, env={"AMINER_TOKEN": "bench", **os.environ},
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def start_fake_server(hits: int):
+    """在子进程中启动替身服务，返回 (进程, base_url)。"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # 平均值的 0.5~1.5 倍区间保证该学者的数据量不少于 hits
+    process = subprocess.Popen(
+        [sys.executable, "-m", "aminer.fake_server", "--port", str(port), "--scholars", "0",
+         "--papers-per-scholar", str(hits * 2), "--patents-per-scholar", str(hits * 2), "--max-page-size", str(hits)],
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    return process, f"http://127.0.0.1:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hitList 整体解析与增量解析的峰值内存对比")
+    parser.add_argument("--hits", type=int, default=20000, help="单页条数（同时作为替身服务中该学者的数据量）")
+    parser.add_argument("--kind", choices=("papers", "patents"), default="papers")
+    parser.add_argument("--child", choices=("full", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.kind, args.base_url, args.hits)
+
+    server, base_url = start_fake_server(args.hits)
+    try:
+        results = {mode: run_child(mode, args.kind, base_url, args.hits) for mode in ("full", "stream")}
+    finally:
+        server.terminate()
+        server.wait()
+    for mode, label in (("full", "response.json() 整体解析"), ("stream", "流式增量解析")):
+        r = results[mode]
+        print(f"{label:<24} hits={r['hits']:>7}  耗时 {r['seconds']:6.2f}s  "
+              f"峰值RSS {r['peak_rss_mb']:7.1f} MB（导入后增长 {r['growth_mb']:7.1f} MB）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+aminer/cache.py
+
+AMiner 响应的两级缓存：进程内有界 LRU（第一级）+ 本地 SQLite 文件（第二级，重启后仍有效）。
+按接口（endpoint）分别设置过期时间，缓存键由函数的规范化参数生成，并统计命中/未命中/淘汰次数。
+
+包含的对象及简要介绍：
+- MemoryLRU: 线程安全的有界 LRU，条目带过期时间。
+- DiskCache: 基于 sqlite3 的持久化缓存。
+- ResponseCache: 组合两级缓存，提供 get/set/stats/clear。
+- cached_call / cached_call_async: 以缓存包装一次同步/异步调用（调用时才解析被调函数，便于测试替换）。
+- cached: 装饰器形式，自动区分同步与异步函数。
+- default_cache: 模块级共享缓存实例。
+
+注意事项：
+- 返回 None 的结果与抛出的异常不会被缓存。
+- 缓存值须可 JSON 序列化；内存中的命中结果为共享对象，调用方不应修改。
+
+环境变量：
+- AMINER_CACHE_ENABLED: 设为0时关闭缓存，默认开启。
+- AMINER_CACHE_SIZE: 内存 LRU 的最大条目数，默认1024。
+- AMINER_CACHE_PATH: 磁盘缓存文件路径，不设置则只使用内存缓存。
+- AMINER_CACHE_TTLS: 覆盖各接口过期秒数，如 "person_detail=86400,papers=3600"。
+"""
+
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+# 各接口默认过期时间（秒）：学者详情与专利列表变化很少，检索与论文列表相对频繁
+DEFAULT_TTLS = {
+    "person_search": 3600,
+    "person_detail": 86400,
+    "paper_search": 86400,
+    "papers": 6 * 3600,
+    "patents": 86400,
+}
+FALLBACK_TTL = 3600
+
+
+def _parse_ttls(spec):
+    ttls = dict(DEFAULT_TTLS)
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+class MemoryLRU:
+    """
+    线程安全的有界 LRU 缓存。
+    参数：
+        max_entries (int): 最大条目数，超出时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """返回 (命中与否, 值)；过期条目视为未命中并删除。"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    基于 sqlite3 的持久化缓存，值以 JSON 文本存储，多线程共用一个连接（加锁）。
+    参数：
+        path (str): SQLite 文件路径，所在目录不存在时自动创建。
+        purge_every (int): 每写入多少次清理一次过期条目。
+    """
+
+    def __init__(self, path: str, purge_every: int = 500):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS aminer_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key):
+        """返回 (命中与否, 值, 过期时间)，未命中时值与过期时间为 None。"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM aminer_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        if row is None:
+            return False, None, None
+        return True, json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at):
+        text = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aminer_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, text, expires_at),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._conn.execute("DELETE FROM aminer_cache WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM aminer_cache")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    两级响应缓存。
+    参数：
+        max_entries (int): 内存 LRU 的最大条目数。
+        disk_path (str, 可选): 磁盘缓存文件路径，为空则不启用磁盘缓存。
+        ttls (dict, 可选): 各接口的过期秒数，未列出的接口使用 FALLBACK_TTL。
+        enabled (bool): 为 False 时所有调用直接穿透。
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_path: str = None, ttls: dict = None, enabled: bool = True):
+        self.enabled = enabled
+        self.memory = MemoryLRU(max_entries)
+        self.disk = DiskCache(disk_path) if disk_path else None
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            self._counters[endpoint][field] += 1
+
+    def get(self, endpoint: str, key: str):
+        """依次查询内存与磁盘，磁盘命中时以该条目原有的过期时间回填内存。返回 (命中与否, 值)。"""
+        found, value = self.memory.get(key)
+        if found:
+            self._count(endpoint, "memory_hits")
+            return True, value
+        if self.disk is not None:
+            found, value, expires_at = self.disk.get(key)
+            if found:
+                self._count(endpoint, "disk_hits")
+                self.memory.set(key, value, expires_at)
+                return True, value
+        self._count(endpoint, "misses")
+        return False, None
+
+    def set(self, endpoint: str, key: str, value):
+        expires_at = time.time() + self.ttls.get(endpoint, FALLBACK_TTL)
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at)
+
+    def clear(self):
+        """清空两级缓存与统计。"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        with self._lock:
+            self._counters.clear()
+
+    def stats(self) -> dict:
+        """
+        返回缓存统计：
+            {
+                "enabled": bool,
+                "memory_entries": int,
+                "max_entries": int,
+                "evictions": int,          # 内存 LRU 淘汰次数
+                "disk": bool,              # 是否启用磁盘缓存
+                "endpoints": {endpoint: {"memory_hits": int, "disk_hits": int, "misses": int}}
+            }
+        """
+        with self._lock:
+            endpoints = {name: dict(c) for name, c in self._counters.items()}
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self.memory),
+            "max_entries": self.memory.max_entries,
+            "evictions": self.memory.evictions,
+            "disk": self.disk is not None,
+            "endpoints": endpoints,
+        }
+
+
+def make_key(endpoint: str, fn, args, kwargs, ignore=()) -> str:
+    """
+    由接口名与规范化参数生成缓存键：按函数签名绑定参数并补全默认值，
+    字符串参数去除首尾空白，忽略 ignore 中列出的参数（如 batcher）。
+    """
+    try:
+        bound = inspect.signature(fn).bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+    except (TypeError, ValueError):
+        params = {"args": list(args), **kwargs}
+    normalized = {
+        name: value.strip() if isinstance(value, str) else value
+        for name, value in params.items() if name not in ignore
+    }
+    return endpoint + ":" + json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def cached_call(endpoint: str, fn, *args, cache: ResponseCache = None, ignore=(), **kwargs):
+    """以缓存包装一次同步调用：命中则直接返回，否则调用 fn 并缓存非 None 结果。"""
+    cache = cache or default_cache
+    if not cache.enabled:
+        return fn(*args, **kwargs)
+    key = make_key(endpoint, fn, args, kwargs, ignore)
+    found, value = cache.get(endpoint, key)
+    if found:
+        return value
+    value = fn(*args, **kwargs)
+    if value is not None:
+        cache.set(endpoint, key, value)
+    return value
+
+
+async def cached_call_async(endpoint: str, fn, *args, cache: ResponseCache = None, ignore=(), **kwargs):
+    """cached_call 的异步版本，fn 为协程函数。"""
+    cache = cache or default_cache
+    if not cache.enabled:
+        return await fn(*args, **kwargs)
+    key = make_key(endpoint, fn, args, kwargs, ignore)
+    found, value = cache.get(endpoint, key)
+    if found:
+        return value
+    value = await fn(*args, **kwargs)
+    if value is not None:
+        cache.set(endpoint, key, value)
+    return value
+
+
+def cached(endpoint: str, cache: ResponseCache = None, ignore=()):
+    """
+    缓存装饰器，自动区分同步函数与协程函数。
+    示例：
+        get_detail = cached("person_detail")(aminer.api.get_person_detail_by_id)
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await cached_call_async(endpoint, fn, *args, cache=cache, ignore=ignore, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return cached_call(endpoint, fn, *args, cache=cache, ignore=ignore, **kwargs)
+        return wrapper
+    return decorator
+
+
+default_cache = ResponseCache(
+    max_entries=int(os.getenv("AMINER_CACHE_SIZE", "1024")),
+    disk_path=os.getenv("AMINER_CACHE_PATH") or None,
+    ttls=_parse_ttls(os.getenv("AMINER_CACHE_TTLS")),
+    enabled=os.getenv("AMINER_CACHE_ENABLED", "1") != "0",
+)
@@ -0,0 +1,186 @@
+"""
+aminer/cassette.py
+
+AMiner 请求的录制/回放（cassette）。录制模式下，aminer/client.py 与 aminer/async_api.py 发出的每个请求
+及其响应都被追加到一个 gzip 压缩的 NDJSON 文件；回放模式下直接从文件返回响应，不访问网络，
+可用于无网络的测试与基准（如 aminer/tests/test_aminer_api.py 与后端接口），或离线复现线上流量形态。
+
+请求按 方法 + 路径 + 查询参数 + 请求体 匹配（不含主机名与请求头，Token 不会写入文件），
+因此录制自线上服务或 aminer/fake_server.py 的文件在任何 AMINER_BASE_URL 设置下都能回放。
+同一请求被录制多次时按录制顺序依次回放，用完后重复最后一次的响应，保证结果确定。
+
+包含的对象及简要介绍：
+- Cassette: 录制/回放文件。
+- CassetteMissError: 回放时找不到匹配的录制请求。
+- get_cassette: 获取按环境变量创建的模块级 cassette，未开启时返回None。
+- use_cassette: 设置（或以 None 清除）模块级 cassette，供测试与脚本使用。
+- to_requests_response / to_httpx_response: 由录制条目构造同步/异步客户端的响应对象。
+
+环境变量：
+- AMINER_CASSETTE_MODE: off（默认）、record 或 replay。
+- AMINER_CASSETTE_PATH: cassette 文件路径，默认 aminer/cassettes/aminer.ndjson.gz。
+
+注意事项：
+- 录制时同一文件只应由一个进程写入；多 worker 录制请为每个进程指定不同的路径。
+"""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes", "aminer.ndjson.gz")
+# 回放时缺少 Token 文件也能构造请求
+REPLAY_TOKEN = "cassette-replay"
+
+
+class CassetteMissError(Exception):
+    """回放模式下请求不在 cassette 中。"""
+
+
+def request_key(method: str, url: str, kwargs: dict) -> str:
+    """由方法、路径、查询参数与请求体生成匹配键。"""
+    parts = urlsplit(url)
+    return json.dumps(
+        [method.upper(), parts.path, parts.query, kwargs.get("params"), kwargs.get("json")],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+
+
+class Cassette:
+    """
+    录制/回放文件。
+    参数：
+        path (str): cassette 文件路径（gzip 压缩的 NDJSON，每行一个请求/响应对）。
+        mode (str): "record" 或 "replay"。录制会追加到已有文件之后。
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"未知的 cassette 模式: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries = {}
+        self._positions = {}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+            except EOFError:
+                # 录制进程未正常退出时文件缺少 gzip 结尾，已刷新的记录仍然有效
+                pass
+
+    def record(self, method: str, url: str, kwargs: dict, status_code: int, headers, content: bytes):
+        """追加一条请求/响应记录，每条记录后刷新，进程异常退出时已写入的记录仍可读取。"""
+        entry = {
+            "key": request_key(method, url, kwargs),
+            "method": method.upper(),
+            "url": url,
+            "status": status_code,
+            "content_type": headers.get("Content-Type", "application/json"),
+            "body": content.decode("utf-8", "replace"),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def replay(self, method: str, url: str, kwargs: dict) -> dict:
+        """
+        返回与请求匹配的录制条目。
+        异常：
+            CassetteMissError: 没有匹配的录制请求。
+        """
+        key = request_key(method, url, kwargs)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(f"cassette {self.path} 中没有录制该请求: {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def to_requests_response(entry: dict) -> requests.Response:
+    """由录制条目构造 requests.Response。"""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"].encode("utf-8")
+    response.headers["Content-Type"] = entry["content_type"]
+    response.encoding = "utf-8"
+    response.url = entry["url"]
+    return response
+
+
+def to_httpx_response(entry: dict) -> httpx.Response:
+    """由录制条目构造 httpx.Response。"""
+    return httpx.Response(
+        entry["status"],
+        content=entry["body"].encode("utf-8"),
+        headers={"Content-Type": entry["content_type"]},
+        request=httpx.Request(entry["method"], entry["url"]),
+    )
+
+
+_cassette = None
+_configured = False
+_cassette_lock = threading.Lock()
+
+
+def use_cassette(cassette):
+    """设置模块级 cassette（传入 None 关闭录制/回放），之前的 cassette 会被关闭。"""
+    global _cassette, _configured
+    with _cassette_lock:
+        old, _cassette, _configured = _cassette, cassette, True
+    if old is not None and old is not cassette:
+        old.close()
+    return cassette
+
+
+def get_cassette():
+    """
+    获取模块级 cassette，首次调用时按 AMINER_CASSETTE_MODE、AMINER_CASSETTE_PATH 创建。
+    返回：
+        Cassette: 当前 cassette；未开启录制/回放时返回None。
+    """
+    global _cassette, _configured
+    if not _configured:
+        with _cassette_lock:
+            if not _configured:
+                mode = os.getenv("AMINER_CASSETTE_MODE", "off")
+                if mode != "off":
+                    _cassette = Cassette(os.getenv("AMINER_CASSETTE_PATH") or DEFAULT_PATH, mode)
+                _configured = True
+    return _cassette
+
+
+@atexit.register
+def _close_cassette():
+    if _cassette is not None:
+        _cassette.close()
@@ -0,0 +1,197 @@
+"""
+aminer/client.py
+
+AMiner HTTP 客户端。aminer/api.py 中的所有请求都通过本模块提供的模块级客户端发出，
+以便复用到 datacenter.aminer.cn、apiv2.aminer.cn、searchtest.aminer.cn 的 keep-alive 连接，
+避免每次调用都重新进行 TCP+TLS 握手；发送前按主机向 aminer/ratelimit.py 的限速器申请令牌，
+并按 aminer/resilience.py 的策略设置超时、重试与熔断；开启 aminer/cassette.py 时录制或回放请求。
+
+包含的对象及简要介绍：
+- AMinerClient: 持有 requests.Session，按主机维护连接池，连接池大小可配置。
+- get_client: 获取（懒加载）模块级共享客户端。
+- configure_client: 按新的连接池参数重建模块级共享客户端。
+
+环境变量：
+- AMINER_POOL_SIZE: 每个主机的连接池大小，默认16。
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from aminer import cassette as aminer_cassette
+from aminer.ratelimit import HostRateLimiter, get_rate_limiter
+from aminer.resilience import CONNECT_TIMEOUT, READ_TIMEOUT, RETRY_STATUSES, CircuitOpenError, RetryPolicy, get_breaker
+
+DEFAULT_POOL_SIZE = int(os.getenv("AMINER_POOL_SIZE", "16"))
+# 需要维护连接池的主机数（datacenter、apiv2、searchtest），多留余量
+DEFAULT_POOL_HOSTS = 8
+
+
+class AMinerClient:
+    """
+    共享的 AMiner HTTP 客户端。
+
+    参数：
+        pool_size (int): 每个主机保持的最大空闲连接数，通常设为并发请求数。
+        pool_hosts (int): 同时缓存连接池的主机数量。
+        pool_block (bool): 连接池耗尽时是否阻塞等待，默认False（超出的请求使用临时连接）。
+        limiter (HostRateLimiter, 可选): 按主机限速器，默认使用 aminer.ratelimit 的共享限速器。
+        retry (RetryPolicy, 可选): 重试策略，默认按 AMINER_MAX_ATTEMPTS 创建。
+        timeout (tuple): 未显式传入 timeout 的请求使用的 (连接超时, 读取超时) 秒数。
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, pool_hosts: int = DEFAULT_POOL_HOSTS, pool_block: bool = False,
+                 limiter: HostRateLimiter = None, retry: RetryPolicy = None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.pool_size = pool_size
+        self.pool_hosts = pool_hosts
+        self.pool_block = pool_block
+        self.limiter = limiter or get_rate_limiter()
+        self.retry = retry or RetryPolicy()
+        self.timeout = timeout
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_hosts, pool_maxsize=self.pool_size, pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发送请求；开启录制时记录响应，回放模式下直接返回录制的响应，不访问网络。
+        异常：
+            CassetteMissError: 回放模式下请求未被录制。
+        """
+        cassette = aminer_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            return aminer_cassette.to_requests_response(cassette.replay(method, url, kwargs))
+        response = self._send(method, url, **kwargs)
+        if cassette is not None:
+            cassette.record(method, url, kwargs, response.status_code, response.headers, response.content)
+        return response
+
+    def stream(self, method: str, url: str, chunk_size: int = 65536, **kwargs):
+        """
+        流式发送请求，响应体按块读取，不在内存中保留完整响应（录制模式下除外）。
+        返回：
+            tuple: (requests.Response, Iterator[bytes])，先检查状态码再遍历字节块；遍历结束或关闭迭代器时释放连接。
+        """
+        cassette = aminer_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            response = aminer_cassette.to_requests_response(cassette.replay(method, url, kwargs))
+            return response, _chunked(response.content, chunk_size)
+        response = self._send(method, url, stream=True, **kwargs)
+        return response, self._iter_body(response, chunk_size, cassette, method, url, kwargs)
+
+    @staticmethod
+    def _iter_body(response, chunk_size, cassette, method, url, kwargs):
+        recorded = [] if cassette is not None else None
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if recorded is not None:
+                    recorded.append(chunk)
+                yield chunk
+        finally:
+            response.close()
+        if recorded is not None:
+            cassette.record(method, url, kwargs, response.status_code, response.headers, b"".join(recorded))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        按主机限速后发送请求，连接从对应主机的连接池中获取并在响应读取完毕后归还。
+        连接失败、超时以及 429/5xx 响应按重试策略退避重试，并计入主机熔断器。
+        返回：
+            requests.Response: 最后一次尝试的响应（重试用尽时可能仍为 5xx）。
+        异常：
+            CircuitOpenError: 主机处于熔断状态。
+            requests.ConnectionError / requests.Timeout: 重试用尽后仍无法连接或超时。
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        breaker = get_breaker(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            # 熔断期间直接失败，不排队等待令牌
+            breaker.check()
+            self.limiter.acquire(url)
+            # 拿到限速令牌后才占用熔断器：half_open 只有一个试探名额，不能在等待令牌期间被占住
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                # 等待期间熔断器打开或试探名额被占用，请求未发出，归还令牌
+                self.limiter.refund(url)
+                raise
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                if not self.retry.can_retry(method, attempt):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if not self.retry.can_retry(method, attempt):
+                return response
+            response.close()
+            time.sleep(self.retry.delay(attempt, response.headers.get("Retry-After")))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """关闭所有连接池中的连接。"""
+        self.session.close()
+
+
+def _chunked(content: bytes, chunk_size: int):
+    for i in range(0, len(content), chunk_size):
+        yield content[i:i + chunk_size]
+
+
+_client: AMinerClient = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> AMinerClient:
+    """
+    获取模块级共享客户端，首次调用时按默认参数创建。
+    返回：
+        AMinerClient: 共享客户端实例。
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AMinerClient()
+    return _client
+
+
+def configure_client(**kwargs) -> AMinerClient:
+    """
+    以新的参数重建模块级共享客户端，旧客户端的连接会被关闭。
+    参数：
+        **kwargs: 透传给 AMinerClient，如 pool_size、pool_block。
+    返回：
+        AMinerClient: 新的共享客户端实例。
+    """
+    global _client
+    with _client_lock:
+        old = _client
+        _client = AMinerClient(**kwargs)
+    if old is not None:
+        old.close()
+    return _client
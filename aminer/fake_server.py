@@ -0,0 +1,349 @@
+"""
+aminer/fake_server.py
+
+本地 AMiner 替身服务，实现 aminer/api.py 访问的全部接口，用于在无网络环境下进行可复现的吞吐与延迟测试。
+数据以 aminer/demo/*.json 为模板：demo 中的学者原样提供，另外按随机种子确定性地合成学者、论文与专利，
+同一种子、同一学者ID每次返回相同的数据。
+
+实现的接口：
+- POST /gateway/open_platform/api/person/search: 学者检索（datacenter）。
+- GET  /gateway/open_platform/api/person/paper/relation: 学者论文关系（datacenter，已废弃的付费接口）。
+- GET  /gateway/open_platform/api/paper/search: 论文标题检索（datacenter，已废弃）。
+- POST /n: apiv2 网关，支持 person.SearchPersonPaper 与 personapi.get action。
+- POST /magic: 同 /n（personapi.get 的批量详情）。
+- POST /aminer-search/search/patentV2: 按发明人检索专利（searchtest）。
+
+包含的对象及简要介绍：
+- FakeAMinerData: 确定性的数据生成器。
+- FakeAMinerServer: 多线程 HTTP 服务，可配置延迟、错误率与单页最大条数，并统计各路径请求数。
+- serve_in_thread: 在后台线程启动服务，返回 (server, base_url)，供测试与基准脚本使用。
+
+用法：
+    python -m aminer.fake_server --port 8900 --latency-ms 50 --error-rate 0.01
+    AMINER_BASE_URL=http://127.0.0.1:8900 AMINER_TOKEN=fake uvicorn backend.app.main:app
+
+注意事项：
+- 24位十六进制的学者ID即使不在数据集中也会被确定性地合成（便于用任意ID压测），其他未知ID视为不存在。
+- needDetails=False 时论文/专利只返回 id、标题、年份/公开日等列表字段。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo")
+OBJECT_ID = re.compile(r"^[0-9a-f]{24}$")
+
+# needDetails=False 时保留的列表字段
+PAPER_LIST_FIELDS = ("id", "title", "year", "num_citation")
+PATENT_LIST_FIELDS = ("id", "title", "pubDate", "pubNum")
+
+
+def _load_demo(name):
+    with open(os.path.join(DEMO_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _object_id(*parts) -> str:
+    """由任意字符串确定性地生成24位十六进制ID（与 AMiner 的 ObjectId 格式一致）。"""
+    return hashlib.sha1(":".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:24]
+
+
+class FakeAMinerData:
+    """
+    确定性的 AMiner 数据生成器。
+    参数：
+        seed (int): 随机种子。
+        scholars (int): 除 demo 学者外合成的学者数量（用于学者检索）。
+        papers_per_scholar (int): 每位学者的平均论文数，实际数量在其 0.5~1.5 倍之间。
+        patents_per_scholar (int): 每位学者的平均专利数，实际数量在其 0.5~1.5 倍之间。
+    """
+
+    def __init__(self, seed: int = 0, scholars: int = 100, papers_per_scholar: int = 200, patents_per_scholar: int = 30):
+        self.seed = seed
+        self.papers_per_scholar = papers_per_scholar
+        self.patents_per_scholar = patents_per_scholar
+        self.person_template = _load_demo("person_detail.json")["data"][0]["data"][0]
+        self.paper_templates = _load_demo("paper.json")["data"][0]["data"]["hitList"] + _load_demo("paper-1.json")["hitList"]
+        self.patent_templates = _load_demo("patents.json")["data"]["hitList"]
+        self.persons = {}
+        for person in _load_demo("person_detail.json")["data"][0]["data"]:
+            self.persons[person["id"]] = person
+        for scholar in _load_demo("scholars.json"):
+            person = {k: v for k, v in scholar.items() if k not in ("id", "aminer_id")}
+            person["id"] = scholar["aminer_id"]
+            self.persons.setdefault(person["id"], person)
+        for i in range(scholars):
+            person = self._synthetic_person(_object_id(seed, "person", i))
+            self.persons[person["id"]] = person
+
+    def _rng(self, *parts) -> random.Random:
+        return random.Random(":".join(str(p) for p in (self.seed,) + parts))
+
+    def _synthetic_person(self, person_id):
+        rng = self._rng("person", person_id)
+        person = json.loads(json.dumps(self.person_template))
+        number = rng.randrange(100000)
+        person.update({
+            "id": person_id,
+            "name": f"Scholar {number}",
+            "name_zh": f"学者{number}",
+            "avatar": "",
+        })
+        indices = person.setdefault("indices", {})
+        indices["hindex"] = rng.randint(1, 80)
+        indices["citations"] = rng.randint(10, 50000)
+        indices["pubs"] = rng.randint(5, 500)
+        return person
+
+    def person(self, person_id: str):
+        """返回学者详情，未知ID返回None（24位十六进制ID会被合成）。"""
+        person = self.persons.get(person_id)
+        if person is None and OBJECT_ID.match(person_id or ""):
+            person = self._synthetic_person(person_id)
+        return person
+
+    def search_persons(self, name: str = "", org: str = "", offset: int = 0, size: int = 10):
+        """按姓名/机构子串（不区分大小写）检索学者，返回 (命中列表, 总数)，条目结构同 person/search 接口。"""
+        name, org = (name or "").lower(), (org or "").lower()
+        matched = []
+        for person in self.persons.values():
+            profile = person.get("profile") or {}
+            names = (person.get("name") or "") + " " + (person.get("name_zh") or "")
+            orgs = (profile.get("affiliation") or "") + " " + (profile.get("affiliation_zh") or "")
+            if name in names.lower() and org in orgs.lower():
+                matched.append(person)
+        hits = [{
+            "id": p["id"],
+            "interests": p.get("tags") or [],
+            "n_citation": (p.get("indices") or {}).get("citations", 0),
+            "name": p.get("name", ""),
+            "name_zh": p.get("name_zh", ""),
+            "org": (p.get("profile") or {}).get("affiliation", ""),
+            "org_id": "",
+            "org_zh": (p.get("profile") or {}).get("affiliation_zh", ""),
+        } for p in matched[offset:offset + size]]
+        return hits, len(matched)
+
+    def _count(self, kind, scholar_id, average):
+        if self.person(scholar_id) is None:
+            return 0
+        return self._rng(kind, "count", scholar_id).randint(average // 2, average * 3 // 2)
+
+    def paper_count(self, scholar_id: str) -> int:
+        return self._count("papers", scholar_id, self.papers_per_scholar)
+
+    def paper(self, scholar_id: str, index: int, total: int) -> dict:
+        """第 index 篇论文（按年份倒序），由模板复制并替换 id、标题、年份、引用数。"""
+        rng = self._rng("paper", scholar_id, index)
+        hit = dict(self.paper_templates[index % len(self.paper_templates)])
+        hit["id"] = _object_id(self.seed, "paper", scholar_id, index)
+        hit["title"] = f"{hit.get('title') or hit.get('title_zh') or 'Paper'} ({index})"
+        hit["year"] = 2025 - index * 30 // max(total, 1)
+        hit["num_citation"] = rng.randint(0, 500)
+        return hit
+
+    def patent_count(self, scholar_id: str) -> int:
+        return self._count("patents", scholar_id, self.patents_per_scholar)
+
+    def patent(self, scholar_id: str, index: int, total: int) -> dict:
+        """第 index 项专利（按公开日倒序），由模板复制并替换 id、公开号、公开日。"""
+        hit = dict(self.patent_templates[index % len(self.patent_templates)])
+        year = 2025 - index * 15 // max(total, 1)
+        hit["id"] = _object_id(self.seed, "patent", scholar_id, index)
+        hit["pubNum"] = str(100000000 + int(hit["id"][:6], 16))
+        hit["pubSearchId"] = "CN" + hit["pubNum"] + "A"
+        hit["pubDate"] = f"{year}-{(index % 12) + 1:02d}-01T00:00:00Z"
+        return hit
+
+    def page(self, kind: str, scholar_id: str, page: int, size: int, need_details: bool = True) -> dict:
+        """返回 {"hitList": [...], "hitsTotal": int}，kind 为 "papers" 或 "patents"。"""
+        if kind == "papers":
+            total, make, fields = self.paper_count(scholar_id), self.paper, PAPER_LIST_FIELDS
+        else:
+            total, make, fields = self.patent_count(scholar_id), self.patent, PATENT_LIST_FIELDS
+        start = page * size
+        hits = [make(scholar_id, i, total) for i in range(start, min(start + size, total))]
+        if not need_details:
+            hits = [{k: hit[k] for k in fields if k in hit} for hit in hits]
+        return {"hitList": hits, "hitsTotal": total}
+
+
+class FakeAMinerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null") if length else None
+
+    def _handle(self, method):
+        server = self.server
+        parts = urlsplit(self.path)
+        body = self._read_json() if method == "POST" else None
+        server.count(parts.path)
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            return self._send_json(503, {"code": 503, "success": False, "msg": "fake upstream error"})
+        route = server.routes.get((method, parts.path))
+        if route is None:
+            return self._send_json(404, {"code": 404, "success": False, "msg": "not found"})
+        return self._send_json(200, route(server, body, parse_qs(parts.query)))
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def _person_search(server, body, query):
+    body = body or {}
+    size = min(int(body.get("size") or 1), server.max_page_size)
+    hits, total = server.data.search_persons(body.get("name"), body.get("org"), int(body.get("offset") or 0), size)
+    return {"code": 200, "success": True, "msg": "", "data": hits, "total": total}
+
+
+def _paper_relation(server, body, query):
+    scholar_id = (query.get("id") or [""])[0]
+    page = server.data.page("papers", scholar_id, 0, server.data.paper_count(scholar_id), need_details=False)
+    data = [{"author_id": scholar_id, "id": hit["id"], "title": hit["title"]} for hit in page["hitList"]]
+    return {"code": 200, "success": True, "msg": "", "data": data, "total": float(page["hitsTotal"])}
+
+
+def _paper_search(server, body, query):
+    title = (query.get("title") or [""])[0].lower()
+    data = [{"id": _object_id("title", hit.get("title")), "title": hit.get("title"), "doi": hit.get("doi")}
+            for hit in server.data.paper_templates if title in (hit.get("title") or "").lower()]
+    return {"code": 200, "success": bool(data), "msg": "" if data else "no data", "data": data[:1]}
+
+
+def _gateway(server, body, query):
+    results = []
+    for action in body or []:
+        name, params = action.get("action"), action.get("parameters") or {}
+        if name == "person.SearchPersonPaper":
+            search = params.get("search_param") or {}
+            size = min(int(search.get("size") or 10), server.max_page_size)
+            data = server.data.page("papers", params.get("person_id"), int(search.get("page") or 0), size,
+                                    bool(search.get("needDetails", True)))
+        elif name == "personapi.get":
+            data = [p for p in (server.data.person(pid) for pid in params.get("ids") or []) if p is not None]
+        else:
+            results.append({"data": None, "succeed": False, "error": f"unknown action {name}"})
+            continue
+        results.append({"data": data, "meta": {"time": 0}, "succeed": True})
+    return {"data": results}
+
+
+def _patents(server, body, query):
+    body = body or {}
+    scholar_id = next((f.get("value") for f in body.get("filters") or [] if f.get("field") == "inventor.person_id"), "")
+    size = min(int(body.get("size") or 10), server.max_page_size)
+    data = server.data.page("patents", scholar_id, int(body.get("page") or 0), size, bool(body.get("needDetails", True)))
+    return {"code": 200, "success": True, "msg": "", "data": data}
+
+
+class FakeAMinerServer(ThreadingHTTPServer):
+    """
+    AMiner 替身服务。
+    参数：
+        address (tuple): 监听地址，端口为0时自动分配。
+        data (FakeAMinerData, 可选): 数据生成器，默认按种子0创建。
+        latency_ms (float): 每个请求的固定延迟（毫秒）。
+        jitter_ms (float): 在固定延迟之上增加的 0~jitter_ms 随机延迟（毫秒）。
+        error_rate (float): 返回503的概率（0~1）。
+        max_page_size (int): 单页最多返回的条数，超出请求的 size 被截断（hitsTotal 不变）。
+    """
+
+    daemon_threads = True
+    routes = {
+        ("POST", "/gateway/open_platform/api/person/search"): _person_search,
+        ("GET", "/gateway/open_platform/api/person/paper/relation"): _paper_relation,
+        ("GET", "/gateway/open_platform/api/paper/search"): _paper_search,
+        ("POST", "/n"): _gateway,
+        ("POST", "/magic"): _gateway,
+        ("POST", "/aminer-search/search/patentV2"): _patents,
+    }
+
+    def __init__(self, address=("127.0.0.1", 0), data: FakeAMinerData = None, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, max_page_size: int = 1000):
+        super().__init__(address, FakeAMinerHandler)
+        self.data = data or FakeAMinerData()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.max_page_size = max_page_size
+        self.requests = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path):
+        with self._lock:
+            self.requests[path] += 1
+
+
+def serve_in_thread(**kwargs):
+    """
+    在后台守护线程中启动替身服务。
+    参数：
+        **kwargs: 透传给 FakeAMinerServer。
+    返回：
+        tuple: (FakeAMinerServer, base_url)，使用完毕后调用 server.shutdown()。
+    """
+    server = FakeAMinerServer(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 AMiner 替身服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scholars", type=int, default=100, help="合成学者数量")
+    parser.add_argument("--papers-per-scholar", type=int, default=200)
+    parser.add_argument("--patents-per-scholar", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--max-page-size", type=int, default=1000)
+    args = parser.parse_args()
+    data = FakeAMinerData(args.seed, args.scholars, args.papers_per_scholar, args.patents_per_scholar)
+    server = FakeAMinerServer((args.host, args.port), data, args.latency_ms, args.jitter_ms, args.error_rate, args.max_page_size)
+    print(f"AMiner 替身服务已启动: {server.base_url}（AMINER_BASE_URL={server.base_url}）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
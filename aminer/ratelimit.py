@@ -0,0 +1,219 @@
+"""
+aminer/ratelimit.py
+
+按主机的客户端令牌桶限速。aminer/client.py 与 aminer/async_api.py 在发出每个请求前向本模块申请令牌，
+令牌不足时同步调用阻塞等待、异步调用 await 等待，使批量刷新以稳定速率访问 AMiner，
+而不是瞬间突发后被上游限流或返回错误。
+
+令牌采用“预约”方式发放：每次申请都立即扣减一个令牌（可为负数）并返回需要等待的时间，
+因此并发申请者按到达顺序均匀排开，不会在令牌恢复时同时醒来再次争抢。
+预约后未实际发送的请求（如被熔断器拒绝）以 refund 归还令牌，不占用限速配额。
+
+包含的对象及简要介绍：
+- TokenBucket: 进程内令牌桶，线程安全。
+- FileTokenBucket: 以本地文件保存状态、用文件锁互斥的令牌桶，可在同一台机器的多个 worker 进程间共享。
+- HostRateLimiter: 按 URL 的主机名选择令牌桶，未配置的主机不限速。
+- get_rate_limiter: 获取按环境变量创建的模块级共享限速器。
+
+环境变量：
+- AMINER_RATE_LIMITS: 按主机覆盖限速，格式 "主机=每秒请求数[:突发数]"，逗号分隔，
+  如 "apiv2.aminer.cn=5:10,searchtest.aminer.cn=0"（某主机设为0表示该主机不限速；不含 "=" 的项被忽略）。
+- AMINER_RATE_LIMIT_DIR: 设置后令牌桶状态保存在该目录下（每个主机一个文件），多个进程共享同一配额。
+
+注意事项：
+- FileTokenBucket 依赖 fcntl 文件锁，仅支持 Linux/macOS。
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 默认限速（每秒请求数, 突发数），仅作用于 AMiner 的三个主机
+DEFAULT_RATE_LIMITS = {
+    "datacenter.aminer.cn": (10.0, 10),
+    "apiv2.aminer.cn": (10.0, 10),
+    "searchtest.aminer.cn": (10.0, 10),
+}
+
+
+def _refill(tokens, updated_at, now, rate, capacity, cost=1):
+    """按经过的时间补充令牌并预约 cost 个（为负数时归还），返回 (剩余令牌数, 需要等待的秒数)。"""
+    tokens = min(capacity, min(capacity, tokens + (now - updated_at) * rate) - cost)
+    return tokens, max(0.0, -tokens / rate)
+
+
+class TokenBucket:
+    """
+    进程内令牌桶。
+    参数：
+        rate (float): 每秒补充的令牌数，即稳定状态下的每秒请求数。
+        capacity (int): 桶容量，即允许的最大突发请求数。
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, cost: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _refill(self._tokens, self._updated_at, now, self.rate, self.capacity, cost)
+            self._updated_at = now
+            return wait
+
+    def reserve(self) -> float:
+        """预约一个令牌，返回调用方需要等待的秒数（0 表示可以立即发送）。"""
+        return self._take(1)
+
+    def refund(self):
+        """归还一个已预约但未使用的令牌，桶中令牌数不超过容量。"""
+        self._take(-1)
+
+    def acquire(self):
+        """获取一个令牌，不足时阻塞当前线程。"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """获取一个令牌，不足时 await 等待，不阻塞事件循环。"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    跨进程共享的令牌桶，状态以 JSON 保存在 path 文件中，每次预约时持有排他文件锁。
+    参数：
+        path (str): 状态文件路径，所在目录不存在时自动创建。
+        rate (float): 同 TokenBucket，为所有进程合计的速率。
+        capacity (int): 同 TokenBucket。
+    """
+
+    def __init__(self, path: str, rate: float, capacity: int = None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket 需要 fcntl 文件锁，当前平台不支持")
+        super().__init__(rate, capacity)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+
+    def _take(self, cost: int) -> float:
+        # 多进程间的墙上时间才可比较，因此这里使用 time.time() 而不是 monotonic
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                now = time.time()
+                try:
+                    state = json.loads(f.read())
+                    tokens, updated_at = float(state["tokens"]), float(state["updated_at"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated_at = float(self.capacity), now
+                tokens, wait = _refill(tokens, min(updated_at, now), now, self.rate, self.capacity, cost)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated_at": now}))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class HostRateLimiter:
+    """
+    按主机限速的限速器。
+    参数：
+        limits (dict): {主机名: (每秒请求数, 突发数)}，未列出或速率为0的主机不限速。
+        shared_dir (str, 可选): 设置后使用 FileTokenBucket，在多个进程间共享配额。
+    """
+
+    def __init__(self, limits: dict = None, shared_dir: str = None):
+        self.limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self.shared_dir = shared_dir
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str):
+        """返回 url 所在主机的令牌桶，不限速的主机返回 None。"""
+        host = urlsplit(url).hostname or ""
+        rate, capacity = self.limits.get(host, (0, None))
+        if not rate:
+            return None
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    if self.shared_dir:
+                        bucket = FileTokenBucket(os.path.join(self.shared_dir, host + ".bucket"), rate, capacity)
+                    else:
+                        bucket = TokenBucket(rate, capacity)
+                    self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str):
+        """发送同步请求前调用，必要时阻塞等待。"""
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, url: str):
+        """发送异步请求前调用，必要时 await 等待。"""
+        bucket = self.bucket(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def refund(self, url: str):
+        """已取得令牌但请求未发出（如被熔断器拒绝）时调用，归还令牌。"""
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.refund()
+
+
+def parse_rate_limits(spec: str) -> dict:
+    """
+    解析 AMINER_RATE_LIMITS 格式的字符串，并合并到默认限速上。
+    示例：
+        parse_rate_limits("apiv2.aminer.cn=5:10") -> {..., "apiv2.aminer.cn": (5.0, 10)}
+    """
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        host, value = item.split("=", 1)
+        rate, _, burst = value.partition(":")
+        limits[host.strip()] = (float(rate), int(burst) if burst else None)
+    return limits
+
+
+_limiter: HostRateLimiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+    获取模块级共享限速器，首次调用时按 AMINER_RATE_LIMITS、AMINER_RATE_LIMIT_DIR 创建。
+    返回：
+        HostRateLimiter: 共享限速器实例。
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter(
+                    parse_rate_limits(os.getenv("AMINER_RATE_LIMITS")),
+                    shared_dir=os.getenv("AMINER_RATE_LIMIT_DIR") or None,
+                )
+    return _limiter
@@ -0,0 +1,277 @@
+"""
+aminer/records.py
+
+AMiner 返回结果的类型化记录。各层原本直接传递 AMiner 的嵌套dict，并在使用处反复以 .get() 链取值；
+本模块提供 __slots__ 冻结数据类，每种结构只在解码时取一次值，单条记录的内存占用也小于原始dict。
+嵌套字段（authors、indices、profile、中英文标题等）保持 AMiner 原样，不做深拷贝。
+
+包含的对象及简要介绍：
+- PersonHit: 学者检索（search_person_by_name）结果中的单个学者。
+- PersonDetail: 学者详情（get_person_detail_by_id），to_orm_kwargs 返回 Scholar 列值。
+- PaperHit: 论文检索（search_papers_by_scholar_free）结果中的单篇论文，to_orm_kwargs 返回 Paper 列值。
+- PatentHit: 专利检索（search_patents_by_scholar_free）结果中的单项专利，to_orm_kwargs 返回 Patent 列值。
+- localized_text: 从 {"zh": ..., "en": ...} 形式的中英文字段中取显示文本（优先中文）。
+- decode_hits: 将 {"hitList": [...], "hitsTotal": int} 中的 hit 解码为记录。
+
+注意事项：
+- 各记录的 from_json 接受 AMiner 原始dict；缺失或为null的字段取空值（""、0、[]、{}），与前端入库时的默认值一致。
+- Paper/Patent 的JSON列以JSON字符串存储（同 PaperIn/PatentIn），to_orm_kwargs 负责序列化。
+"""
+
+import json
+from dataclasses import dataclass
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def localized_text(value) -> str:
+    """
+    从中英文字段取显示文本：依次取 zh、en（列表取首个元素），都没有时返回 str(value)。
+    参数：
+        value: 如 {"zh": ["标题"], "en": ["Title"]}，非dict时直接转为字符串。
+    """
+    if isinstance(value, dict):
+        for key in ("zh", "en"):
+            text = value.get(key)
+            if isinstance(text, list) and text:
+                return text[0]
+            if isinstance(text, str):
+                return text
+    return str(value)
+
+
+@dataclass(frozen=True, slots=True)
+class PersonHit:
+    """学者检索结果中的单个学者。"""
+    id: str
+    name: str
+    name_zh: str
+    org: str
+    org_zh: str
+    org_id: str
+    interests: list
+    n_citation: int
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PersonHit":
+        get = data.get
+        return cls(
+            get("id") or "",
+            get("name") or "",
+            get("name_zh") or "",
+            get("org") or "",
+            get("org_zh") or "",
+            get("org_id") or "",
+            get("interests") or [],
+            get("n_citation") or 0,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PersonDetail:
+    """学者详情，结构见 aminer_api.get_person_detail_by_id。"""
+    id: str
+    name: str
+    name_zh: str
+    avatar: str
+    nation: str
+    indices: dict
+    links: dict
+    profile: dict
+    tags: list
+    tags_score: list
+    tags_zh: list
+    num_followed: int
+    num_upvoted: int
+    num_viewed: int
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PersonDetail":
+        get = data.get
+        return cls(
+            get("id") or "",
+            get("name") or "",
+            get("name_zh") or "",
+            get("avatar") or "",
+            get("nation") or "",
+            get("indices") or {},
+            get("links") or {},
+            get("profile") or {},
+            get("tags") or [],
+            get("tags_score") or [],
+            get("tags_zh") or [],
+            get("num_followed") or 0,
+            get("num_upvoted") or 0,
+            get("num_viewed") or 0,
+        )
+
+    def to_orm_kwargs(self) -> dict:
+        """返回 Scholar 列值（同 ScholarIn），性别、主页、职称、工作经历等取自 profile。"""
+        profile = self.profile
+        return {
+            "aminer_id": self.id,
+            "name": self.name,
+            "name_zh": self.name_zh,
+            "avatar": self.avatar,
+            "nation": self.nation,
+            "indices": self.indices,
+            "links": self.links,
+            "profile": profile,
+            "tags": self.tags,
+            "tags_score": self.tags_score,
+            "tags_zh": self.tags_zh,
+            "num_followed": self.num_followed,
+            "num_upvoted": self.num_upvoted,
+            "num_viewed": self.num_viewed,
+            "gender": profile.get("gender", ""),
+            "homepage": profile.get("homepage", ""),
+            "position": profile.get("position", ""),
+            "position_zh": profile.get("position_zh", ""),
+            "work": profile.get("work", ""),
+            "work_zh": profile.get("work_zh", ""),
+            "note": profile.get("note", ""),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PaperHit:
+    """论文检索结果中的单篇论文，结构见 aminer_api.search_papers_by_scholar_free。"""
+    id: str
+    title: str
+    abstract: str
+    authors: list
+    year: int
+    lang: str
+    num_citation: int
+    pdf: str
+    urls: list
+    versions: list
+    create_time: str
+    update_times: dict
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PaperHit":
+        get = data.get
+        return cls(
+            get("id") or "",
+            get("title") or "",
+            get("abstract") or "",
+            get("authors") or [],
+            get("year") or 0,
+            get("lang") or "",
+            get("num_citation") or 0,
+            get("pdf") or "",
+            get("urls") or [],
+            get("versions") or [],
+            get("create_time") or "",
+            get("update_times") or {},
+        )
+
+    def to_orm_kwargs(self, scholar_id: int) -> dict:
+        """返回 Paper 列值（同 PaperIn），authors/urls/versions/update_times 为JSON字符串。"""
+        return {
+            "aminer_id": self.id,
+            "scholar_id": scholar_id,
+            "title": self.title,
+            "abstract": self.abstract,
+            "authors": _dumps(self.authors),
+            "year": self.year,
+            "lang": self.lang,
+            "num_citation": self.num_citation,
+            "pdf": self.pdf,
+            "urls": _dumps(self.urls),
+            "versions": _dumps(self.versions),
+            "create_time": self.create_time,
+            "update_times": _dumps(self.update_times),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PatentHit:
+    """专利检索结果中的单项专利，结构见 aminer_api.search_patents_by_scholar_free（字段名改为下划线形式）。"""
+    id: str
+    title: dict
+    abstract: dict
+    app_date: str
+    app_num: str
+    applicant: list
+    assignee: list
+    country: str
+    cpc: list
+    inventor: list
+    ipc: list
+    ipcr: list
+    pct: list
+    priority: list
+    pub_date: str
+    pub_kind: str
+    pub_num: str
+    pub_search_id: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PatentHit":
+        get = data.get
+        return cls(
+            get("id") or "",
+            get("title") or {},
+            get("abstract") or {},
+            get("appDate") or "",
+            get("appNum") or "",
+            get("applicant") or [],
+            get("assignee") or [],
+            get("country") or "",
+            get("cpc") or [],
+            get("inventor") or [],
+            get("ipc") or [],
+            get("ipcr") or [],
+            get("pct") or [],
+            get("priority") or [],
+            get("pubDate") or "",
+            get("pubKind") or "",
+            get("pubNum") or "",
+            get("pubSearchId") or "",
+        )
+
+    @property
+    def display_title(self) -> str:
+        """显示用标题，优先中文。"""
+        return localized_text(self.title)
+
+    def to_orm_kwargs(self, scholar_id: int) -> dict:
+        """返回 Patent 列值（同 PatentIn），title/abstract/applicant 等为JSON字符串。"""
+        return {
+            "aminer_id": self.id,
+            "scholar_id": scholar_id,
+            "title": _dumps(self.title),
+            "abstract": _dumps(self.abstract),
+            "app_date": self.app_date,
+            "app_num": self.app_num,
+            "applicant": _dumps(self.applicant),
+            "assignee": _dumps(self.assignee),
+            "country": self.country,
+            "cpc": _dumps(self.cpc),
+            "inventor": _dumps(self.inventor),
+            "ipc": _dumps(self.ipc),
+            "ipcr": _dumps(self.ipcr),
+            "pct": _dumps(self.pct),
+            "priority": _dumps(self.priority),
+            "pub_date": self.pub_date,
+            "pub_kind": self.pub_kind,
+            "pub_num": self.pub_num,
+            "pub_search_id": self.pub_search_id,
+        }
+
+
+def decode_hits(result: dict, record) -> dict:
+    """
+    将检索结果中的 hit 解码为记录。
+    参数：
+        result (dict): {"hitList": [...], "hitsTotal": int}。
+        record: PaperHit 或 PatentHit 等带 from_json 的记录类。
+    返回：
+        dict: {"hitList": [record, ...], "hitsTotal": int}。
+    """
+    from_json = record.from_json
+    return {"hitList": [from_json(hit) for hit in result.get("hitList") or []], "hitsTotal": result.get("hitsTotal") or 0}
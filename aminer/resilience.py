@@ -0,0 +1,200 @@
+"""
+aminer/resilience.py
+
+AMiner 请求的容错策略：超时、带抖动的指数退避重试、按主机的熔断器。
+aminer/client.py 与 aminer/async_api.py 在每次请求时使用本模块的策略，
+使单个缓慢的 AMiner 响应不会无限占用 worker，短暂的 5xx 不会直接变成用户侧错误，
+AMiner 整体不可用时快速失败而不是让请求逐个超时。
+
+包含的对象及简要介绍：
+- RetryPolicy: 重试策略（次数、可重试的方法与状态码、退避时间计算）。
+- CircuitBreaker: 单个主机的熔断器（closed -> open -> half_open -> closed）。
+- CircuitOpenError: 熔断期间发出的请求直接抛出的异常。
+- get_breaker: 获取 URL 所在主机的共享熔断器。
+- breaker_states: 所有主机熔断器的当前状态，供诊断接口使用。
+
+环境变量：
+- AMINER_CONNECT_TIMEOUT: 建立连接的超时秒数，默认5。
+- AMINER_READ_TIMEOUT: 读取响应的超时秒数，默认30。
+- AMINER_MAX_ATTEMPTS: 每个请求最多尝试的次数（含首次），默认3。
+- AMINER_BREAKER_THRESHOLD: 连续失败多少次后熔断，默认5。
+- AMINER_BREAKER_RESET: 熔断后多少秒允许一次试探请求，默认30。
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+CONNECT_TIMEOUT = float(os.getenv("AMINER_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("AMINER_READ_TIMEOUT", "30"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("AMINER_MAX_ATTEMPTS", "3"))
+DEFAULT_BREAKER_THRESHOLD = int(os.getenv("AMINER_BREAKER_THRESHOLD", "5"))
+DEFAULT_BREAKER_RESET = float(os.getenv("AMINER_BREAKER_RESET", "30"))
+
+# 视为上游暂时不可用、值得重试的响应状态码
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """主机处于熔断状态，请求未发出。"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"AMiner服务暂不可用（{host} 已熔断，{retry_after:.0f}秒后重试）")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """
+    重试策略。
+    参数：
+        max_attempts (int): 最多尝试次数（含首次），1 表示不重试。
+        base_delay (float): 首次重试前的基础等待秒数，之后每次翻倍。
+        max_delay (float): 单次等待的上限秒数。
+        retry_methods (Iterable[str]): 允许重试的 HTTP 方法。本包访问的 AMiner 接口（包括以 POST 提交的检索与详情查询）
+            都是只读查询，重复发送没有副作用，因此默认包含 POST。
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = 0.2, max_delay: float = 5.0,
+                 retry_methods=("GET", "HEAD", "POST")):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """第 attempt 次（从1开始）尝试失败后是否还可以重试。"""
+        return method.upper() in self.retry_methods and attempt < self.max_attempts
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        第 attempt 次尝试失败后的等待秒数：指数退避上限内的完全随机抖动（full jitter），
+        避免大量客户端同时重试；响应带 Retry-After（秒）时以其为准（不超过 max_delay）。
+        """
+        if retry_after:
+            try:
+                return min(self.max_delay, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器，线程安全，同步与异步客户端共用。
+    参数：
+        host (str): 主机名，用于错误信息与诊断输出。
+        failure_threshold (int): 连续失败多少次后进入 open 状态。
+        reset_timeout (float): open 状态持续多少秒后进入 half_open，放行一个试探请求。
+    """
+
+    def __init__(self, host: str, failure_threshold: int = DEFAULT_BREAKER_THRESHOLD, reset_timeout: float = DEFAULT_BREAKER_RESET):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def check(self):
+        """
+        不占用试探名额的预检，供等待限速令牌之前调用，熔断期间的请求不必排队等待令牌。
+        half_open 状态下不拒绝：排队期间试探请求可能已成功，最终由 before_request 决定。
+        异常：
+            open 状态且未到 reset_timeout 时抛出 CircuitOpenError。
+        """
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, remaining)
+
+    def before_request(self):
+        """
+        发送请求前调用。
+        异常：
+            open 状态，或 half_open 状态下已有试探请求在进行时，抛出 CircuitOpenError。
+        """
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, remaining)
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, self.reset_timeout)
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """请求既未成功也不能算作上游故障时调用（如被取消），仅释放 half_open 的试探名额。"""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        """返回 {"state", "failures", "rejected", "retry_after"} 形式的状态快照。"""
+        with self._lock:
+            retry_after = None
+            if self.state == "open":
+                retry_after = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected, "retry_after": retry_after}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """
+    获取 url 所在主机的共享熔断器（同一进程内的同步与异步客户端共用），首次访问时创建。
+    返回：
+        CircuitBreaker: 主机对应的熔断器。
+    """
+    host = urlsplit(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(host)
+            if breaker is None:
+                breaker = _breakers[host] = CircuitBreaker(host)
+    return breaker
+
+
+def breaker_states() -> dict:
+    """
+    返回所有已访问主机的熔断器状态。
+    返回：
+        dict: {主机: {"state": "closed"|"open"|"half_open", "failures": int, "rejected": int, "retry_after": float|None}}
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.snapshot() for breaker in breakers}
+
+
+def reset_breakers():
+    """清除所有熔断器状态（用于测试或人工恢复）。"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,140 @@
+"""
+aminer/singleflight.py
+
+AMiner 请求合并（single-flight）：同一时刻对同一函数、同一组参数的多个调用只向上游发出一次请求，
+其余调用方等待并共享这次请求的结果或异常。适用于多人同时打开同一学者页面等场景；
+与 aminer/cache.py 配合时，缓存未命中期间的并发请求也只会访问 AMiner 一次。
+
+包含的对象及简要介绍：
+- SingleFlight: 请求合并组，do 用于多线程的同步调用，do_async 用于协程调用，并统计合并次数。
+- flight_call / flight_call_async: 以默认合并组执行一次同步/异步调用，键由接口名与规范化参数生成（同 aminer.cache.make_key）。
+- coalesced: 装饰器形式，自动区分同步与异步函数。
+- default_group: 模块级共享合并组。
+
+注意事项：
+- 合并的调用方拿到的是同一个结果对象，不应修改。
+- 异步调用按事件循环分别合并；某个调用方被取消不会取消共享的请求。
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import weakref
+from collections import defaultdict
+
+from aminer.cache import make_key
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    请求合并组。
+    键相同的调用在前一个调用完成之前到达时会被合并；完成之后到达的调用重新发起请求。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = weakref.WeakKeyDictionary()
+        self._counters = defaultdict(lambda: {"calls": 0, "coalesced": 0})
+
+    def _count(self, name, coalesced):
+        with self._lock:
+            counter = self._counters[name]
+            counter["calls"] += 1
+            counter["coalesced"] += coalesced
+
+    def do(self, key: str, fn, *args, name: str = "default", **kwargs):
+        """
+        同步执行 fn(*args, **kwargs)；已有相同 key 的调用在进行时，阻塞等待并返回其结果。
+        异常：
+            共享调用抛出的异常会在每个调用方中重新抛出。
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self._count(name, not leader)
+        if not leader:
+            call.event.wait()
+        else:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: str, fn, *args, name: str = "default", **kwargs):
+        """
+        do 的异步版本，fn 为协程函数。共享请求在独立任务中运行，调用方通过 asyncio.shield 等待它。
+        """
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        self._count(name, task is not None)
+        if task is None:
+            task = calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda _: calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """
+        返回各接口的合并统计：
+            {name: {"calls": int, "coalesced": int}}  # coalesced 为未实际发出、共享了其他调用结果的次数
+        """
+        with self._lock:
+            return {name: dict(counter) for name, counter in self._counters.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
+
+
+default_group = SingleFlight()
+
+
+def flight_call(name: str, fn, *args, group: SingleFlight = None, ignore=(), **kwargs):
+    """以合并组执行一次同步调用，并发的相同调用（同一 name、规范化后参数相同）共享同一次请求。"""
+    key = make_key(name, fn, args, kwargs, ignore)
+    return (group or default_group).do(key, fn, *args, name=name, **kwargs)
+
+
+async def flight_call_async(name: str, fn, *args, group: SingleFlight = None, ignore=(), **kwargs):
+    """flight_call 的异步版本，fn 为协程函数。"""
+    key = make_key(name, fn, args, kwargs, ignore)
+    return await (group or default_group).do_async(key, fn, *args, name=name, **kwargs)
+
+
+def coalesced(name: str, group: SingleFlight = None, ignore=()):
+    """
+    请求合并装饰器，自动区分同步函数与协程函数。
+    示例：
+        get_detail = coalesced("person_detail")(aminer.api.get_person_detail_by_id)
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await flight_call_async(name, fn, *args, group=group, ignore=ignore, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flight_call(name, fn, *args, group=group, ignore=ignore, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,152 @@
+"""
+aminer/streaming.py
+
+hitList 响应的增量解析。论文/专利检索响应中 hitList 往往占据绝大部分字节（摘要、versions、urls、
+中英文专利摘要等），response.json() 会先把整个列表构建在内存中。本模块在下载响应体的同时逐条解析 hit，
+内存占用只与单条 hit 的大小有关，调用方（如入库流程）可以在下载完成之前开始处理。
+
+包含的对象及简要介绍：
+- HitListParser: 增量解析器，feed 字节块返回已完整的 hit，close 返回去掉 hit 的响应外层结构用于校验。
+- HitStream / AsyncHitStream: 包装流式响应的（异步）迭代器，逐条产出 hit，遍历结束后 hits_total 可用。
+
+注意事项：
+- 解析器只提取第一个 "hitList" 数组；外层结构（code、success、hitsTotal 等）在遍历结束时统一校验，
+  因此响应格式异常时可能已经产出部分 hit。
+"""
+
+import codecs
+import json
+import re
+
+_HIT_LIST = re.compile(r'"hitList"\s*:\s*\[')
+_WHITESPACE = " \t\n\r,"
+# 已解析部分超过该长度时压缩缓冲区
+_COMPACT_AT = 1 << 16
+
+
+class HitListParser:
+    """
+    hitList 增量解析器。
+    用法：
+        parser = HitListParser()
+        for chunk in chunks:
+            for hit in parser.feed(chunk):
+                ...
+        envelope = parser.close()  # 响应的外层结构，其中 hitList 为空列表
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "prefix"
+        self._prefix = ""
+        self.hits = 0
+
+    def feed(self, data: bytes) -> list:
+        """加入一个字节块，返回其中已完整解析出的 hit 列表。"""
+        self._buffer += self._decoder.decode(data)
+        if self._state == "prefix":
+            match = _HIT_LIST.search(self._buffer)
+            if match is None:
+                return []
+            self._prefix = self._buffer[:match.end()]
+            self._buffer = self._buffer[match.end():]
+            self._pos = 0
+            self._state = "items"
+        if self._state != "items":
+            return []
+        hits = []
+        buffer, pos = self._buffer, self._pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._state = "suffix"
+                break
+            try:
+                hit, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 当前 hit 尚未下载完整，等待更多数据
+                break
+            hits.append(hit)
+        self.hits += len(hits)
+        if pos > _COMPACT_AT or self._state == "suffix":
+            buffer, pos = buffer[pos:], 0
+        self._buffer, self._pos = buffer, pos
+        return hits
+
+    def close(self) -> dict:
+        """
+        输入结束时调用，返回去掉 hit 后的响应外层结构（hitList 为空列表），供调用方校验。
+        异常：
+            响应不是有效的JSON，或 hitList 未正常结束时抛出异常。
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        if self._state == "items":
+            raise Exception("响应内容不是有效的JSON格式: hitList 未正常结束")
+        text = self._buffer if self._state == "prefix" else self._prefix + self._buffer
+        try:
+            return json.loads(text)
+        except ValueError as e:
+            raise Exception(f"响应内容不是有效的JSON格式: {e}")
+
+
+class HitStream:
+    """
+    流式响应的 hit 迭代器，只能遍历一次。
+    参数：
+        response: 已收到响应头的 requests.Response。
+        chunks (Iterator[bytes]): 响应体字节块。
+        parse_response (callable): 非200响应时调用的完整解析函数（负责抛出带响应内容的异常）。
+        from_envelope (callable): 由外层结构得到 {"hitList": [], "hitsTotal": int}，格式异常时抛出异常。
+    属性：
+        hits_total (int): 遍历结束后为响应中的 hitsTotal，之前为None。
+    """
+
+    def __init__(self, response, chunks, parse_response, from_envelope):
+        self.response = response
+        self.chunks = chunks
+        self.parse_response = parse_response
+        self.from_envelope = from_envelope
+        self.hits_total = None
+
+    def __iter__(self):
+        if self.response.status_code != 200:
+            self.parse_response(self.response)
+        parser = HitListParser()
+        for chunk in self.chunks:
+            yield from parser.feed(chunk)
+        self.hits_total = self.from_envelope(parser.close())["hitsTotal"]
+
+    def close(self):
+        """提前结束时释放连接。"""
+        close = getattr(self.chunks, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncHitStream(HitStream):
+    """HitStream 的异步版本，response 为 httpx.Response，chunks 为异步字节块迭代器。"""
+
+    def __iter__(self):
+        raise TypeError("AsyncHitStream 请使用 async for 遍历")
+
+    async def __aiter__(self):
+        if self.response.status_code != 200:
+            await self.response.aread()
+            self.parse_response(self.response)
+        parser = HitListParser()
+        async for chunk in self.chunks:
+            for hit in parser.feed(chunk):
+                yield hit
+        self.hits_total = self.from_envelope(parser.close())["hitsTotal"]
+
+    async def aclose(self):
+        """提前结束时释放连接。"""
+        aclose = getattr(self.chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import pytest
+
+# aminer/tests/test_aminer_api.py 的录制文件，重新录制的命令见 README
+CASSETTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes", "test_aminer_api.ndjson.gz")
+
+
+@pytest.fixture(autouse=True)
+def reset_aminer_state():
+    """每个测试前清空AMiner响应缓存与熔断器状态，避免用例之间互相影响。"""
+    from aminer.cache import default_cache
+    from aminer.resilience import reset_breakers
+    default_cache.clear()
+    reset_breakers()
+
+
+@pytest.fixture
+def aminer_cassette():
+    """
+    录制文件存在且未设置 AMINER_CASSETTE_MODE 时，从录制文件回放AMiner请求，测试不访问网络；
+    设置了 AMINER_CASSETTE_MODE（如重新录制）时按环境变量处理。
+    """
+    from aminer import cassette
+    if os.getenv("AMINER_CASSETTE_MODE") or not os.path.exists(CASSETTE_PATH):
+        yield
+        return
+    previous = cassette.get_cassette()
+    cassette.use_cassette(cassette.Cassette(CASSETTE_PATH, "replay"))
+    try:
+        yield
+    finally:
+        cassette.use_cassette(previous)
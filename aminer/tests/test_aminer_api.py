@@ -1,7 +1,11 @@
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import pytest
 from aminer import api
 
+# 录制文件存在时回放（见 conftest.py），否则访问AMiner
+pytestmark = pytest.mark.usefixtures("aminer_cassette")
+
 
 def test_get_token():
     """
@@ -0,0 +1,107 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aminer import async_api
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """本地桩服务：每个请求耗时50ms，记录同时处理的最大请求数。"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    handler = type("Handler", (SlowHandler,), {"active": 0, "peak": 0, "lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield handler, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_per_host_concurrency_is_bounded(slow_server):
+    """
+    测试 AsyncAMinerClient 对同一主机的并发请求数不超过 per_host。
+    """
+    handler, base_url = slow_server
+
+    async def main():
+        client = async_api.AsyncAMinerClient(per_host=3)
+        try:
+            responses = await asyncio.gather(*[client.request("POST", f"{base_url}/n", json=[]) for _ in range(12)])
+        finally:
+            await client.aclose()
+        return responses
+
+    responses = asyncio.run(main())
+    assert all(r.status_code == 200 for r in responses)
+    assert handler.peak == 3
+
+
+def test_shared_client_per_event_loop():
+    """
+    测试 get_async_client 在同一事件循环内返回同一实例。
+    """
+    async def main():
+        return async_api.get_async_client(), async_api.get_async_client()
+
+    a, b = asyncio.run(main())
+    assert a is b
+
+
+def test_async_functions_share_parsers_with_sync(monkeypatch):
+    """
+    测试异步函数与同步函数返回结构一致（复用 aminer.api 的响应解析）。
+    """
+    with open(os.path.join(os.path.dirname(__file__), '../demo/patents.json'), encoding='utf-8') as f:
+        patents = json.load(f)
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            return patents
+
+    class FakeClient:
+        async def request(self, method, url, **kwargs):
+            calls.append((method, url, kwargs["json"]["page"]))
+            return FakeResponse()
+
+    monkeypatch.setattr(async_api, "get_async_client", lambda: FakeClient())
+    result = asyncio.run(async_api.search_patents_by_scholar_free("56066a5245cedb339687488b", size=5, page=2))
+    assert result["hitsTotal"] == patents["data"]["hitsTotal"]
+    assert result["hitList"] == patents["data"]["hitList"]
+    assert calls == [("POST", "https://searchtest.aminer.cn/aminer-search/search/patentV2", 2)]
@@ -0,0 +1,87 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+
+import pytest
+
+from aminer import async_api, batching
+
+
+class FakeResponse:
+    text = ""
+
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return {"data": self.data}
+
+
+class FakeGateway:
+    """模拟 apiv2 网关：每个 action 返回以 person_id 标识的结果，记录每次请求的 action 数。"""
+
+    def __init__(self, status_code=200):
+        self.batches = []
+        self.status_code = status_code
+
+    async def request(self, method, url, **kwargs):
+        actions = kwargs["json"]
+        self.batches.append(len(actions))
+        await asyncio.sleep(0)
+        data = [{"data": {"hitList": [{"id": a["parameters"]["person_id"]}], "hitsTotal": 1}} for a in actions]
+        return FakeResponse(data, self.status_code)
+
+
+def test_concurrent_searches_are_merged(monkeypatch):
+    """
+    测试并发的论文检索被合并为少量POST，且每个调用方收到自己的结果。
+    """
+    gateway = FakeGateway()
+    monkeypatch.setattr(async_api, "get_async_client", lambda: gateway)
+
+    async def main():
+        batcher = batching.GatewayBatcher(max_batch=10, max_wait=0.01)
+        results = await asyncio.gather(*[
+            async_api.search_papers_by_scholar_free(f"S{i}", size=5, batcher=batcher) for i in range(25)
+        ])
+        return batcher, results
+
+    batcher, results = asyncio.run(main())
+    assert [r["hitList"][0]["id"] for r in results] == [f"S{i}" for i in range(25)]
+    assert gateway.batches == [10, 10, 5]
+    assert batcher.requests_sent == 3
+    assert batcher.actions_sent == 25
+
+
+def test_partial_batch_flushed_after_max_wait(monkeypatch):
+    """
+    测试不足 max_batch 的 action 在等待 max_wait 后发送。
+    """
+    gateway = FakeGateway()
+    monkeypatch.setattr(async_api, "get_async_client", lambda: gateway)
+
+    async def main():
+        batcher = batching.GatewayBatcher(max_batch=100, max_wait=0.02)
+        return await asyncio.gather(*[async_api.search_papers_by_scholar_free(f"S{i}", batcher=batcher) for i in range(3)])
+
+    results = asyncio.run(main())
+    assert len(results) == 3
+    assert gateway.batches == [3]
+
+
+def test_batch_failure_propagates_to_all_callers(monkeypatch):
+    """
+    测试整批请求失败时，批内每个调用方都收到异常。
+    """
+    gateway = FakeGateway(status_code=502)
+    monkeypatch.setattr(async_api, "get_async_client", lambda: gateway)
+
+    async def main():
+        batcher = batching.GatewayBatcher(max_batch=4, max_wait=0.01)
+        return await asyncio.gather(*[async_api.search_papers_by_scholar_free(f"S{i}", batcher=batcher) for i in range(4)],
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(results) == 4
+    assert all(isinstance(r, Exception) and "502" in str(r) for r in results)
@@ -0,0 +1,181 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import time
+
+from aminer.cache import ResponseCache, MemoryLRU, cached, cached_call, make_key
+
+
+def test_lru_eviction():
+    """
+    测试内存 LRU 超出容量时淘汰最久未使用的条目并计数。
+    """
+    lru = MemoryLRU(max_entries=2)
+    expires = time.time() + 60
+    lru.set("a", 1, expires)
+    lru.set("b", 2, expires)
+    assert lru.get("a") == (True, 1)
+    lru.set("c", 3, expires)
+    assert lru.get("b") == (False, None)
+    assert lru.get("a") == (True, 1)
+    assert lru.evictions == 1
+
+
+def test_ttl_expiry():
+    """
+    测试条目过期后视为未命中，重新调用被缓存函数。
+    """
+    cache = ResponseCache(ttls={"person_detail": 0})
+    calls = []
+
+    def fetch(person_id):
+        calls.append(person_id)
+        return {"id": person_id}
+
+    cached_call("person_detail", fetch, "p1", cache=cache)
+    cached_call("person_detail", fetch, "p1", cache=cache)
+    assert calls == ["p1", "p1"]
+
+
+def test_hits_misses_and_key_normalization():
+    """
+    测试按规范化参数命中缓存（关键字/位置参数、首尾空白等价），并统计命中与未命中。
+    """
+    cache = ResponseCache()
+    calls = []
+
+    def search(name="", offset=0, org="", size=1):
+        calls.append(name)
+        return [name]
+
+    assert cached_call("person_search", search, "Andrew Ng", cache=cache) == ["Andrew Ng"]
+    assert cached_call("person_search", search, name=" Andrew Ng ", size=1, cache=cache) == ["Andrew Ng"]
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["endpoints"]["person_search"] == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+    assert stats["memory_entries"] == 1
+
+
+def test_none_not_cached():
+    """
+    测试返回 None 的结果不被缓存。
+    """
+    cache = ResponseCache()
+    calls = []
+
+    def fetch(person_id):
+        calls.append(person_id)
+        return None
+
+    cached_call("person_detail", fetch, "p1", cache=cache)
+    cached_call("person_detail", fetch, "p1", cache=cache)
+    assert len(calls) == 2
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    """
+    测试磁盘缓存在新的缓存实例（模拟进程重启）中仍可命中，并回填内存。
+    """
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+
+    def fetch(person_id):
+        calls.append(person_id)
+        return {"id": person_id, "name": "张三"}
+
+    first = ResponseCache(disk_path=path)
+    cached_call("person_detail", fetch, "p1", cache=first)
+    first.disk.close()
+
+    second = ResponseCache(disk_path=path)
+    assert cached_call("person_detail", fetch, "p1", cache=second) == {"id": "p1", "name": "张三"}
+    assert cached_call("person_detail", fetch, "p1", cache=second) == {"id": "p1", "name": "张三"}
+    assert calls == ["p1"]
+    assert second.stats()["endpoints"]["person_detail"] == {"memory_hits": 1, "disk_hits": 1, "misses": 0}
+
+
+def test_disk_hit_keeps_original_expiry(tmp_path):
+    """
+    测试磁盘命中回填内存时沿用磁盘条目的过期时间，不重新计满TTL。
+    """
+    path = str(tmp_path / "cache.sqlite")
+    first = ResponseCache(disk_path=path)
+    first.disk.set("k", {"id": "p1"}, time.time() + 0.2)
+    first.disk.close()
+
+    second = ResponseCache(disk_path=path, ttls={"person_detail": 3600})
+    assert second.get("person_detail", "k") == (True, {"id": "p1"})
+    time.sleep(0.3)
+    assert second.get("person_detail", "k") == (False, None)
+    assert second.stats()["endpoints"]["person_detail"] == {"memory_hits": 0, "disk_hits": 1, "misses": 1}
+
+
+def test_async_decorator_and_ignore():
+    """
+    测试装饰器包装协程函数，ignore 中的参数不参与缓存键。
+    """
+    cache = ResponseCache()
+    calls = []
+
+    @cached("papers", cache=cache, ignore=("batcher",))
+    async def search(scholar_id, size=10, page=0, batcher=None):
+        calls.append((scholar_id, page))
+        return {"hitList": [], "hitsTotal": 0}
+
+    async def run():
+        await search("s1", page=0, batcher=object())
+        await search("s1", page=0, batcher=object())
+        await search("s1", page=1)
+
+    asyncio.run(run())
+    assert calls == [("s1", 0), ("s1", 1)]
+
+
+def test_disabled_cache_passes_through():
+    """
+    测试关闭缓存后每次都调用原函数。
+    """
+    cache = ResponseCache(enabled=False)
+    calls = []
+    for _ in range(2):
+        cached_call("person_detail", lambda pid: calls.append(pid) or {"id": pid}, "p1", cache=cache)
+    assert len(calls) == 2
+
+
+def test_make_key_applies_defaults():
+    """
+    测试缓存键补全默认参数，省略默认值与显式传入默认值得到同一个键。
+    """
+    def fn(scholar_id, size=10, needDetails=True):
+        pass
+
+    assert make_key("papers", fn, ("s1",), {}) == make_key("papers", fn, ("s1", 10), {"needDetails": True})
+
+
+def test_sync_api_functions_cached(monkeypatch):
+    """
+    测试 aminer.api 的论文检索经共享缓存调用：相同参数只请求一次，as_records 不影响缓存项，参数不同时重新请求。
+    """
+    from aminer import api, cache as cache_module
+    monkeypatch.setattr(cache_module, "default_cache", ResponseCache())
+    requests_sent = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def json(self):
+            return {"data": [{"data": {"hitList": [{"id": "p1", "title": "t"}], "hitsTotal": 1}}]}
+
+    class FakeClient:
+        def request(self, method, url, **kwargs):
+            requests_sent.append(kwargs["json"])
+            return FakeResponse()
+
+    monkeypatch.setattr(api, "get_client", lambda: FakeClient())
+    first = api.search_papers_by_scholar_free("s1", size=5)
+    assert api.search_papers_by_scholar_free("s1", size=5) == first
+    assert api.search_papers_by_scholar_free("s1", size=5, as_records=True)["hitList"][0].id == "p1"
+    assert len(requests_sent) == 1
+    api.search_papers_by_scholar_free("s1", size=5, page=1)
+    assert len(requests_sent) == 2
+    assert cache_module.default_cache.stats()["endpoints"]["papers"] == {"memory_hits": 2, "disk_hits": 0, "misses": 2}
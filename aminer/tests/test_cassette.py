@@ -0,0 +1,90 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import gzip
+
+import pytest
+
+from aminer import api, async_api
+from aminer.cassette import Cassette, CassetteMissError, use_cassette
+from aminer.fake_server import serve_in_thread
+from aminer.resilience import reset_breakers
+
+PERSON_ID = "56066a5245cedb339687488b"
+
+
+@pytest.fixture
+def cassette_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("AMINER_TOKEN", "secret-token")
+    reset_breakers()
+    yield str(tmp_path / "aminer.ndjson.gz")
+    use_cassette(None)
+    reset_breakers()
+
+
+def run_calls():
+    return {
+        "search": api.search_person_by_name(name="喻纯", size=1).json(),
+        "papers": api.search_papers_by_scholar_free(PERSON_ID, size=3),
+        "patents": api.search_patents_by_scholar_free(PERSON_ID, size=3),
+        "detail": api.get_person_detail_by_id(PERSON_ID),
+    }
+
+
+def test_record_then_replay_without_network(cassette_path, monkeypatch):
+    """
+    测试录制的请求在服务关闭、Token 缺失的情况下可以确定地回放，且 Token 不写入文件。
+    """
+    server, base_url = serve_in_thread()
+    for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+        monkeypatch.setattr(api, name, base_url)
+    use_cassette(Cassette(cassette_path, "record"))
+    recorded = run_calls()
+    use_cassette(None)
+    server.shutdown()
+    server.server_close()
+    with gzip.open(cassette_path, "rt", encoding="utf-8") as f:
+        text = f.read()
+    assert len(text.splitlines()) == 4
+    assert "secret-token" not in text
+
+    # 回放时使用线上地址且无 Token，仍然匹配录制的请求
+    for name, default in (("DATACENTER_URL", "https://datacenter.aminer.cn"), ("APIV2_URL", "https://apiv2.aminer.cn"),
+                          ("SEARCH_URL", "https://searchtest.aminer.cn")):
+        monkeypatch.setattr(api, name, default)
+    monkeypatch.delenv("AMINER_TOKEN")
+    monkeypatch.setenv("AMINER_TOKEN_FILE", cassette_path + ".missing")
+    monkeypatch.setattr(api.token_provider, "default_provider", api.token_provider.TokenProvider())
+    use_cassette(Cassette(cassette_path, "replay"))
+    assert run_calls() == recorded
+
+    async def run_async():
+        return await async_api.get_person_detail_by_id(PERSON_ID)
+
+    assert asyncio.run(run_async()) == recorded["detail"]
+    with pytest.raises(CassetteMissError):
+        api.get_person_detail_by_id("0123456789abcdef01234567")
+
+
+def test_repeated_requests_replay_in_order(cassette_path):
+    """
+    测试同一请求录制多次时按顺序回放，用完后重复最后一次的响应。
+    """
+    cassette = Cassette(cassette_path, "record")
+    for status in (503, 200):
+        cassette.record("POST", "https://apiv2.aminer.cn/n", {"json": [1]}, status, {}, b"{}")
+    cassette.close()
+    replay = Cassette(cassette_path, "replay")
+    statuses = [replay.replay("POST", "http://127.0.0.1:1/n", {"json": [1]})["status"] for _ in range(3)]
+    assert statuses == [503, 200, 200]
+
+
+def test_unclosed_recording_is_readable(cassette_path):
+    """
+    测试录制进程未关闭文件时，已刷新的记录仍可回放。
+    """
+    cassette = Cassette(cassette_path, "record")
+    cassette.record("GET", "https://datacenter.aminer.cn/x?a=1", {}, 200, {}, b"{\"ok\": true}")
+    replay = Cassette(cassette_path, "replay")
+    assert replay.replay("GET", "https://datacenter.aminer.cn/x?a=1", {})["body"] == "{\"ok\": true}"
+    cassette.close()
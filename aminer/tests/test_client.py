@@ -0,0 +1,95 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aminer import api, client as aminer_client
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """本地桩服务：统计建立的TCP连接数，返回固定的论文检索结构。"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"data": [{"data": {"hitList": [], "hitsTotal": 0}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    handler = type("Handler", (CountingHandler,), {"connections": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield handler, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_connections(stub_server):
+    """
+    测试 AMinerClient 顺序发送多次请求时复用同一条keep-alive连接。
+    """
+    handler, base_url = stub_server
+    c = aminer_client.AMinerClient(pool_size=2)
+    for _ in range(10):
+        resp = c.post(f"{base_url}/n", json=[])
+        assert resp.status_code == 200
+    c.close()
+    assert handler.connections == 1
+
+
+def test_configure_client_replaces_shared_client():
+    """
+    测试 configure_client 按新参数重建共享客户端。
+    """
+    old = aminer_client.get_client()
+    new = aminer_client.configure_client(pool_size=4)
+    try:
+        assert new is not old
+        assert aminer_client.get_client() is new
+        assert new.pool_size == 4
+    finally:
+        aminer_client.configure_client()
+
+
+def test_api_routes_through_shared_client(monkeypatch):
+    """
+    测试 aminer.api 的函数经由共享客户端发出请求。
+    """
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            return {"data": [{"data": {"hitList": [], "hitsTotal": 0}}]}
+
+    class FakeClient:
+        def request(self, method, url, **kwargs):
+            calls.append(url)
+            return FakeResponse()
+
+    monkeypatch.setattr(api, "get_client", lambda: FakeClient())
+    result = api.search_papers_by_scholar_free("56066a5245cedb339687488b", size=1)
+    assert result == {"hitList": [], "hitsTotal": 0}
+    assert calls == ["https://apiv2.aminer.cn/n"]
+
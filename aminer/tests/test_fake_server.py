@@ -0,0 +1,94 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+
+import pytest
+
+from aminer import api, async_api
+from aminer.client import AMinerClient
+from aminer.fake_server import FakeAMinerData, serve_in_thread
+from aminer.resilience import RetryPolicy, reset_breakers
+
+DEMO_PERSON_ID = "56066a5245cedb339687488b"
+
+
+@pytest.fixture
+def fake_aminer(monkeypatch):
+    """启动替身服务，并把 aminer.api 的各服务根地址指向它。"""
+    servers = []
+
+    def start(**kwargs):
+        kwargs.setdefault("data", FakeAMinerData(seed=1, scholars=20, papers_per_scholar=40, patents_per_scholar=10))
+        server, base_url = serve_in_thread(**kwargs)
+        servers.append(server)
+        for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+            monkeypatch.setattr(api, name, base_url)
+        return server
+
+    monkeypatch.setenv("AMINER_TOKEN", "fake-token")
+    reset_breakers()
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    reset_breakers()
+
+
+def test_person_search_and_detail(fake_aminer):
+    """
+    测试学者检索与详情接口：demo 学者可检索到，未知ID报告缺失，24位十六进制ID被合成。
+    """
+    fake_aminer()
+    resp = api.search_person_by_name(name="Chun Yu", size=5)
+    assert resp.status_code == 200
+    assert DEMO_PERSON_ID in [p["id"] for p in resp.json()["data"]]
+    assert api.get_person_detail_by_id(DEMO_PERSON_ID)["name_zh"] == "喻纯"
+    synthetic = "0123456789abcdef01234567"
+    result = api.get_person_details_by_ids([DEMO_PERSON_ID, synthetic, "invalid_id"])
+    assert set(result["data"]) == {DEMO_PERSON_ID, synthetic}
+    assert result["missing"] == ["invalid_id"]
+
+
+def test_pages_are_capped_and_complete(fake_aminer):
+    """
+    测试单页条数受 max_page_size 限制，按页遍历能完整取回 hitsTotal 条且数据确定。
+    """
+    server = fake_aminer(max_page_size=7)
+    first = api.search_papers_by_scholar_free(DEMO_PERSON_ID, size=100)
+    assert len(first["hitList"]) == 7
+    papers = list(api.iter_papers_by_scholar(DEMO_PERSON_ID, page_size=7))
+    assert len(papers) == first["hitsTotal"]
+    assert len({p["id"] for p in papers}) == len(papers)
+    assert [p["year"] for p in papers] == sorted((p["year"] for p in papers), reverse=True)
+    patents = list(api.iter_patents_by_scholar(DEMO_PERSON_ID, page_size=7))
+    assert len(patents) == api.search_patents_by_scholar_free(DEMO_PERSON_ID)["hitsTotal"]
+    assert server.requests["/aminer-search/search/patentV2"] >= 2
+    listing = api.search_papers_by_scholar_free(DEMO_PERSON_ID, size=3, needDetails=False)
+    assert set(listing["hitList"][0]) <= {"id", "title", "year", "num_citation"}
+    assert listing["hitList"][0]["id"] == papers[0]["id"]
+
+
+def test_async_client_against_fake(fake_aminer):
+    """
+    测试异步接口同样可以指向替身服务。
+    """
+    fake_aminer(latency_ms=5)
+
+    async def run():
+        pages = [page async for page in async_api.iter_patent_pages(DEMO_PERSON_ID, page_size=3)]
+        await async_api.get_async_client().aclose()
+        return pages
+
+    pages = asyncio.run(run())
+    assert sum(len(p["hitList"]) for p in pages) == pages[0]["hitsTotal"]
+
+
+def test_error_rate(fake_aminer, monkeypatch):
+    """
+    测试错误率为1时接口返回503，调用方得到异常。
+    """
+    fake_aminer(error_rate=1.0)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1))
+    monkeypatch.setattr(api, "get_client", lambda: client)
+    with pytest.raises(Exception, match="503"):
+        api.search_papers_by_scholar_free(DEMO_PERSON_ID)
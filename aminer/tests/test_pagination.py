@@ -0,0 +1,157 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import time
+
+from aminer import api, async_api
+
+
+def fake_paper_pages(total, calls):
+    """构造按页返回的假论文检索函数，论文id为序号。"""
+    def search(scholar_id, size=10, needDetails=True, page=0):
+        calls.append(page)
+        start = page * size
+        hits = [{"id": str(i)} for i in range(start, min(start + size, total))]
+        return {"hitList": hits, "hitsTotal": total}
+    return search
+
+
+def test_iter_papers_walks_pages_until_hits_total(monkeypatch):
+    """
+    测试 iter_papers_by_scholar 逐页拉取，取满 hitsTotal 后停止。
+    """
+    calls = []
+    monkeypatch.setattr(api, "search_papers_by_scholar_free", fake_paper_pages(25, calls))
+    ids = [hit["id"] for hit in api.iter_papers_by_scholar("S1", page_size=10)]
+    assert ids == [str(i) for i in range(25)]
+    assert calls == [0, 1, 2]
+
+
+def test_iter_papers_respects_limit(monkeypatch):
+    """
+    测试 limit 截断结果，且不会请求多余的页。
+    """
+    calls = []
+    monkeypatch.setattr(api, "search_papers_by_scholar_free", fake_paper_pages(100, calls))
+    ids = [hit["id"] for hit in api.iter_papers_by_scholar("S1", page_size=10, limit=15, prefetch=False)]
+    assert ids == [str(i) for i in range(15)]
+    assert calls == [0, 1]
+
+
+def test_iter_paper_pages_prefetches_next_page(monkeypatch):
+    """
+    测试 prefetch 时，产出当前页之前已开始请求下一页。
+    """
+    calls = []
+    monkeypatch.setattr(api, "search_papers_by_scholar_free", fake_paper_pages(30, calls))
+    pages = api.iter_paper_pages("S1", page_size=10)
+    first = next(pages)
+    assert len(first["hitList"]) == 10
+    for _ in range(100):
+        if 1 in calls:
+            break
+        time.sleep(0.01)
+    assert calls == [0, 1]
+    pages.close()
+
+
+def test_async_iter_papers_matches_sync(monkeypatch):
+    """
+    测试异步版 iter_papers_by_scholar 与同步版产出相同结果。
+    """
+    calls = []
+    search = fake_paper_pages(23, calls)
+
+    async def async_search(scholar_id, size=10, needDetails=True, page=0, batcher=None):
+        return search(scholar_id, size, needDetails, page)
+
+    monkeypatch.setattr(async_api, "search_papers_by_scholar_free", async_search)
+
+    async def collect():
+        return [hit["id"] async for hit in async_api.iter_papers_by_scholar("S1", page_size=10)]
+
+    assert asyncio.run(collect()) == [str(i) for i in range(23)]
+    assert calls == [0, 1, 2]
+
+
+def fake_patent_pages(total, calls, delays=None):
+    """构造按页返回的假专利检索函数；delays 指定各页的响应延迟，用于模拟乱序到达。"""
+    def search(scholar_id, size=10, needDetails=True, page=0, query=""):
+        calls.append(page)
+        time.sleep((delays or {}).get(page, 0))
+        start = page * size
+        return {"hitList": [{"id": str(i)} for i in range(start, min(start + size, total))], "hitsTotal": total}
+    return search
+
+
+def test_iter_patents_yields_in_page_order(monkeypatch):
+    """
+    测试并发拉取的专利页即使乱序到达，也按页码（pub_date）顺序产出。
+    """
+    calls = []
+    monkeypatch.setattr(api, "search_patents_by_scholar_free", fake_patent_pages(45, calls, {1: 0.1, 2: 0.05}))
+    ids = [hit["id"] for hit in api.iter_patents_by_scholar("S1", page_size=10, max_workers=4)]
+    assert ids == [str(i) for i in range(45)]
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+
+
+def test_iter_patents_fetches_pages_concurrently(monkeypatch):
+    """
+    测试剩余页并发请求：5页各耗时0.1秒，总耗时明显少于串行。
+    """
+    calls = []
+    monkeypatch.setattr(api, "search_patents_by_scholar_free",
+                        fake_patent_pages(50, calls, {p: 0.1 for p in range(1, 5)}))
+    start = time.perf_counter()
+    assert len(list(api.iter_patents_by_scholar("S1", page_size=10, max_workers=4))) == 50
+    assert time.perf_counter() - start < 0.3
+
+
+def test_iter_patents_respects_limit_and_parallelism(monkeypatch):
+    """
+    测试 limit 决定请求的页数，且同时进行的页请求不超过 max_workers。
+    """
+    import threading
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    calls = []
+    inner = fake_patent_pages(1000, calls)
+
+    def search(scholar_id, size=10, needDetails=True, page=0, query=""):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        try:
+            return inner(scholar_id, size, needDetails, page, query)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    monkeypatch.setattr(api, "search_patents_by_scholar_free", search)
+    ids = [hit["id"] for hit in api.iter_patents_by_scholar("S1", page_size=10, limit=75, max_workers=2)]
+    assert ids == [str(i) for i in range(75)]
+    assert sorted(calls) == list(range(8))
+    assert state["peak"] <= 2
+
+
+def test_async_iter_patents_in_order(monkeypatch):
+    """
+    测试异步版 iter_patents_by_scholar 并发拉取并按页码顺序产出。
+    """
+    calls = []
+    delays = {1: 0.05, 2: 0.02}
+
+    async def search(scholar_id, size=10, needDetails=True, page=0, query=""):
+        calls.append(page)
+        await asyncio.sleep(delays.get(page, 0))
+        start = page * size
+        return {"hitList": [{"id": str(i)} for i in range(start, min(start + size, 35))], "hitsTotal": 35}
+
+    monkeypatch.setattr(async_api, "search_patents_by_scholar_free", search)
+
+    async def collect():
+        return [hit["id"] async for hit in async_api.iter_patents_by_scholar("S1", page_size=10, max_workers=3)]
+
+    assert asyncio.run(collect()) == [str(i) for i in range(35)]
+    assert sorted(calls) == [0, 1, 2, 3]
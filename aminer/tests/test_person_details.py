@@ -0,0 +1,83 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+
+from aminer import api, async_api
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, persons):
+        self.persons = persons
+
+    def json(self):
+        return {"data": [{"data": self.persons}]}
+
+
+def fake_personapi(known, batches):
+    """按请求中的ids返回已知学者（顺序打乱），记录每批请求的ID。"""
+    def respond(kwargs):
+        ids = kwargs["json"][0]["parameters"]["ids"]
+        batches.append(ids)
+        return FakeResponse([{"id": pid, "name": f"N{pid}"} for pid in reversed(ids) if pid in known])
+    return respond
+
+
+def test_details_chunked_and_mapped_by_id(monkeypatch):
+    """
+    测试批量详情按 chunk_size 分批请求，结果按ID映射并报告缺失ID。
+    """
+    batches = []
+    respond = fake_personapi({"a", "b", "d", "e", "f"}, batches)
+
+    class FakeClient:
+        def request(self, method, url, **kwargs):
+            return respond(kwargs)
+
+    monkeypatch.setattr(api, "get_client", lambda: FakeClient())
+    result = api.get_person_details_by_ids(["a", "b", "c", "a", "d", "e", "f"], chunk_size=2)
+    assert batches == [["a", "b"], ["c", "d"], ["e", "f"]]
+    assert list(result["data"]) == ["a", "b", "d", "e", "f"]
+    assert result["data"]["d"]["name"] == "Nd"
+    assert result["missing"] == ["c"]
+
+
+def test_async_details_matches_sync(monkeypatch):
+    """
+    测试异步版批量详情与同步版返回结构一致。
+    """
+    batches = []
+    respond = fake_personapi({"x", "z"}, batches)
+
+    class FakeClient:
+        async def request(self, method, url, **kwargs):
+            return respond(kwargs)
+
+    monkeypatch.setattr(async_api, "get_async_client", lambda: FakeClient())
+    result = asyncio.run(async_api.get_person_details_by_ids(["x", "y", "z"], chunk_size=2))
+    assert sorted(batches) == [["x", "y"], ["z"]]
+    assert list(result["data"]) == ["x", "z"]
+    assert result["missing"] == ["y"]
+
+
+def test_details_cached_per_id(monkeypatch):
+    """
+    测试批量详情逐个ID使用缓存：与单个详情共用缓存项，再次批量查询只请求未命中的ID，缺失的ID不缓存。
+    """
+    batches = []
+    respond = fake_personapi({"a", "b", "d"}, batches)
+
+    class FakeClient:
+        def request(self, method, url, **kwargs):
+            return respond(kwargs)
+
+    monkeypatch.setattr(api, "get_client", lambda: FakeClient())
+    api.get_person_details_by_ids(["a", "b", "c"])
+    assert api.get_person_detail_by_id("a")["name"] == "Na"
+    result = api.get_person_details_by_ids(["a", "c", "d"])
+    assert batches == [["a", "b", "c"], ["c", "d"]]
+    assert list(result["data"]) == ["a", "d"] and result["missing"] == ["c"]
+    assert api.get_person_detail_by_id("d", as_records=True).name == "Nd"
+    assert len(batches) == 2
@@ -0,0 +1,82 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import time
+
+from aminer.ratelimit import TokenBucket, FileTokenBucket, HostRateLimiter, parse_rate_limits
+
+
+def test_bucket_allows_burst_then_paces():
+    """
+    测试令牌桶先放行 capacity 个请求，之后按 rate 均匀排队。
+    """
+    bucket = TokenBucket(rate=100, capacity=5)
+    waits = [bucket.reserve() for _ in range(10)]
+    assert waits[:5] == [0.0] * 5
+    assert waits[5:] == sorted(waits[5:])
+    assert 0.04 <= waits[-1] <= 0.06
+
+
+def test_acquire_blocks_to_rate():
+    """
+    测试同步 acquire 会阻塞到满足速率限制。
+    """
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_acquire_async_paces_concurrent_callers():
+    """
+    测试并发协程共享同一令牌桶时总体速率受限。
+    """
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*[bucket.acquire_async() for _ in range(6)])
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_file_bucket_shared_between_instances(tmp_path):
+    """
+    测试多个 FileTokenBucket 实例（模拟多个进程）通过同一文件共享配额。
+    """
+    path = str(tmp_path / "apiv2.aminer.cn.bucket")
+    first = FileTokenBucket(path, rate=10, capacity=2)
+    second = FileTokenBucket(path, rate=10, capacity=2)
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert second.reserve() > 0.05
+    assert first.reserve() > 0.15
+
+
+def test_host_limiter_only_limits_configured_hosts():
+    """
+    测试只对配置了速率的主机限速，速率为0或未配置的主机直接放行。
+    """
+    limiter = HostRateLimiter(parse_rate_limits("127.0.0.1=5:1,searchtest.aminer.cn=0"))
+    assert limiter.bucket("http://127.0.0.1:8000/n") is limiter.bucket("http://127.0.0.1:9000/x")
+    assert limiter.bucket("https://searchtest.aminer.cn/x") is None
+    assert limiter.bucket("http://localhost/x") is None
+    assert limiter.bucket("https://apiv2.aminer.cn/n").rate == 10.0
+
+
+def test_refund_returns_token_up_to_capacity(tmp_path):
+    """
+    测试归还的令牌可再次使用，且桶中令牌数不超过容量；跨进程令牌桶同样支持归还。
+    """
+    for bucket in (TokenBucket(rate=1, capacity=2), FileTokenBucket(str(tmp_path / "h.bucket"), rate=1, capacity=2)):
+        assert bucket.reserve() == 0 and bucket.reserve() == 0
+        bucket.refund()
+        assert bucket.reserve() == 0
+        assert bucket.reserve() > 0.5
+        bucket.refund()
+        bucket.refund()
+        bucket.refund()
+        assert [bucket.reserve() for _ in range(2)] == [0, 0]
+        assert bucket.reserve() > 0.5
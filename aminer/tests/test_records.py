@@ -0,0 +1,100 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import dataclasses
+import json
+
+import pytest
+
+from aminer import api, async_api
+from aminer.fake_server import FakeAMinerData, serve_in_thread
+from aminer.records import PaperHit, PatentHit, PersonDetail, PersonHit, decode_hits, localized_text
+from aminer.resilience import reset_breakers
+
+PERSON_ID = "56066a5245cedb339687488b"
+DEMO_DIR = os.path.join(os.path.dirname(__file__), "../demo")
+
+
+def load_demo(name):
+    with open(os.path.join(DEMO_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_paper_record_to_orm_kwargs():
+    """
+    测试论文记录的解码与转换：列值与 PaperIn 一致，JSON字段为字符串。
+    """
+    hit = load_demo("paper.json")["data"][0]["data"]["hitList"][0]
+    paper = PaperHit.from_json(hit)
+    assert paper.id == hit["id"] and paper.num_citation == hit["num_citation"]
+    row = paper.to_orm_kwargs(7)
+    assert row["scholar_id"] == 7 and row["aminer_id"] == hit["id"]
+    assert json.loads(row["authors"]) == hit["authors"]
+    assert json.loads(row["update_times"]) == hit["update_times"]
+    # 记录不可修改，且没有实例 __dict__
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        paper.title = "x"
+    assert not hasattr(paper, "__dict__")
+
+
+def test_patent_record_maps_camel_case_fields():
+    """
+    测试专利记录将 appDate/pubNum 等字段映射到 Patent 列名，标题优先取中文。
+    """
+    hit = load_demo("patents.json")["data"]["hitList"][0]
+    patent = PatentHit.from_json(hit)
+    row = patent.to_orm_kwargs(3)
+    assert row["app_date"] == hit["appDate"] and row["pub_num"] == hit["pubNum"]
+    assert row["pub_search_id"] == hit["pubSearchId"]
+    assert json.loads(row["title"]) == hit["title"]
+    assert patent.display_title == localized_text(hit["title"])
+    assert localized_text({"zh": [], "en": ["Title"]}) == "Title"
+    assert localized_text({"zh": "标题"}) == "标题"
+    assert localized_text("plain") == "plain"
+
+
+def test_person_records():
+    """
+    测试学者详情与检索结果的解码，缺失字段取空值。
+    """
+    person = load_demo("person_detail.json")["data"][0]["data"][0]
+    detail = PersonDetail.from_json(person)
+    row = detail.to_orm_kwargs()
+    assert row["aminer_id"] == person["id"]
+    assert row["position"] == (person.get("profile") or {}).get("position", "")
+    hit = PersonHit.from_json({"id": "x", "name": "A", "org": None})
+    assert hit.org == "" and hit.interests == [] and hit.n_citation == 0
+
+
+def test_api_as_records(monkeypatch):
+    """
+    测试 aminer_api 与异步版本的 as_records 参数返回记录，内容与dict结果一致。
+    """
+    monkeypatch.setenv("AMINER_TOKEN", "fake-token")
+    reset_breakers()
+    server, base_url = serve_in_thread(data=FakeAMinerData(seed=4, scholars=0, papers_per_scholar=10, patents_per_scholar=6))
+    for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+        monkeypatch.setattr(api, name, base_url)
+    try:
+        papers = api.search_papers_by_scholar_free(PERSON_ID, size=5)
+        records = api.search_papers_by_scholar_free(PERSON_ID, size=5, as_records=True)
+        assert records == decode_hits(papers, PaperHit)
+        assert all(isinstance(hit, PaperHit) for hit in records["hitList"])
+        patents = api.search_patents_by_scholar_free(PERSON_ID, size=5, as_records=True)
+        assert all(isinstance(hit, PatentHit) for hit in patents["hitList"])
+        assert isinstance(api.get_person_detail_by_id(PERSON_ID, as_records=True), PersonDetail)
+        details = api.get_person_details_by_ids([PERSON_ID, "nope"], as_records=True)
+        assert isinstance(details["data"][PERSON_ID], PersonDetail) and details["missing"] == ["nope"]
+
+        async def run():
+            result = await async_api.search_patents_by_scholar_free(PERSON_ID, size=5, as_records=True)
+            detail = await async_api.get_person_detail_by_id(PERSON_ID, as_records=True)
+            await async_api.get_async_client().aclose()
+            return result, detail
+
+        result, detail = asyncio.run(run())
+        assert result == patents and isinstance(detail, PersonDetail)
+    finally:
+        server.shutdown()
+        server.server_close()
+        reset_breakers()
@@ -0,0 +1,255 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from aminer.async_api import AsyncAMinerClient
+from aminer.client import AMinerClient
+from aminer.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, get_breaker, reset_breakers
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """本地桩服务：前 failures 次请求返回503，之后返回200；delay 秒模拟慢响应。"""
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    delay = 0
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).calls += 1
+        time.sleep(self.delay)
+        status = 503 if type(self).calls <= self.failures else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    reset_breakers()
+    servers = []
+
+    def start(failures=0, delay=0):
+        handler = type("Handler", (FlakyHandler,), {"failures": failures, "delay": delay, "calls": 0})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/n", handler
+
+    yield start
+    for server in servers:
+        server.shutdown()
+    reset_breakers()
+
+
+def test_retry_delay_is_jittered_and_bounded():
+    """
+    测试退避时间在指数上限内随机分布，并优先使用 Retry-After。
+    """
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    delays = [policy.delay(3) for _ in range(200)]
+    assert all(0 <= d <= 0.4 for d in delays)
+    assert len(set(delays)) > 1
+    assert all(policy.delay(10) <= 1.0 for _ in range(50))
+    assert policy.delay(1, retry_after="0.5") == 0.5
+    assert not RetryPolicy(max_attempts=3, retry_methods=("GET",)).can_retry("POST", 1)
+
+
+def test_breaker_opens_and_recovers():
+    """
+    测试熔断器连续失败后打开，超时后放行一个试探请求，成功则关闭。
+    """
+    breaker = CircuitBreaker("h", failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    time.sleep(0.06)
+    breaker.before_request()
+    assert breaker.snapshot()["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "failures": 0, "rejected": 2, "retry_after": None}
+
+
+def test_client_retries_transient_5xx(flaky_server):
+    """
+    测试同步客户端遇到503时退避重试，最终返回成功响应。
+    """
+    url, handler = flaky_server(failures=2)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=3, base_delay=0))
+    assert client.post(url, json={}).status_code == 200
+    assert handler.calls == 3
+    client.close()
+
+
+def test_client_timeout(flaky_server):
+    """
+    测试读取超时生效，重试用尽后抛出 requests.Timeout。
+    """
+    url, handler = flaky_server(delay=0.3)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=2, base_delay=0), timeout=(1, 0.05))
+    with pytest.raises(requests.Timeout):
+        client.post(url, json={})
+    assert handler.calls == 2
+    client.close()
+
+
+def test_breaker_fails_fast(flaky_server):
+    """
+    测试主机连续失败后熔断，之后的请求不再发出，直接抛出 CircuitOpenError。
+    """
+    url, handler = flaky_server(failures=100)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1))
+    for _ in range(get_breaker(url).failure_threshold):
+        assert client.post(url, json={}).status_code == 503
+    calls = handler.calls
+    with pytest.raises(CircuitOpenError):
+        client.post(url, json={})
+    assert handler.calls == calls
+    client.close()
+
+
+def test_async_client_retries():
+    """
+    测试异步客户端对网络错误与503同样重试。
+    """
+    reset_breakers()
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("boom", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = AsyncAMinerClient(retry=RetryPolicy(max_attempts=3, base_delay=0))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await client.request("POST", "http://mock.test/n", json={})
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(attempts) == 3
+    reset_breakers()
+
+
+class RecordingLimiter:
+    """限速器桩：记录取令牌时熔断器的状态。"""
+
+    def __init__(self, url):
+        self.url = url
+        self.states = []
+
+    def acquire(self, url):
+        self.states.append(get_breaker(self.url).snapshot()["state"])
+
+    async def acquire_async(self, url):
+        self.acquire(url)
+
+    def refund(self, url):
+        self.states.append("refund")
+
+
+def open_breaker(url):
+    breaker = get_breaker(url)
+    breaker.reset_timeout = 0.05
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure()
+    time.sleep(0.06)
+    return breaker
+
+
+def test_client_takes_probe_after_rate_limit(flaky_server):
+    """
+    测试同步客户端先取限速令牌再占用熔断器的试探名额：取令牌时熔断器仍为 open，试探成功后关闭。
+    """
+    url, handler = flaky_server()
+    breaker = open_breaker(url)
+    limiter = RecordingLimiter(url)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1), limiter=limiter)
+    assert client.post(url, json={}).status_code == 200
+    assert limiter.states == ["open"]
+    assert breaker.snapshot()["state"] == "closed"
+    client.close()
+
+
+def test_async_client_takes_probe_inside_semaphore():
+    """
+    测试异步客户端在主机信号量内才占用试探名额：half_open 时排队等待信号量的请求不被拒绝，
+    试探成功、熔断器关闭后照常发送。
+    """
+    reset_breakers()
+    url = "http://mock.test/n"
+
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = AsyncAMinerClient(per_host=1, retry=RetryPolicy(max_attempts=1), limiter=RecordingLimiter(url))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await asyncio.gather(*(client.request("POST", url, json={}) for _ in range(3)))
+        finally:
+            await client.aclose()
+
+    breaker = open_breaker(url)
+    assert [r.status_code for r in asyncio.run(run())] == [200, 200, 200]
+    assert breaker.snapshot()["state"] == "closed" and breaker.snapshot()["rejected"] == 0
+    reset_breakers()
+
+
+def test_rejected_requests_do_not_spend_rate_tokens(flaky_server):
+    """
+    测试被熔断器拒绝的请求不消耗限速令牌：熔断期间不取令牌直接失败；
+    等待令牌期间试探名额被占用时归还已取得的令牌。
+    """
+    from aminer.ratelimit import HostRateLimiter
+    url, handler = flaky_server()
+    limiter = HostRateLimiter({"127.0.0.1": (1, 1)})
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1), limiter=limiter)
+    breaker = get_breaker(url)
+    breaker.reset_timeout = 60
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure()
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            client.post(url, json={})
+    assert limiter.bucket(url).reserve() == 0
+    limiter.bucket(url).refund()
+
+    class ProbeTakenLimiter(RecordingLimiter):
+        def acquire(self, url):
+            super().acquire(url)
+            # 等待令牌期间，另一个请求取得了试探名额
+            breaker.before_request()
+
+    breaker.reset_timeout = 0
+    limiter = ProbeTakenLimiter(url)
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1), limiter=limiter)
+    with pytest.raises(CircuitOpenError):
+        client.post(url, json={})
+    assert limiter.states == ["open", "refund"]
+    assert handler.calls == 0
+    client.close()
@@ -0,0 +1,102 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aminer.singleflight import SingleFlight, coalesced, flight_call
+
+
+def test_threads_share_one_call():
+    """
+    测试多个线程并发的相同调用只执行一次，全部拿到同一结果，并统计合并次数。
+    """
+    group = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fetch(person_id):
+        calls.append(person_id)
+        started.set()
+        time.sleep(0.1)
+        return {"id": person_id}
+
+    results = []
+
+    def worker():
+        results.append(flight_call("person_detail", fetch, "p1", group=group))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["p1"]
+    assert results == [{"id": "p1"}] * 8
+    assert group.stats() == {"person_detail": {"calls": 8, "coalesced": 7}}
+
+
+def test_threads_share_error_and_next_call_runs_again():
+    """
+    测试共享调用的异常会传给所有调用方，完成之后的新调用重新执行。
+    """
+    group = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fetch(person_id):
+        calls.append(person_id)
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("AMiner API请求失败")
+
+    errors = []
+
+    def worker():
+        try:
+            flight_call("person_detail", fetch, "p1", group=group)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(errors) == 4
+    with pytest.raises(RuntimeError):
+        flight_call("person_detail", fetch, "p1", group=group)
+    assert len(calls) == 2
+
+
+def test_async_coalesces_and_survives_caller_cancel():
+    """
+    测试协程并发的相同调用只执行一次；不同参数不合并；一个调用方被取消不影响其他调用方。
+    """
+    group = SingleFlight()
+    calls = []
+
+    @coalesced("papers", group=group, ignore=("batcher",))
+    async def search(scholar_id, page=0, batcher=None):
+        calls.append((scholar_id, page))
+        await asyncio.sleep(0.05)
+        return {"hitList": [page], "hitsTotal": 1}
+
+    async def run():
+        doomed = asyncio.ensure_future(search("s1"))
+        others = [search("s1", batcher=object()) for _ in range(5)] + [search("s1", page=1)]
+        gathered = asyncio.gather(*others)
+        await asyncio.sleep(0.01)
+        doomed.cancel()
+        return await gathered
+
+    results = asyncio.run(run())
+    assert sorted(calls) == [("s1", 0), ("s1", 1)]
+    assert results[:5] == [{"hitList": [0], "hitsTotal": 1}] * 5
+    assert group.stats()["papers"] == {"calls": 7, "coalesced": 5}
@@ -0,0 +1,117 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import asyncio
+import json
+import random
+
+import pytest
+
+from aminer import api, async_api
+from aminer.client import AMinerClient
+from aminer.fake_server import FakeAMinerData, serve_in_thread
+from aminer.resilience import RetryPolicy, reset_breakers
+from aminer.streaming import HitListParser
+
+PERSON_ID = "56066a5245cedb339687488b"
+
+
+def parse_in_chunks(body: bytes, rng: random.Random):
+    parser = HitListParser()
+    hits = []
+    pos = 0
+    while pos < len(body):
+        step = rng.randint(1, 64)
+        hits.extend(parser.feed(body[pos:pos + step]))
+        pos += step
+    return hits, parser.close()
+
+
+def test_parser_matches_json_loads_for_any_split():
+    """
+    测试任意切分字节块（包括切断多字节字符）时，增量解析结果与 json.loads 一致。
+    """
+    with open(os.path.join(os.path.dirname(__file__), "../demo/patents.json"), encoding="utf-8") as f:
+        result = json.load(f)
+    result["data"]["hitList"] = result["data"]["hitList"] * 5
+    body = json.dumps(result, ensure_ascii=False, indent=1).encode("utf-8")
+    rng = random.Random(0)
+    for _ in range(5):
+        hits, envelope = parse_in_chunks(body, rng)
+        assert hits == result["data"]["hitList"]
+        assert envelope["data"]["hitList"] == []
+        assert envelope["data"]["hitsTotal"] == result["data"]["hitsTotal"]
+        assert envelope["code"] == 200
+
+
+def test_parser_empty_list_and_missing_list():
+    """
+    测试空 hitList 与不含 hitList 的响应（如错误响应）都能得到外层结构。
+    """
+    hits, envelope = parse_in_chunks(b'{"data": [{"data": {"hitList": [], "hitsTotal": 0}}]}', random.Random(1))
+    assert hits == [] and envelope["data"][0]["data"]["hitsTotal"] == 0
+    hits, envelope = parse_in_chunks(b'{"code": 500, "success": false}', random.Random(1))
+    assert hits == [] and envelope == {"code": 500, "success": False}
+
+
+def test_parser_truncated_body():
+    """
+    测试响应在 hitList 中途截断时 close 抛出异常。
+    """
+    parser = HitListParser()
+    assert parser.feed(b'{"hitList": [{"id": 1}, {"id": 2') == [{"id": 1}]
+    with pytest.raises(Exception, match="JSON"):
+        parser.close()
+
+
+@pytest.fixture
+def fake_aminer(monkeypatch):
+    monkeypatch.setenv("AMINER_TOKEN", "fake-token")
+    reset_breakers()
+    server, base_url = serve_in_thread(data=FakeAMinerData(seed=2, scholars=5, papers_per_scholar=300, patents_per_scholar=80))
+    for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+        monkeypatch.setattr(api, name, base_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+    reset_breakers()
+
+
+def test_stream_matches_full_parse(fake_aminer):
+    """
+    测试流式检索与普通检索返回相同的论文/专利与总数。
+    """
+    full = api.search_papers_by_scholar_free(PERSON_ID, size=500)
+    stream = api.stream_papers_by_scholar(PERSON_ID, size=500)
+    assert list(stream) == full["hitList"]
+    assert stream.hits_total == full["hitsTotal"]
+    full = api.search_patents_by_scholar_free(PERSON_ID, size=500)
+    stream = api.stream_patents_by_scholar(PERSON_ID, size=500)
+    assert list(stream) == full["hitList"]
+    assert stream.hits_total == full["hitsTotal"]
+
+
+def test_async_stream_matches_full_parse(fake_aminer):
+    """
+    测试异步流式检索与普通检索结果一致。
+    """
+    async def run():
+        full = await async_api.search_patents_by_scholar_free(PERSON_ID, size=500)
+        stream = await async_api.stream_patents_by_scholar(PERSON_ID, size=500)
+        hits = [hit async for hit in stream]
+        await async_api.get_async_client().aclose()
+        return full, hits, stream.hits_total
+
+    full, hits, total = asyncio.run(run())
+    assert hits == full["hitList"]
+    assert total == full["hitsTotal"]
+
+
+def test_stream_error_status(fake_aminer, monkeypatch):
+    """
+    测试非200响应在遍历时抛出与普通检索相同的异常。
+    """
+    fake_aminer.error_rate = 1.0
+    client = AMinerClient(retry=RetryPolicy(max_attempts=1))
+    monkeypatch.setattr(api, "get_client", lambda: client)
+    with pytest.raises(Exception, match="503"):
+        list(api.stream_papers_by_scholar(PERSON_ID))
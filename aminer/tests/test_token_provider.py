@@ -0,0 +1,75 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import threading
+
+from aminer.token_provider import TokenProvider
+
+
+def write_token(path, token, mtime_ns):
+    path.write_text(token + "\n", encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_token_cached_until_file_changes(tmp_path, monkeypatch):
+    """
+    测试 Token 缓存在内存中，文件修改时间变化后才重新读取。
+    """
+    monkeypatch.delenv("AMINER_TOKEN", raising=False)
+    path = tmp_path / "TOKEN"
+    write_token(path, "token-1", 1_000_000_000_000_000_000)
+    provider = TokenProvider(str(path), check_interval=0)
+    assert provider.get() == "token-1"
+    reads = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: reads.append(a[0]) or real_open(*a, **k))
+    assert provider.get() == "token-1"
+    assert reads == []
+    write_token(path, "token-2", 1_000_000_001_000_000_000)
+    assert provider.get() == "token-2"
+    assert reads == [str(path)]
+
+
+def test_check_interval_skips_stat(tmp_path, monkeypatch):
+    """
+    测试 check_interval 内直接返回缓存值，不检查文件。
+    """
+    monkeypatch.delenv("AMINER_TOKEN", raising=False)
+    path = tmp_path / "TOKEN"
+    write_token(path, "token-1", 1_000_000_000_000_000_000)
+    provider = TokenProvider(str(path), check_interval=3600)
+    assert provider.get() == "token-1"
+    write_token(path, "token-2", 1_000_000_001_000_000_000)
+    assert provider.get() == "token-1"
+    provider.invalidate()
+    assert provider.get() == "token-2"
+
+
+def test_env_override(tmp_path, monkeypatch):
+    """
+    测试环境变量 AMINER_TOKEN 优先于文件，且文件可以不存在。
+    """
+    monkeypatch.setenv("AMINER_TOKEN", " env-token ")
+    provider = TokenProvider(str(tmp_path / "missing"))
+    assert provider.get() == "env-token"
+
+
+def test_concurrent_get(tmp_path, monkeypatch):
+    """
+    测试多线程并发获取 Token 结果一致。
+    """
+    monkeypatch.delenv("AMINER_TOKEN", raising=False)
+    path = tmp_path / "TOKEN"
+    write_token(path, "token-1", 1_000_000_000_000_000_000)
+    provider = TokenProvider(str(path), check_interval=0)
+    results = []
+
+    def worker():
+        for _ in range(200):
+            results.append(provider.get())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert set(results) == {"token-1"}
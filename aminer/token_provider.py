@@ -0,0 +1,67 @@
+"""
+aminer/token_provider.py
+
+AMiner API Token 提供者：在内存中缓存 Token，仅在 TOKEN 文件发生变化时重新读取，
+可在不重启服务的情况下轮换 Token，且可被多个线程同时使用。
+
+Token 来源优先级：
+1. 环境变量 AMINER_TOKEN（设置后直接使用，不再读取文件）。
+2. 环境变量 AMINER_TOKEN_FILE 指定的文件。
+3. 本模块所在目录下的 TOKEN 文件（即 aminer/TOKEN，与当前工作目录无关）。
+"""
+
+import os
+import threading
+import time
+
+TOKEN_ENV = "AMINER_TOKEN"
+TOKEN_FILE_ENV = "AMINER_TOKEN_FILE"
+DEFAULT_TOKEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "TOKEN")
+
+
+class TokenProvider:
+    """
+    带缓存的 Token 提供者。
+
+    参数：
+        path (str, 可选): TOKEN 文件路径，默认取 AMINER_TOKEN_FILE 或 aminer/TOKEN。
+        check_interval (float): 两次检查文件修改时间的最小间隔（秒），期间直接返回缓存值。
+    """
+
+    def __init__(self, path: str = None, check_interval: float = 1.0):
+        self.path = path or os.getenv(TOKEN_FILE_ENV) or DEFAULT_TOKEN_FILE
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._token = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def get(self) -> str:
+        """
+        返回当前 Token。
+        异常：
+            未设置 AMINER_TOKEN 且 TOKEN 文件不存在时抛出 FileNotFoundError。
+        """
+        override = os.getenv(TOKEN_ENV)
+        if override:
+            return override.strip()
+        if self._token is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._token
+        with self._lock:
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size)
+            if signature != self._signature:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._token = f.read().strip()
+                self._signature = signature
+            self._checked_at = time.monotonic()
+            return self._token
+
+    def invalidate(self):
+        """丢弃缓存，下一次 get() 重新读取文件。"""
+        with self._lock:
+            self._token = None
+            self._signature = None
+
+
+default_provider = TokenProvider()
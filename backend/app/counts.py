@@ -0,0 +1,157 @@
+"""
+backend/app/counts.py
+
+列表接口的总数计算。每次列表请求都对同一筛选条件执行 count()，数据库工作量接近翻倍，大表上尤为明显；
+本模块按 count 参数提供四种方式：
+- exact: 精确计数（默认，与原行为一致）。
+- estimated: PostgreSQL 上取优化器估计的行数（无筛选时取 pg_class.reltuples，否则取 EXPLAIN 的 Plan Rows），
+  不执行计数；其他数据库无法估计，退化为 exact。
+- cached: 按 (表, 筛选条件) 缓存精确计数，表发生变化后失效。
+- none: 不计数，total 为 None，供无限滚动等不需要总数的界面使用。
+
+包含的对象及简要介绍：
+- COUNT_MODES: 支持的计数方式。
+- track_changes: 在引擎上注册事件，记录本进程提交的写入，用于 cached 方式的失效判断。
+- count_rows: 按计数方式返回查询的总数。
+- clear_count_cache: 清空计数缓存。
+
+环境变量：
+- COUNT_CACHE_TTL: 缓存计数的最长有效秒数，默认300。
+- COUNT_CACHE_SIZE: 缓存的最大条目数（LRU），默认1024。
+
+注意事项：
+- 表的"版本"由两部分组成：本进程经该引擎提交的 INSERT/UPDATE/DELETE 次数（事务提交时计入，回滚不计），
+  以及 PostgreSQL 上 pg_stat_user_tables 的增删改计数（覆盖其他进程的写入，如独立的调度 worker 与批量导入）。
+  版本变化即失效；统计信息有短暂延迟，且 SQLite 上无法感知其他进程的写入，因此另以 COUNT_CACHE_TTL 限制最长有效期。
+- 以 text() 执行的原生SQL写入不会被本进程记录。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+COUNT_MODES = ("exact", "estimated", "cached", "none")
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "300"))
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+
+_lock = threading.Lock()
+# 表名 -> 本进程提交的写入次数
+_versions = {}
+# (表名, 筛选条件) -> (版本, 过期时间, 计数)
+_cache = OrderedDict()
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <语句>，参数按原语句绑定。"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    if isinstance(clauseelement, UpdateBase) and getattr(clauseelement, "table", None) is not None:
+        conn.info.setdefault("count_touched", set()).add(clauseelement.table.name)
+
+
+def _after_commit(conn):
+    touched = conn.info.pop("count_touched", None)
+    if touched:
+        with _lock:
+            for name in touched:
+                _versions[name] = _versions.get(name, 0) + 1
+
+
+def _after_rollback(conn):
+    conn.info.pop("count_touched", None)
+
+
+def track_changes(engine):
+    """在引擎上注册事件：事务提交时记录其中写入过的表。"""
+    event.listen(engine, "after_execute", _after_execute)
+    event.listen(engine, "commit", _after_commit)
+    event.listen(engine, "rollback", _after_rollback)
+
+
+def clear_count_cache():
+    with _lock:
+        _cache.clear()
+
+
+def _table_version(db, table) -> tuple:
+    local = _versions.get(table.name, 0)
+    if db.get_bind().dialect.name != "postgresql":
+        return (local,)
+    remote = db.execute(
+        text("SELECT n_tup_ins + n_tup_upd + n_tup_del FROM pg_stat_user_tables WHERE relid = CAST(:name AS regclass)"),
+        {"name": table.name},
+    ).scalar()
+    return (local, remote)
+
+
+def _estimate(db, query, table, filtered: bool) -> int:
+    if not filtered:
+        reltuples = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"), {"name": table.name}
+        ).scalar()
+        # 从未 ANALYZE 的表为 -1（PostgreSQL 14 起）或 0
+        if reltuples is not None and reltuples > 0:
+            return int(reltuples)
+    plan = db.execute(_Explain(query.statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db, query, table, mode: str = "exact", filters: dict = None):
+    """
+    按计数方式返回查询的总数。
+    参数：
+        db: 数据库会话。
+        query: 已加筛选条件、未排序分页的 ORM 查询。
+        table: 查询的主表（如 Paper.__table__），用于估计与缓存失效。
+        mode (str): exact / estimated / cached / none，见模块说明。
+        filters (dict): 查询的筛选参数（如 {"year": 2020}），值为 None 的参数视为未筛选；作为缓存键，
+            须能唯一确定查询条件。
+    返回：
+        int 或 None: mode 为 none 时返回 None。
+    异常：
+        ValueError: mode 不受支持。
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"不支持的计数方式: {mode}")
+    if mode == "none":
+        return None
+    active = tuple(sorted((key, value) for key, value in (filters or {}).items() if value is not None))
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        return _estimate(db, query, table, bool(active))
+    if mode != "cached":
+        return query.count()
+    key = (table.name, active)
+    # 先取版本再计数：计数期间提交的写入会使版本变化，不会以旧计数配新版本
+    version = _table_version(db, table)
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == version and hit[1] > now:
+            _cache.move_to_end(key)
+            return hit[2]
+    total = query.count()
+    with _lock:
+        _cache[key] = (version, now + COUNT_CACHE_TTL, total)
+        _cache.move_to_end(key)
+        while len(_cache) > COUNT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return total
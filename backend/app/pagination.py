@@ -0,0 +1,126 @@
+"""
+backend/app/pagination.py
+
+列表接口的游标（keyset）分页。OFFSET 分页需要扫描并丢弃前面的全部行，越往后翻越慢；
+游标分页以上一页最后一行的 (排序键, id) 作为起点，每一页都是一次同样代价的索引定位。
+
+包含的对象及简要介绍：
+- SortKey: 排序方式（列、方向），由 "year"、"-num_citation" 形式的参数解析。
+- encode_cursor / decode_cursor: 游标与 (排序名, 排序键值, id) 的相互转换，游标对调用方不透明。
+- keyset_page: 按排序方式与游标取一页，返回 (行列表, next_cursor)。
+
+注意事项：
+- 排序键相同的行按 id 排序（方向与排序键相同），保证顺序全序、翻页不重不漏。
+- 排序键为 NULL 的行排在最后（NULLS LAST），与方向无关。
+- 游标记录了排序名，与本次请求的排序方式不一致时视为无效游标；游标键的长度与各值的类型
+  （id 为整数，排序键为排序列的类型或 NULL）也须与排序方式一致，伪造的游标不会进入SQL。
+- 分页期间插入的行若排在当前位置之前，不会出现在后续页中；删除的行不影响后续页。
+"""
+
+import base64
+import binascii
+import json
+
+from sqlalchemy import and_, or_
+
+
+class SortKey:
+    """
+    排序方式。
+    参数：
+        name (str): 排序参数，如 "id"、"year"、"-num_citation"（"-" 前缀表示降序）。
+        model: ORM模型类，排序列为 model 上与 name 同名的列，须有 id 主键。
+    """
+
+    def __init__(self, name: str, model):
+        self.name = name
+        self.descending = name.startswith("-")
+        field = name.lstrip("-")
+        self.id_column = model.id
+        self.column = None if field == "id" else getattr(model, field)
+
+    def order_by(self) -> list:
+        id_order = self.id_column.desc() if self.descending else self.id_column.asc()
+        if self.column is None:
+            return [id_order]
+        column_order = self.column.desc() if self.descending else self.column.asc()
+        return [column_order.nulls_last(), id_order]
+
+    def key_of(self, row) -> list:
+        """行的游标键：[排序键值, id]，按 id 排序时为 [id]。"""
+        if self.column is None:
+            return [row.id]
+        return [getattr(row, self.column.key), row.id]
+
+    def accepts(self, key) -> bool:
+        """key 是否为本排序方式的游标键：长度一致，id 为整数，排序键值为排序列类型的标量或 None。"""
+        columns = [self.id_column] if self.column is None else [self.column, self.id_column]
+        if not isinstance(key, list) or len(key) != len(columns):
+            return False
+        for value, column in zip(key, columns):
+            if value is None and column is not self.id_column:
+                continue
+            # bool 是 int 的子类，须单独排除
+            if isinstance(value, bool) or not isinstance(value, column.type.python_type):
+                return False
+        return True
+
+    def after(self, key: list):
+        """排在游标键之后的行的过滤条件。"""
+        after_id = self.id_column < key[-1] if self.descending else self.id_column > key[-1]
+        if self.column is None:
+            return after_id
+        value = key[0]
+        if value is None:
+            # NULL 排在最后：只剩同为 NULL 且 id 在后的行
+            return and_(self.column.is_(None), after_id)
+        beyond = self.column < value if self.descending else self.column > value
+        return or_(beyond, and_(self.column == value, after_id), self.column.is_(None))
+
+
+def encode_cursor(sort: str, key: list) -> str:
+    payload = json.dumps({"s": sort, "k": key}, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortKey) -> list:
+    """
+    解析游标，返回游标键。
+    异常：
+        ValueError: 游标格式错误，或排序名、游标键与排序方式不一致。
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key = payload["k"]
+        valid = payload["s"] == sort.name and sort.accepts(key)
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        valid = False
+    if not valid:
+        raise ValueError("无效的游标")
+    return key
+
+
+def keyset_page(query, sort: SortKey, size: int, cursor: str = None, offset: int = 0) -> tuple:
+    """
+    取一页数据。
+    参数：
+        query: 已加筛选条件的 ORM 查询（如 db.query(Paper).filter(...)）。
+        sort (SortKey): 排序方式。
+        size (int): 每页条数。
+        cursor (str): 上一页返回的 next_cursor；为空时从 offset 开始（兼容 OFFSET 分页）。
+        offset (int): 未提供游标时的偏移量。
+    返回：
+        tuple: (行列表, next_cursor)，没有更多数据时 next_cursor 为 None。
+    异常：
+        ValueError: 游标无效。
+    """
+    query = query.order_by(*sort.order_by())
+    if cursor:
+        query = query.filter(sort.after(decode_cursor(cursor, sort)))
+    elif offset:
+        query = query.offset(offset)
+    rows = query.limit(size + 1).all()
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor(sort.name, sort.key_of(rows[-1]))
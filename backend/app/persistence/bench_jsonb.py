@@ -0,0 +1,121 @@
+"""
+backend/app/persistence/bench_jsonb.py
+
+作者筛选（authors @> '[{"name": ...}]'）在 json 列与 jsonb + GIN(jsonb_path_ops) 列上的 EXPLAIN ANALYZE 对比。
+在 PostgreSQL 中生成两张合成表（默认各100万行，每行3位作者，作者名取自20万个名字），分别执行：
+- 迁移前：json 列，包含查询需要逐行把 json 解析为 jsonb（authors::jsonb @> ...），只能顺序扫描；
+- 迁移后：jsonb 列加 GIN 索引，包含查询为 Bitmap Index Scan。
+
+包含的对象及简要介绍：
+- run_benchmark: 建表、写入合成数据、执行 EXPLAIN (ANALYZE, BUFFERS)，返回各查询的计划节点与耗时。
+- main: 命令行入口，python -m backend.app.persistence.bench_jsonb --rows 1000000。
+
+注意事项：
+- 使用 DATABASE_URL 指向的数据库，表名为 bench_authors_json / bench_authors_jsonb，结束后删除（--keep 保留）。
+- 每个查询执行 --repeat 次取最短耗时，首次执行的缓存预热影响因此被排除。
+"""
+
+import argparse
+import json
+import logging
+import os
+
+from sqlalchemy import create_engine, text
+
+logger = logging.getLogger(__name__)
+
+NAME_POOL = 200000
+AUTHORS_PER_ROW = 3
+TABLES = {"json": "bench_authors_json", "jsonb": "bench_authors_jsonb"}
+
+# (名称, 查询)：{table} 为表名，作者名取自合成数据，匹配约 rows*3/NAME_POOL 行
+QUERIES = (
+    ("json (迁移前)", "SELECT id FROM {json} WHERE authors::jsonb @> CAST(:document AS jsonb)"),
+    ("jsonb + GIN (迁移后)", "SELECT id FROM {jsonb} WHERE authors @> CAST(:document AS jsonb)"),
+    ("json count (迁移前)", "SELECT count(*) FROM {json} WHERE authors::jsonb @> CAST(:document AS jsonb)"),
+    ("jsonb count + GIN (迁移后)", "SELECT count(*) FROM {jsonb} WHERE authors @> CAST(:document AS jsonb)"),
+)
+
+
+def _populate(conn, rows: int):
+    authors = ", ".join(
+        f"jsonb_build_object('name', 'author' || ((i * {k * 7919 + 1}) % {NAME_POOL}), 'org', 'org' || (i % 1000))"
+        for k in range(AUTHORS_PER_ROW)
+    )
+    for kind, table in TABLES.items():
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+        conn.exec_driver_sql(f"CREATE TABLE {table} (id serial PRIMARY KEY, title text, authors {kind})")
+        conn.exec_driver_sql(
+            f"INSERT INTO {table} (title, authors) "
+            f"SELECT 'paper ' || i, jsonb_build_array({authors})::{kind} FROM generate_series(1, {rows}) AS i"
+        )
+    conn.exec_driver_sql(f"CREATE INDEX ON {TABLES['jsonb']} USING gin (authors jsonb_path_ops)")
+    for table in TABLES.values():
+        conn.exec_driver_sql(f"VACUUM ANALYZE {table}")
+
+
+def _plan_nodes(plan: dict) -> list:
+    nodes = [plan["Node Type"] + (f" on {plan['Index Name']}" if "Index Name" in plan else "")]
+    for child in plan.get("Plans", []):
+        nodes += _plan_nodes(child)
+    return nodes
+
+
+def run_benchmark(engine, rows: int = 1000000, repeat: int = 3, keep: bool = False) -> list:
+    """
+    执行对比。
+    参数：
+        engine: PostgreSQL 引擎。
+        rows (int): 每张表的行数。
+        repeat (int): 每个查询执行次数，取最短耗时。
+        keep (bool): 结束后保留合成表。
+    返回：
+        list[dict]: [{"query": str, "nodes": [计划节点], "rows": int, "execution_ms": float, "planning_ms": float}, ...]
+    """
+    document = json.dumps([{"name": "author12345"}])
+    results = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        logger.info("写入合成数据：每张表 %d 行", rows)
+        _populate(conn, rows)
+        try:
+            for name, sql in QUERIES:
+                best = None
+                for _ in range(repeat):
+                    plan = conn.execute(text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql.format(**TABLES)),
+                                        {"document": document}).scalar()
+                    plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+                    if best is None or plan["Execution Time"] < best["Execution Time"]:
+                        best = plan
+                results.append({
+                    "query": name,
+                    "nodes": _plan_nodes(best["Plan"]),
+                    "rows": best["Plan"]["Actual Rows"],
+                    "execution_ms": best["Execution Time"],
+                    "planning_ms": best["Planning Time"],
+                })
+        finally:
+            if not keep:
+                for table in TABLES.values():
+                    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+    return results
+
+
+def main():
+    """命令行入口：python -m backend.app.persistence.bench_jsonb [--rows N] [--repeat N] [--keep]。"""
+    parser = argparse.ArgumentParser(description="json 与 jsonb+GIN 作者包含查询的 EXPLAIN ANALYZE 对比（PostgreSQL）")
+    parser.add_argument("--rows", type=int, default=1000000, help="每张合成表的行数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个查询的执行次数（取最短耗时）")
+    parser.add_argument("--keep", action="store_true", help="保留合成表")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("请设置DATABASE_URL环境变量")
+    results = run_benchmark(create_engine(database_url), rows=args.rows, repeat=args.repeat, keep=args.keep)
+    for result in results:
+        print(f"{result['query']:<28} {result['execution_ms']:>10.1f} ms  rows={result['rows']:<6} "
+              f"{' -> '.join(result['nodes'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+backend/app/persistence/bulk_import.py
+
+学者、论文、专利的批量导入命令，用于整个院系建档或从备份恢复。
+输入为 NDJSON（每行一个对象）或带表头的 CSV，可为 gzip 压缩（.gz），字段与 ScholarIn / PaperIn / PatentIn 相同，
+缺失字段取同样的默认值。导入不经过 HTTP 接口与逐条 pydantic 校验：
+PostgreSQL 上每个分块以 COPY 写入临时暂存表，再以一条 INSERT ... SELECT ... ON CONFLICT (aminer_id) 合并到目标表；
+其他数据库（如测试用的 SQLite）以 upsert.bulk_upsert 写入每个分块。
+
+包含的对象及简要介绍：
+- KINDS: 可导入的数据类型（scholars / papers / patents）。
+- read_records: 流式读取 NDJSON/CSV，逐条返回 (行dict, 读取位置)。
+- import_file: 导入一个文件，按分块提交并记录进度，可断点续传，返回统计信息。
+- main: 命令行入口，python -m backend.app.persistence.bulk_import papers papers.ndjson.gz。
+
+环境变量：
+- BULK_IMPORT_CHUNK_SIZE: 每个分块（一次 COPY + 合并 + 提交）的记录数，默认100000。
+
+注意事项：
+- 每个分块提交后把已读取到的文件位置写入状态文件（默认为输入文件名加 .import-state.json）；
+  中断后以相同参数重新运行即从该位置继续，--restart 从头导入。合并按 aminer_id 幂等，
+  分块提交后、状态写入前中断时重新导入该分块不会产生重复数据。
+- 输入文件在中断后被修改（大小变化）时拒绝续传。
+- 写入模式同 upsert.py：skip（默认）跳过已存在的 aminer_id，update / update_if_changed 覆盖；更新不修改 scholar_id。
+- 同一分块内 aminer_id 重复时以最后一条为准。输入中的 id、created_at 等非输入字段被忽略，
+  papers/patents 的 scholar_id 须为本库中的学者ID，请先导入学者。
+- CSV 中空单元格取默认值；学者的 indices、tags 等结构化字段在CSV中为JSON文本。
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import logging
+import os
+import time
+import typing
+from io import StringIO
+
+from sqlalchemy import BigInteger, Column, JSON, MetaData, Table, func, literal_column, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from backend.app.persistence.models import Paper, Patent, Scholar
+from backend.app.persistence.types import JSONText
+from backend.app.persistence.upsert import UPSERT_MODES, bulk_upsert, on_conflict
+from backend.app.schemas import PaperIn, PatentIn, ScholarIn
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "100000"))
+
+# 数据类型 -> (ORM模型, 输入模型)
+KINDS = {
+    "scholars": (Scholar, ScholarIn),
+    "papers": (Paper, PaperIn),
+    "patents": (Patent, PatentIn),
+}
+
+# COPY 文本格式需要转义的字符
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+# json.dumps 带参数时每次调用都新建编码器，逐行编码JSON列时复用同一个
+_json_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _specs(kind: str) -> list:
+    """返回 [(列名, 类型, 是否必填, 默认值工厂)]，类型为 "str" / "int" / "json"，取自输入模型的字段。"""
+    specs = []
+    for name, field in KINDS[kind][1].model_fields.items():
+        annotation = field.annotation
+        if typing.get_origin(annotation) is typing.Union:
+            annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+        kind_ = "str" if annotation is str else "int" if annotation is int else "json"
+        specs.append((name, kind_, field.is_required(), lambda field=field: field.get_default(call_default_factory=True)))
+    return specs
+
+
+def _open(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _format_of(path: str) -> str:
+    return "csv" if path.removesuffix(".gz").endswith(".csv") else "ndjson"
+
+
+def read_records(path: str, fmt: str = None, offset: int = 0):
+    """
+    流式读取 NDJSON/CSV 文件。
+    参数：
+        path (str): 文件路径，.gz 结尾时按 gzip 解压。
+        fmt (str): ndjson 或 csv，默认按扩展名判断。
+        offset (int): 从该位置（解压后的字节数，即之前返回的读取位置）继续读取；CSV 仍从文件开头读取表头。
+    返回：
+        迭代器，逐条产生 (dict, int)：记录（CSV 的值均为字符串）与读取完该记录后的位置。
+    """
+    fmt = fmt or _format_of(path)
+    with _open(path) as f:
+        position = [0]
+
+        def lines():
+            for raw in f:
+                position[0] += len(raw)
+                yield raw.decode("utf-8")
+
+        if fmt == "csv":
+            header = next(csv.reader(lines()), None)
+            if header is None:
+                return
+            if offset:
+                f.seek(offset)
+                position[0] = offset
+            for values in csv.reader(lines()):
+                if values:
+                    yield dict(zip(header, values)), position[0]
+        else:
+            if offset:
+                f.seek(offset)
+                position[0] = offset
+            for line in lines():
+                if line.strip():
+                    yield json.loads(line), position[0]
+
+
+def _normalize(record: dict, specs: list, from_csv: bool, number: int) -> dict:
+    """按输入模型的字段取值并补默认值；CSV 的整数与结构化字段从文本转换。"""
+    row = {}
+    for name, kind, required, default in specs:
+        value = record.get(name)
+        if value is None or (from_csv and value == ""):
+            if required:
+                raise ValueError(f"第{number}条记录缺少必填字段 {name}")
+            value = default()
+        elif from_csv and kind == "int":
+            value = int(value)
+        elif from_csv and kind == "json":
+            value = json.loads(value)
+        row[name] = value
+    return row
+
+
+def _copy_line(row: dict, encoders: dict, line: int) -> str:
+    """COPY 文本格式的一行：列值以制表符分隔，末列为记录序号；encoders 为 {列名: 编码函数}，缺省为 str。"""
+    fields = []
+    for name, value in row.items():
+        if value is None:
+            fields.append("\\N")
+            continue
+        fields.append(encoders.get(name, str)(value).translate(_COPY_ESCAPES))
+    fields.append(str(line))
+    return "\t".join(fields) + "\n"
+
+
+def _json_encoders(table, columns: list) -> dict:
+    """JSON列的 COPY 编码函数：JSONText 列（接口层为JSON字符串）先按列类型解析，再编码为JSON文本。"""
+    encoders = {}
+    for name in columns:
+        type_ = table.c[name].type
+        if isinstance(type_, JSONText):
+            encoders[name] = lambda value, bind=type_.process_bind_param: _json_encode(bind(value, None))
+        elif isinstance(type_, JSON):
+            encoders[name] = _json_encode
+    return encoders
+
+
+class _PostgresWriter:
+    """PostgreSQL：COPY 到临时暂存表，再合并到目标表。整个导入使用同一连接（临时表只在该连接可见）。"""
+
+    def __init__(self, connection, model, columns: list, mode: str):
+        self.connection = connection
+        table = model.__table__
+        self.encoders = _json_encoders(table, columns)
+        self.staging = Table(
+            f"import_{table.name}", MetaData(),
+            *(Column(name, table.c[name].type) for name in columns),
+            Column("_line", BigInteger),
+            prefixes=["TEMPORARY"],
+        )
+        with connection.begin():
+            self.staging.drop(connection, checkfirst=True)
+            self.staging.create(connection)
+        self.copy_sql = f"COPY {self.staging.name} ({', '.join(columns)}, _line) FROM STDIN"
+        # 暂存表内同一 aminer_id 取最后一条（_line 最大），再按写入模式合并；xmax = 0 的行为新插入
+        latest = (select(*(self.staging.c[name] for name in columns))
+                  .distinct(self.staging.c.aminer_id)
+                  .order_by(self.staging.c.aminer_id, self.staging.c._line.desc()))
+        merge = on_conflict(postgresql.insert(table).from_select(columns, latest), table, columns, mode)
+        merged = merge.returning(literal_column("xmax = 0").label("inserted")).cte("merged")
+        self.merge = select(func.count(), func.count().filter(merged.c.inserted)).select_from(merged)
+
+    def write(self, rows: list, first_line: int) -> tuple:
+        buffer = StringIO()
+        for i, row in enumerate(rows):
+            buffer.write(_copy_line(row, self.encoders, first_line + i))
+        buffer.seek(0)
+        with self.connection.begin():
+            self.connection.execute(self.staging.delete())
+            with self.connection.connection.cursor() as cursor:
+                cursor.copy_expert(self.copy_sql, buffer)
+            written, inserted = self.connection.execute(self.merge).one()
+        return written, inserted
+
+
+class _UpsertWriter:
+    """其他数据库：以 bulk_upsert 写入分块。"""
+
+    def __init__(self, connection, model, columns: list, mode: str):
+        self.session = Session(bind=connection)
+        self.model = model
+        self.mode = mode
+
+    def write(self, rows: list, first_line: int) -> tuple:
+        keys = list({row["aminer_id"] for row in rows})
+        existing = sum(
+            self.session.scalar(select(func.count()).select_from(self.model).where(self.model.aminer_id.in_(keys[i:i + 500])))
+            for i in range(0, len(keys), 500)
+        )
+        written = len(bulk_upsert(self.session, self.model, rows, mode=self.mode))
+        self.session.commit()
+        return written, len(keys) - existing
+
+
+def _load_state(state_path: str, path: str, kind: str, restart: bool) -> dict:
+    size = os.path.getsize(path)
+    fresh = {"kind": kind, "path": os.path.abspath(path), "size": size, "offset": 0,
+             "records": 0, "written": 0, "inserted": 0, "done": False}
+    if restart or not os.path.exists(state_path):
+        return fresh
+    with open(state_path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("kind") != kind or state.get("size") != size:
+        raise ValueError(f"状态文件 {state_path} 与输入文件不匹配（文件已修改或类型不同），请使用 --restart 从头导入")
+    return state
+
+
+def _save_state(state_path: str, state: dict):
+    tmp = state_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, state_path)
+
+
+def import_file(engine, kind: str, path: str, fmt: str = None, mode: str = "skip", chunk_size: int = CHUNK_SIZE,
+                state_path: str = None, restart: bool = False, progress=None) -> dict:
+    """
+    导入一个 NDJSON/CSV 文件。
+    参数：
+        engine: SQLAlchemy 引擎。
+        kind (str): scholars / papers / patents。
+        path (str): 输入文件，.gz 结尾时按 gzip 解压。
+        fmt (str): ndjson 或 csv，默认按扩展名判断。
+        mode (str): skip / update / update_if_changed，见 upsert.py。
+        chunk_size (int): 每个分块的记录数，每个分块单独提交。
+        state_path (str): 断点续传的状态文件，默认为 path + ".import-state.json"。
+        restart (bool): 忽略已有状态，从头导入。
+        progress (callable): 每个分块提交后以状态dict调用，默认写日志。
+    返回：
+        dict: {
+            "kind": str, "path": str, "size": int,
+            "offset": int,       # 已提交的读取位置（解压后的字节数）
+            "records": int,      # 已读取的记录数（含此前中断前导入的）
+            "written": int,      # 被插入或更新的行数
+            "inserted": int,     # 新插入的行数
+            "done": bool,
+            "resumed_from": int, # 本次开始时的读取位置
+            "duration": float, "rate": float  # 本次耗时（秒）与每秒记录数
+        }
+    异常：
+        ValueError: 类型或写入模式不支持、记录缺少必填字段、状态文件与输入文件不匹配。
+    """
+    if kind not in KINDS:
+        raise ValueError(f"不支持的数据类型: {kind}")
+    if mode not in UPSERT_MODES:
+        raise ValueError(f"不支持的写入模式: {mode}")
+    fmt = fmt or _format_of(path)
+    state_path = state_path or path + ".import-state.json"
+    state = _load_state(state_path, path, kind, restart)
+    state["resumed_from"] = state["offset"]
+    progress = progress or _log_progress
+    started = time.perf_counter()
+    records_before = state["records"]
+    if not state["done"]:
+        specs = _specs(kind)
+        columns = [name for name, *_ in specs]
+        with engine.connect() as connection:
+            writer_class = _PostgresWriter if engine.dialect.name == "postgresql" else _UpsertWriter
+            writer = writer_class(connection, KINDS[kind][0], columns, mode)
+            chunk, chunk_offset = [], state["offset"]
+            for record, offset in read_records(path, fmt, state["offset"]):
+                chunk.append(_normalize(record, specs, fmt == "csv", state["records"] + len(chunk) + 1))
+                chunk_offset = offset
+                if len(chunk) >= chunk_size:
+                    _commit_chunk(writer, chunk, chunk_offset, state, state_path, started, records_before, progress)
+                    chunk = []
+            if chunk:
+                _commit_chunk(writer, chunk, chunk_offset, state, state_path, started, records_before, progress)
+        state["done"] = True
+        _save_state(state_path, state)
+    state["duration"] = time.perf_counter() - started
+    state["rate"] = (state["records"] - records_before) / state["duration"] if state["duration"] else 0.0
+    return state
+
+
+def _commit_chunk(writer, chunk: list, offset: int, state: dict, state_path: str, started: float,
+                  records_before: int, progress):
+    written, inserted = writer.write(chunk, state["records"])
+    state["offset"] = offset
+    state["records"] += len(chunk)
+    state["written"] += written
+    state["inserted"] += inserted
+    _save_state(state_path, state)
+    state["duration"] = time.perf_counter() - started
+    state["rate"] = (state["records"] - records_before) / state["duration"] if state["duration"] else 0.0
+    progress(state)
+
+
+def _log_progress(state: dict):
+    percent = state["offset"] / state["size"] * 100 if state["size"] and not state["path"].endswith(".gz") else None
+    logger.info("%s: 已导入 %d 条（写入 %d，新增 %d）%s，%.0f 条/秒", state["kind"], state["records"], state["written"],
+                state["inserted"], f"，{percent:.1f}%" if percent is not None else "", state["rate"])
+
+
+def main():
+    """命令行入口：python -m backend.app.persistence.bulk_import {scholars,papers,patents} 文件 [...]。"""
+    from sqlalchemy import create_engine
+    from backend.app.persistence.migrate import upgrade
+
+    parser = argparse.ArgumentParser(description="批量导入学者/论文/专利（NDJSON 或 CSV，可为 .gz）")
+    parser.add_argument("kind", choices=sorted(KINDS), help="数据类型")
+    parser.add_argument("path", help="输入文件")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="输入格式，默认按扩展名判断")
+    parser.add_argument("--mode", choices=UPSERT_MODES, default="skip", help="已存在 aminer_id 的处理方式")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每个分块（单独提交）的记录数")
+    parser.add_argument("--state", help="断点续传状态文件，默认为 输入文件.import-state.json")
+    parser.add_argument("--restart", action="store_true", help="忽略已有进度，从头导入")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("请设置DATABASE_URL环境变量")
+    engine = create_engine(database_url)
+    upgrade(engine)
+    result = import_file(engine, args.kind, args.path, fmt=args.format, mode=args.mode, chunk_size=args.chunk_size,
+                         state_path=args.state, restart=args.restart)
+    logger.info("导入完成：%s", json.dumps(result, ensure_ascii=False))
+    return result
+
+
+if __name__ == "__main__":
+    main()
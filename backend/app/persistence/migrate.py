@@ -0,0 +1,172 @@
+"""
+backend/app/persistence/migrate.py
+
+数据库结构的版本化迁移（Alembic）。迁移脚本位于 backend/app/persistence/migrations/versions，
+应用、调度 worker 与批量导入启动时执行 upgrade 升级到最新版本（已是最新版本时只读取版本号），
+取代原先的 Base.metadata.create_all——create_all 只建不存在的表，已部署的库无法增加索引或列。
+
+包含的对象及简要介绍：
+- upgrade: 将数据库升级到指定版本（默认最新）；由 create_all 建立、没有版本记录的旧库先标记为基线版本。
+- concurrent_indexes / create_indexes / drop_indexes: 供迁移脚本使用，按需以 CONCURRENTLY 方式建、删索引。
+- main: 命令行入口，python -m backend.app.persistence.migrate {upgrade,downgrade,current,history,revision}。
+
+注意事项：
+- 修改模型的表、列或索引时须同时新增迁移脚本：python -m backend.app.persistence.migrate revision -m "说明"
+  按模型与数据库的差异生成草稿，检查后提交；模型与迁移的一致性由 tests/test_migrations.py 检查。
+- upgrade --concurrently（仅 PostgreSQL）以 CREATE INDEX CONCURRENTLY 建索引，建索引期间不阻塞写入，
+  但耗时更长且在事务外执行；构建中断会留下无效（INVALID）索引，重新运行时先删除再重建。
+  大表上线新索引时先在部署前手动执行一次，应用启动时的 upgrade 即为空操作。
+- PostgreSQL 上以 advisory lock 串行化多个进程（应用与 worker）同时启动时的升级。
+- 基线版本须与旧版模型 create_all 的结果一致（json 列、无 GIN 索引），之后的变更均由编号迁移完成。
+"""
+
+import argparse
+import logging
+import os
+
+from alembic import command, context, op
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# create_all 时代的表结构，没有版本记录的旧库标记为此版本
+BASELINE = "0001"
+# pg_advisory_lock 的键，任意固定值
+LOCK_KEY = 7311409
+
+
+def _config(engine=None, connection=None, concurrently: bool = False) -> Config:
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    if engine is not None:
+        # ConfigParser 会解析 %，URL 中的转义字符须加倍
+        config.set_main_option("sqlalchemy.url", engine.url.render_as_string(hide_password=False).replace("%", "%%"))
+    config.attributes["connection"] = connection
+    config.attributes["concurrently"] = concurrently
+    return config
+
+
+def _unversioned(conn) -> bool:
+    tables = set(inspect(conn).get_table_names())
+    return "scholars" in tables and "alembic_version" not in tables
+
+
+def upgrade(engine, revision: str = "head", concurrently: bool = False):
+    """
+    将数据库升级到指定版本。
+    参数：
+        engine: 数据库引擎。
+        revision (str): 目标版本，默认最新。
+        concurrently (bool): PostgreSQL 上以 CONCURRENTLY 方式建索引，不阻塞写入。
+    """
+    with engine.connect() as conn:
+        postgresql = conn.dialect.name == "postgresql"
+        if postgresql:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+        try:
+            unversioned = _unversioned(conn)
+            # 迁移由 Alembic 自行开启事务，此前的读取须先结束
+            conn.commit()
+            config = _config(engine, conn, concurrently)
+            if unversioned:
+                logger.info("数据库没有版本记录，标记为基线版本 %s", BASELINE)
+                command.stamp(config, BASELINE)
+            command.upgrade(config, revision)
+        finally:
+            if postgresql:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY})
+                conn.commit()
+
+
+def concurrent_indexes() -> bool:
+    """当前迁移是否以 CONCURRENTLY 方式建、删索引：PostgreSQL 且指定了 --concurrently（或 -x concurrently=true）。"""
+    if op.get_context().dialect.name != "postgresql":
+        return False
+    if context.config.attributes.get("concurrently"):
+        return True
+    return context.get_x_argument(as_dictionary=True).get("concurrently", "").lower() in ("1", "true", "yes")
+
+
+def _invalid_index(name: str) -> bool:
+    return bool(op.get_bind().execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar())
+
+
+def create_indexes(indexes: list):
+    """
+    在迁移脚本中建索引，已存在的同名索引跳过（如新版模型 create_all 建立的库在标记基线后升级）。
+    参数：
+        indexes (list): [(索引名, 表名, [列名, ...]) 或 (索引名, 表名, [列名, ...], {op.create_index 的其他参数}), ...]，
+            如 ("ix_papers_authors_gin", "papers", ["authors"], {"postgresql_using": "gin"})。
+    """
+    if not concurrent_indexes():
+        for name, table, columns, *options in indexes:
+            op.create_index(name, table, columns, if_not_exists=True, **(options[0] if options else {}))
+        return
+    with op.get_context().autocommit_block():
+        for name, table, columns, *options in indexes:
+            if not context.is_offline_mode() and _invalid_index(name):
+                logger.info("删除构建失败的索引 %s", name)
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True,
+                            **(options[0] if options else {}))
+
+
+def drop_indexes(indexes: list):
+    """在迁移脚本中删除索引，参数同 create_indexes。"""
+    if not concurrent_indexes():
+        for name, table, *_ in indexes:
+            op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        for name, table, *_ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def main():
+    """命令行入口：python -m backend.app.persistence.migrate upgrade [revision] [--concurrently] [--sql] 等。"""
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="数据库结构迁移")
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_upgrade = commands.add_parser("upgrade", help="升级到指定版本（默认最新）")
+    parser_upgrade.add_argument("revision", nargs="?", default="head")
+    parser_upgrade.add_argument("--concurrently", action="store_true", help="以 CREATE INDEX CONCURRENTLY 建索引（PostgreSQL）")
+    parser_upgrade.add_argument("--sql", action="store_true", help="只打印SQL，不连接数据库执行（revision 可为 起始:目标）")
+    parser_downgrade = commands.add_parser("downgrade", help="降级到指定版本")
+    parser_downgrade.add_argument("revision")
+    parser_downgrade.add_argument("--concurrently", action="store_true", help="以 DROP INDEX CONCURRENTLY 删除索引（PostgreSQL）")
+    commands.add_parser("current", help="显示数据库当前版本")
+    commands.add_parser("history", help="显示迁移历史")
+    parser_revision = commands.add_parser("revision", help="按模型与数据库的差异生成新的迁移脚本")
+    parser_revision.add_argument("-m", "--message", required=True)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("请设置DATABASE_URL环境变量")
+    engine = create_engine(database_url)
+    if args.command == "upgrade" and not args.sql:
+        upgrade(engine, args.revision, concurrently=args.concurrently)
+        return
+    concurrently = getattr(args, "concurrently", False)
+    if args.command == "upgrade":
+        command.upgrade(_config(engine, concurrently=concurrently), args.revision, sql=True)
+        return
+    with engine.connect() as conn:
+        config = _config(engine, conn, concurrently)
+        if args.command == "downgrade":
+            command.downgrade(config, args.revision)
+        elif args.command == "current":
+            command.current(config)
+        elif args.command == "history":
+            command.history(config)
+        else:
+            command.revision(config, message=args.message, autogenerate=True)
+
+
+if __name__ == "__main__":
+    main()
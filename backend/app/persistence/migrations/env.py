@@ -0,0 +1,64 @@
+"""
+Alembic 迁移环境，由 backend.app.persistence.migrate 以代码方式配置（不使用 alembic.ini）。
+数据库连接取自 config.attributes["connection"]，未提供时按 sqlalchemy.url 或 DATABASE_URL 新建。
+"""
+
+import os
+
+from alembic import context
+from sqlalchemy import create_engine, make_url
+
+from backend.app.persistence.models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def _include_object(dialect_name):
+    def include(obj, name, type_, reflected, compare_to):
+        # PostgreSQL 专用的 GIN 索引（模型中以 ddl_if 限定）在其他数据库上不存在，不参与比较
+        if type_ == "index" and not reflected and dialect_name != "postgresql":
+            return obj.dialect_options["postgresql"]["using"] is None
+        return True
+    return include
+
+
+def _configure(dialect_name, **kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=_include_object(dialect_name),
+        # 含 autocommit_block（CONCURRENTLY）的迁移会提交此前的事务，每个迁移单独提交
+        transaction_per_migration=True,
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    url = config.get_main_option("sqlalchemy.url") or os.getenv("DATABASE_URL")
+    _configure(make_url(url).get_backend_name(), url=url, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection):
+    # SQLite 不支持大部分 ALTER TABLE，以 batch 方式（重建表）生成迁移
+    _configure(connection.dialect.name, connection=connection, render_as_batch=connection.dialect.name == "sqlite")
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or os.getenv("DATABASE_URL"))
+    with engine.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,119 @@
+"""基线：create_all 时代的表结构（json 列，仅 aminer_id 唯一索引）
+
+由 create_all 建立、没有版本记录的已部署数据库直接标记为本版本，不执行 upgrade，
+因此本版本须与旧版模型 create_all 的结果一致；jsonb 与 GIN 索引见 0003。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSON = sa.JSON()
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        "scholars",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("aminer_id", sa.String(64), nullable=False, comment="AMiner学者ID"),
+        sa.Column("name", sa.String(128), nullable=False, comment="姓名"),
+        sa.Column("name_zh", sa.String(128), comment="中文名"),
+        sa.Column("avatar", sa.String(512), comment="头像链接"),
+        sa.Column("nation", sa.String(64), comment="国家"),
+        sa.Column("indices", JSON, comment="学者指标(JSON)"),
+        sa.Column("links", JSON, comment="外部链接(JSON)"),
+        sa.Column("profile", JSON, comment="个人信息(JSON)"),
+        sa.Column("tags", JSON, comment="研究标签(JSON)"),
+        sa.Column("tags_score", JSON, comment="标签分数(JSON)"),
+        sa.Column("tags_zh", JSON, comment="中文标签(JSON)"),
+        sa.Column("num_followed", sa.Integer(), comment="被关注数"),
+        sa.Column("num_upvoted", sa.Integer(), comment="被点赞数"),
+        sa.Column("num_viewed", sa.Integer(), comment="浏览数"),
+        sa.Column("gender", sa.String(16), comment="性别"),
+        sa.Column("homepage", sa.String(256), comment="主页"),
+        sa.Column("position", sa.String(128), comment="职称"),
+        sa.Column("position_zh", sa.String(128), comment="职称中文"),
+        sa.Column("work", sa.Text(), comment="工作经历"),
+        sa.Column("work_zh", sa.Text(), comment="工作经历中文"),
+        sa.Column("note", sa.Text(), comment="备注"),
+        *_timestamps(),
+    )
+    op.create_index("ix_scholars_aminer_id", "scholars", ["aminer_id"], unique=True)
+
+    op.create_table(
+        "papers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("aminer_id", sa.String(64), nullable=False, comment="AMiner论文ID"),
+        sa.Column("scholar_id", sa.Integer(), sa.ForeignKey("scholars.id"), nullable=False),
+        sa.Column("title", sa.String(512), nullable=False),
+        sa.Column("abstract", sa.Text()),
+        sa.Column("authors", JSON, comment="作者(JSON)"),
+        sa.Column("year", sa.Integer()),
+        sa.Column("lang", sa.String(16)),
+        sa.Column("num_citation", sa.Integer()),
+        sa.Column("pdf", sa.String(512)),
+        sa.Column("urls", JSON, comment="相关链接(JSON)"),
+        sa.Column("versions", JSON, comment="版本信息(JSON)"),
+        sa.Column("create_time", sa.String(32)),
+        sa.Column("update_times", JSON, comment="更新时间(JSON)"),
+        *_timestamps(),
+    )
+    op.create_index("ix_papers_aminer_id", "papers", ["aminer_id"], unique=True)
+
+    op.create_table(
+        "patents",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("aminer_id", sa.String(64), nullable=False, comment="AMiner专利ID"),
+        sa.Column("scholar_id", sa.Integer(), sa.ForeignKey("scholars.id"), nullable=False),
+        sa.Column("title", JSON, comment="标题(JSON，含中英文)"),
+        sa.Column("abstract", JSON, comment="摘要(JSON，含中英文)"),
+        sa.Column("app_date", sa.String(32)),
+        sa.Column("app_num", sa.String(64)),
+        sa.Column("applicant", JSON, comment="申请人(JSON)"),
+        sa.Column("assignee", JSON, comment="专利权人(JSON)"),
+        sa.Column("country", sa.String(16)),
+        sa.Column("cpc", JSON, comment="CPC分类号(JSON)"),
+        sa.Column("inventor", JSON, comment="发明人(JSON)"),
+        sa.Column("ipc", JSON, comment="IPC分类号(JSON)"),
+        sa.Column("ipcr", JSON, comment="IPCR分类号(JSON)"),
+        sa.Column("pct", JSON, comment="PCT信息(JSON)"),
+        sa.Column("priority", JSON, comment="优先权信息(JSON)"),
+        sa.Column("pub_date", sa.String(32)),
+        sa.Column("pub_kind", sa.String(32)),
+        sa.Column("pub_num", sa.String(64)),
+        sa.Column("pub_search_id", sa.String(64)),
+        *_timestamps(),
+    )
+    op.create_index("ix_patents_aminer_id", "patents", ["aminer_id"], unique=True)
+
+    op.create_table(
+        "sync_log",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("scholar_id", sa.Integer(), sa.ForeignKey("scholars.id"), nullable=False),
+        sa.Column("action", sa.String(32), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("message", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("sync_log")
+    op.drop_table("patents")
+    op.drop_table("papers")
+    op.drop_table("scholars")
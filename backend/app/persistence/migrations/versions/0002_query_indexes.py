@@ -0,0 +1,40 @@
+"""列表筛选、排序与统计使用的索引
+
+- papers: (scholar_id, year)、num_citation、lang
+- patents: scholar_id、country、pub_date
+- scholars/papers/patents: created_at、updated_at（首页统计与最近动态）
+
+以 upgrade --concurrently 运行时在 PostgreSQL 上 CREATE INDEX CONCURRENTLY，不阻塞写入。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from backend.app.persistence.migrate import create_indexes, drop_indexes
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_papers_scholar_id_year", "papers", ["scholar_id", "year"]),
+    ("ix_papers_num_citation", "papers", ["num_citation"]),
+    ("ix_papers_lang", "papers", ["lang"]),
+    ("ix_patents_scholar_id", "patents", ["scholar_id"]),
+    ("ix_patents_country", "patents", ["country"]),
+    ("ix_patents_pub_date", "patents", ["pub_date"]),
+] + [
+    (f"ix_{table}_{column}", table, [column])
+    for table in ("scholars", "papers", "patents")
+    for column in ("created_at", "updated_at")
+]
+
+
+def upgrade():
+    create_indexes(INDEXES)
+
+
+def downgrade():
+    drop_indexes(INDEXES)
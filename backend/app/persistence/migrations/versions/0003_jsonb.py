@@ -0,0 +1,92 @@
+"""JSON 列改为 JSONB，建立作者/发明人筛选使用的 GIN 索引（仅 PostgreSQL）
+
+- scholars/papers/patents 的 json 列改为 jsonb（每张表一条 ALTER TABLE，整表重写一次，持有 ACCESS EXCLUSIVE 锁）。
+- papers/patents 中以JSON字符串形式存储的旧数据（如 authors 为 "[{\"name\": ...}]" 字符串）解析为结构化JSON，
+  否则 @> 包含查询无法匹配；不可解析的字符串（如 ""）保持为JSON字符串。
+- 创建 ix_papers_authors_gin、ix_patents_inventor_gin（jsonb_path_ops，upgrade --concurrently 时不阻塞写入），并 ANALYZE。
+
+已是 jsonb 的列（新版模型 create_all 建立的库）只转换残留的JSON字符串。其他数据库上为空操作。
+以 upgrade 0002:0003 --sql 打印将执行的语句（离线时按各列均为 json 生成）。
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+from sqlalchemy import text
+
+from backend.app.persistence.migrate import create_indexes, drop_indexes
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# 表 -> {列名: 接口层是否为JSON字符串（旧数据可能以JSON字符串形式存储）}
+JSON_COLUMNS = {
+    "scholars": dict.fromkeys(["indices", "links", "profile", "tags", "tags_score", "tags_zh"], False),
+    "papers": dict.fromkeys(["authors", "urls", "versions", "update_times"], True),
+    "patents": dict.fromkeys(["title", "abstract", "applicant", "assignee", "cpc", "inventor",
+                              "ipc", "ipcr", "pct", "priority"], True),
+}
+
+GIN_INDEXES = [
+    ("ix_papers_authors_gin", "papers", ["authors"],
+     {"postgresql_using": "gin", "postgresql_ops": {"authors": "jsonb_path_ops"}}),
+    ("ix_patents_inventor_gin", "patents", ["inventor"],
+     {"postgresql_using": "gin", "postgresql_ops": {"inventor": "jsonb_path_ops"}}),
+]
+
+# 解析失败时保留为JSON字符串；pg_temp 下的函数只在当前会话可见，会话结束后自动删除
+TRY_JSONB = """CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN to_jsonb(value);
+END
+$$"""
+
+
+def _current_types() -> dict:
+    """{(表名, 列名): information_schema 的 data_type}，离线生成SQL时按 json 处理。"""
+    if context.is_offline_mode():
+        return {(table, name): "json" for table, columns in JSON_COLUMNS.items() for name in columns}
+    rows = op.get_bind().execute(text(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name IN ('scholars', 'papers', 'patents')"
+    ))
+    return {(table, name): data_type for table, name, data_type in rows}
+
+
+def upgrade():
+    if op.get_context().dialect.name != "postgresql":
+        return
+    current = _current_types()
+    op.execute(TRY_JSONB)
+    for table, columns in JSON_COLUMNS.items():
+        alters = []
+        for name, text_column in columns.items():
+            if current.get((table, name)) == "json":
+                using = (f"CASE WHEN json_typeof({name}) = 'string' THEN pg_temp.try_jsonb({name} #>> '{{}}') "
+                         f"ELSE {name}::jsonb END") if text_column else f"{name}::jsonb"
+                alters.append(f"ALTER COLUMN {name} TYPE jsonb USING {using}")
+            elif text_column:
+                op.execute(
+                    f"UPDATE {table} SET {name} = pg_temp.try_jsonb({name} #>> '{{}}') "
+                    f"WHERE jsonb_typeof({name}) = 'string' "
+                    f"AND pg_temp.try_jsonb({name} #>> '{{}}') IS DISTINCT FROM {name}"
+                )
+        if alters:
+            op.execute(f"ALTER TABLE {table} " + ", ".join(alters))
+    create_indexes(GIN_INDEXES)
+    for table in JSON_COLUMNS:
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    if op.get_context().dialect.name != "postgresql":
+        return
+    drop_indexes(GIN_INDEXES)
+    for table, columns in JSON_COLUMNS.items():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(f"ALTER COLUMN {name} TYPE json USING {name}::json" for name in columns))
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, func, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, func, Index
 from sqlalchemy.orm import declarative_base, relationship
+from backend.app.persistence.types import JSONDocument, JSONText
 
 # SQLAlchemy基础模型
+# 表结构（含索引）的变更须同时新增迁移脚本，见 backend/app/persistence/migrate.py
 Base = declarative_base()
 
 class Scholar(Base):
@@ -38,12 +40,12 @@ class Scholar(Base):
     name_zh = Column(String(128), comment="中文名")
     avatar = Column(String(512), comment="头像链接")
     nation = Column(String(64), comment="国家")
-    indices = Column(JSON, comment="学者指标(JSON)")
-    links = Column(JSON, comment="外部链接(JSON)")
-    profile = Column(JSON, comment="个人信息(JSON)")
-    tags = Column(JSON, comment="研究标签(JSON)")
-    tags_score = Column(JSON, comment="标签分数(JSON)")
-    tags_zh = Column(JSON, comment="中文标签(JSON)")
+    indices = Column(JSONDocument, comment="学者指标(JSON)")
+    links = Column(JSONDocument, comment="外部链接(JSON)")
+    profile = Column(JSONDocument, comment="个人信息(JSON)")
+    tags = Column(JSONDocument, comment="研究标签(JSON)")
+    tags_score = Column(JSONDocument, comment="标签分数(JSON)")
+    tags_zh = Column(JSONDocument, comment="中文标签(JSON)")
     num_followed = Column(Integer, comment="被关注数")
     num_upvoted = Column(Integer, comment="被点赞数")
     num_viewed = Column(Integer, comment="浏览数")
@@ -54,8 +56,8 @@ class Scholar(Base):
     work = Column(Text, comment="工作经历")
     work_zh = Column(Text, comment="工作经历中文")
     note = Column(Text, comment="备注")
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     papers = relationship('Paper', back_populates='scholar', cascade="all, delete-orphan")
     patents = relationship('Patent', back_populates='scholar', cascade="all, delete-orphan")
 
@@ -84,18 +86,25 @@ class Paper(Base):
     scholar_id = Column(Integer, ForeignKey('scholars.id'), nullable=False)
     title = Column(String(512), nullable=False)
     abstract = Column(Text)
-    authors = Column(JSON, comment="作者(JSON)")
+    authors = Column(JSONText, comment="作者(JSON)")
     year = Column(Integer)
-    lang = Column(String(16))
-    num_citation = Column(Integer)
+    lang = Column(String(16), index=True)
+    num_citation = Column(Integer, index=True)
     pdf = Column(String(512))
-    urls = Column(JSON, comment="相关链接(JSON)")
-    versions = Column(JSON, comment="版本信息(JSON)")
+    urls = Column(JSONText, comment="相关链接(JSON)")
+    versions = Column(JSONText, comment="版本信息(JSON)")
     create_time = Column(String(32))
-    update_times = Column(JSON, comment="更新时间(JSON)")
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    update_times = Column(JSONText, comment="更新时间(JSON)")
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     scholar = relationship('Scholar', back_populates='papers')
+    __table_args__ = (
+        # 学者论文筛选与按年份排序
+        Index("ix_papers_scholar_id_year", "scholar_id", "year"),
+        # 作者筛选 authors @> '[{"name": ...}]' 使用的 GIN 索引（仅 PostgreSQL）
+        Index("ix_papers_authors_gin", "authors", postgresql_using="gin",
+              postgresql_ops={"authors": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+    )
 
 class Patent(Base):
     """
@@ -125,27 +134,32 @@ class Patent(Base):
     __tablename__ = 'patents'
     id = Column(Integer, primary_key=True)
     aminer_id = Column(String(64), unique=True, nullable=False, index=True, comment="AMiner专利ID")
-    scholar_id = Column(Integer, ForeignKey('scholars.id'), nullable=False)
-    title = Column(JSON, comment="标题(JSON，含中英文)")
-    abstract = Column(JSON, comment="摘要(JSON，含中英文)")
+    scholar_id = Column(Integer, ForeignKey('scholars.id'), nullable=False, index=True)
+    title = Column(JSONText, comment="标题(JSON，含中英文)")
+    abstract = Column(JSONText, comment="摘要(JSON，含中英文)")
     app_date = Column(String(32))
     app_num = Column(String(64))
-    applicant = Column(JSON, comment="申请人(JSON)")
-    assignee = Column(JSON, comment="专利权人(JSON)")
-    country = Column(String(16))
-    cpc = Column(JSON, comment="CPC分类号(JSON)")
-    inventor = Column(JSON, comment="发明人(JSON)")
-    ipc = Column(JSON, comment="IPC分类号(JSON)")
-    ipcr = Column(JSON, comment="IPCR分类号(JSON)")
-    pct = Column(JSON, comment="PCT信息(JSON)")
-    priority = Column(JSON, comment="优先权信息(JSON)")
-    pub_date = Column(String(32))
+    applicant = Column(JSONText, comment="申请人(JSON)")
+    assignee = Column(JSONText, comment="专利权人(JSON)")
+    country = Column(String(16), index=True)
+    cpc = Column(JSONText, comment="CPC分类号(JSON)")
+    inventor = Column(JSONText, comment="发明人(JSON)")
+    ipc = Column(JSONText, comment="IPC分类号(JSON)")
+    ipcr = Column(JSONText, comment="IPCR分类号(JSON)")
+    pct = Column(JSONText, comment="PCT信息(JSON)")
+    priority = Column(JSONText, comment="优先权信息(JSON)")
+    pub_date = Column(String(32), index=True)
     pub_kind = Column(String(32))
     pub_num = Column(String(64))
     pub_search_id = Column(String(64))
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     scholar = relationship('Scholar', back_populates='patents')
+    __table_args__ = (
+        # 发明人筛选 inventor @> '[{"name": ...}]' 使用的 GIN 索引（仅 PostgreSQL）
+        Index("ix_patents_inventor_gin", "inventor", postgresql_using="gin",
+              postgresql_ops={"inventor": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+    )
 
 class SyncLog(Base):
     """
@@ -0,0 +1,79 @@
+"""
+backend/app/persistence/types.py
+
+JSON 列类型与 JSON 数组包含查询。PostgreSQL 上 JSON 列使用 JSONB，以便 @> 包含查询走 GIN 索引；
+其他数据库（如测试用的 SQLite）仍为 JSON。
+
+包含的对象及简要介绍：
+- JSONDocument: 结构化JSON列（Scholar 的 indices、tags 等），PostgreSQL 上为 JSONB。
+- JSONText: 接口层为JSON字符串、库中为结构化JSON的列（Paper 的 authors、Patent 的 inventor 等，对应 PaperIn/PatentIn 的 str 字段）。
+- json_array_contains: "JSON数组中存在 key 等于 value 的对象" 的查询条件，PostgreSQL 上为 @>（可用 jsonb_path_ops GIN 索引）。
+
+注意事项：
+- JSONText 写入时将可解析的JSON字符串解析后存储，不可解析的字符串（如默认值 ""）存为JSON字符串；
+  读取时结构化值重新序列化为JSON字符串（格式可能与写入时不同，如空格与 JSONB 的键顺序），JSON字符串原样返回。
+- 已有数据库的 json 列及以JSON字符串形式存储的旧数据（不能被 json_array_contains 匹配）
+  由迁移 0003（backend/app/persistence/migrations/versions/0003_jsonb.py）在 upgrade 时转换。
+"""
+
+import json
+
+from sqlalchemy import JSON, Boolean, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+class JSONText(TypeDecorator):
+    """接口层为JSON字符串、库中为结构化JSON（PostgreSQL 上为 JSONB）的列。"""
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(JSONB() if dialect.name == "postgresql" else JSON())
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value, ensure_ascii=False)
+
+
+class json_array_contains(FunctionElement):
+    """
+    JSON数组列中存在 key 等于 value 的对象，如 json_array_contains(Paper.authors, "name", "张三")。
+    PostgreSQL: authors @> '[{"name": "张三"}]'::jsonb；其他数据库: EXISTS (... json_each ...)。
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "json_array_contains"
+
+    def __init__(self, column, key: str, value):
+        super().__init__(column, literal(json.dumps([{key: value}], ensure_ascii=False)), literal(f"$.{key}"), literal(value))
+
+
+@compiles(json_array_contains, "postgresql")
+def _json_array_contains_postgresql(element, compiler, **kw):
+    column, document, _, _ = element.clauses
+    return f"{compiler.process(column, **kw)} @> CAST({compiler.process(document, **kw)} AS JSONB)"
+
+
+@compiles(json_array_contains)
+def _json_array_contains_default(element, compiler, **kw):
+    column, _, path, value = element.clauses
+    # 非对象元素（如迁移前的JSON字符串）不参与比较，避免 json_extract 报错
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) "
+        f"WHERE CASE WHEN json_each.type = 'object' THEN json_extract(json_each.value, {compiler.process(path, **kw)}) END "
+        f"= {compiler.process(value, **kw)})"
+    )
@@ -0,0 +1,164 @@
+"""
+backend/app/persistence/upsert.py
+
+按唯一键（默认 aminer_id）批量写入的原生 upsert。
+PostgreSQL 与 SQLite 使用 INSERT ... ON CONFLICT (aminer_id) DO NOTHING / DO UPDATE ... RETURNING，
+每条语句写入多行（行数受绑定参数上限约束，1万篇论文在 PostgreSQL 上为两条语句），
+取代"先 SELECT 已存在的 aminer_id，再 add_all，提交后逐条 refresh"的做法。
+
+包含的对象及简要介绍：
+- UPSERT_MODES: 支持的写入模式。
+- on_conflict: 为 INSERT 语句加上按写入模式处理冲突的 ON CONFLICT 子句（批量导入的合并语句也使用）。
+- bulk_upsert: 批量写入行，返回被插入或被更新的行。
+
+写入模式：
+- skip: 已存在的行保持不变（ON CONFLICT DO NOTHING），只返回新插入的行。与原 /api/papers/batch 行为一致。
+- update: 已存在的行以新值覆盖，返回插入与更新的全部行。
+- update_if_changed: 只更新列值有变化的行（DO UPDATE ... WHERE 任一列 IS DISTINCT FROM 新值），
+  未变化的行不写入、不刷新 updated_at，也不返回。
+
+注意事项：
+- 更新时不修改 id、唯一键、created_at 以及 immutable 指定的列（默认 scholar_id，同 sync.py：
+  aminer_id 全局唯一，已被其他学者入库的条目不改变归属），updated_at 置为当前时间
+  （ON CONFLICT DO UPDATE 不会触发 ORM 的 onupdate）。
+- 同一批次内唯一键重复时以最后一条为准（PostgreSQL 不允许同一语句两次更新同一行）。
+- 同一批次的各行须包含相同的列（如均来自 PaperIn.model_dump()）。
+- 其他数据库回退为先查询已存在的唯一键、再逐行插入或更新，语义相同但没有批量写入的收益。
+  SQLite 的 JSON 列以文本存储，键顺序不同的同一JSON在SQL中比较不等，update_if_changed 在 SQLite 上同样回退，
+  JSON 列按解析后的值比较（PostgreSQL 的 JSONB 转为文本时已规范化，直接在SQL中比较）。
+- 不提交事务，由调用方 commit。
+"""
+
+import json
+
+from sqlalchemy import JSON, Text, cast, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.app.persistence.types import JSONText
+
+UPSERT_MODES = ("skip", "update", "update_if_changed")
+
+# 每条语句的绑定参数上限
+_MAX_PARAMS = {"postgresql": 65535, "sqlite": 32766}
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# JSON 列在SQL中按规范化文本比较的数据库，其余数据库的 update_if_changed 在 Python 中比较解析后的值
+_CANONICAL_JSON = ("postgresql",)
+
+
+def _comparable(column, type_):
+    # PostgreSQL 的 json 类型没有等值运算符，按文本比较
+    return cast(column, Text) if isinstance(type_, JSON) else column
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def on_conflict(stmt, table, columns, mode: str, key: str = "aminer_id", immutable=("scholar_id",)):
+    """
+    为 PostgreSQL/SQLite 的 INSERT 语句加上按 mode 处理冲突的 ON CONFLICT 子句。
+    参数：
+        stmt: postgresql.insert 或 sqlite.insert 语句（values 或 from_select）。
+        table: 目标表。
+        columns (list[str]): 插入的列名，更新时覆盖其中可修改的列。
+        mode / key / immutable: 同 bulk_upsert。
+    """
+    fixed = {"id", key, "created_at", "updated_at", *immutable}
+    updates = [name for name in columns if name not in fixed]
+    if mode == "skip" or not updates:
+        return stmt.on_conflict_do_nothing(index_elements=[key])
+    set_ = {name: stmt.excluded[name] for name in updates}
+    if "updated_at" in table.c:
+        set_["updated_at"] = func.now()
+    where = None
+    if mode == "update_if_changed":
+        where = or_(*(
+            _comparable(table.c[name], table.c[name].type).is_distinct_from(
+                _comparable(stmt.excluded[name], table.c[name].type))
+            for name in updates
+        ))
+    return stmt.on_conflict_do_update(index_elements=[key], set_=set_, where=where)
+
+
+def bulk_upsert(db, model, rows: list, mode: str = "skip", key: str = "aminer_id",
+                immutable=("scholar_id",), returning: bool = True) -> list:
+    """
+    按唯一键批量写入行。
+    参数：
+        db: 数据库会话。
+        model: ORM模型类（如 Paper、Patent），key 列须有唯一约束。
+        rows (list[dict]): 列值dict列表，如 [PaperIn.model_dump(), ...]。
+        mode (str): skip / update / update_if_changed，见模块说明。
+        key (str): 冲突判断的唯一列，默认 aminer_id。
+        immutable (tuple): 更新已存在的行时保持不变的列，默认 ("scholar_id",)。
+        returning (bool): 是否返回被写入的行；为 False 时返回空列表，省去 RETURNING 的结果传输。
+    返回：
+        list[dict]: 被插入或被更新的行（含 id 等全部列），按输入顺序排列。
+    异常：
+        ValueError: mode 不受支持。
+    """
+    if mode not in UPSERT_MODES:
+        raise ValueError(f"不支持的写入模式: {mode}")
+    rows = list({row[key]: row for row in rows}.values())
+    if not rows:
+        return []
+    table = model.__table__
+    columns = list(rows[0])
+    dialect = db.get_bind().dialect.name
+    if dialect not in _INSERTS or (mode == "update_if_changed" and dialect not in _CANONICAL_JSON):
+        return _fallback_upsert(db, model, rows, mode, key, immutable, returning)
+    written = []
+    for chunk in _chunks(rows, max(1, _MAX_PARAMS[dialect] // len(columns))):
+        stmt = on_conflict(_INSERTS[dialect](table).values(chunk), table, columns, mode, key, immutable)
+        if returning:
+            written.extend(dict(row) for row in db.execute(stmt.returning(*table.c)).mappings())
+        else:
+            db.execute(stmt)
+    # RETURNING 不保证行的顺序
+    order = {row[key]: i for i, row in enumerate(rows)}
+    written.sort(key=lambda row: order[row[key]])
+    return written
+
+
+def _json_value(value):
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _changed(column, old, new) -> bool:
+    """列值是否变化，JSON 列比较解析后的值（JSONText 读取时重新序列化，空格与键顺序可能不同）。"""
+    if isinstance(column.type, (JSON, JSONText)):
+        return _json_value(old) != _json_value(new)
+    return old != new
+
+
+def _fallback_upsert(db, model, rows: list, mode: str, key: str, immutable, returning: bool) -> list:
+    """不支持 ON CONFLICT 的数据库（及 SQLite 上的 update_if_changed）：查询已存在的唯一键后逐行插入或更新。"""
+    key_column = getattr(model, key)
+    columns = model.__table__.c
+    existing = {getattr(obj, key): obj for obj in db.scalars(select(model).where(key_column.in_([row[key] for row in rows])))}
+    written = []
+    for row in rows:
+        obj = existing.get(row[key])
+        if obj is None:
+            obj = model(**row)
+            db.add(obj)
+        elif mode == "skip":
+            continue
+        else:
+            changes = {name: value for name, value in row.items()
+                       if name not in (key, *immutable) and _changed(columns[name], getattr(obj, name), value)}
+            if mode == "update_if_changed" and not changes:
+                continue
+            for name, value in changes.items():
+                setattr(obj, name, value)
+        written.append(obj)
+    db.flush()
+    if not returning:
+        return []
+    return [{column.name: getattr(obj, column.key) for column in model.__table__.c} for obj in written]
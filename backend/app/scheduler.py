@@ -0,0 +1,349 @@
+"""
+backend/app/scheduler.py
+
+按数据陈旧程度自动刷新监测学者的后台调度器，无需人工点击刷新。
+每个周期从数据库计算各学者的到期时间：上次成功同步（SyncLog）时间，从未同步时为学者的 updated_at，
+加上刷新间隔（近两年论文/专利较多的活跃学者使用更短的间隔）；同步失败后按指数退避重试。
+到期学者按逾期时长（相同时按活跃度）排序，在每小时AMiner请求预算内调用 backend/app/sync.py 并发同步。
+
+包含的对象及简要介绍：
+- RequestBudget: 每小时请求预算（令牌桶，按小时平滑恢复）。
+- estimate_requests: 根据同步结果估算一次同步发出的AMiner请求数。
+- load_states: 从数据库读取各学者的同步状态（上次成功时间、连续失败次数、活跃度、预计请求数）。
+- RefreshScheduler: 调度器，run_once 执行一个周期，start/stop 在当前事件循环中后台运行，metrics 返回队列深度与延迟。
+- main: 独立 worker 入口，python -m backend.app.scheduler。
+
+环境变量：
+- SCHEDULER_ENABLED: 设为 1 时后端进程启动时在进程内运行调度器，默认不启动（可改用独立 worker）。
+- SCHEDULER_BUDGET_PER_HOUR: 每小时允许调度器发出的AMiner请求数，默认600。
+- SCHEDULER_TICK: 调度周期秒数，默认60。
+- SCHEDULER_INTERVAL / SCHEDULER_ACTIVE_INTERVAL: 普通/活跃学者的刷新间隔秒数，默认86400 / 21600。
+- SCHEDULER_ACTIVE_THRESHOLD: 近两年论文与专利合计达到该数量视为活跃学者，默认5。
+- SCHEDULER_RETRY_BASE / SCHEDULER_RETRY_MAX: 同步失败后首次重试的等待秒数与退避上限，默认300 / 21600。
+- SCHEDULER_BATCH: 每个周期最多同步的学者数，默认20。
+
+注意事项：
+- 时间均取自数据库（SyncLog.created_at 等由数据库 now() 写入），避免应用与数据库时区不一致。
+- 进程内调度器与独立 worker 的预算各自计算，同一部署只应启用其中一个。
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, or_, select
+
+import backend.app.sync as scholar_sync
+from backend.app.persistence.models import Paper, Patent, Scholar, SyncLog
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "0") == "1"
+BUDGET_PER_HOUR = int(os.getenv("SCHEDULER_BUDGET_PER_HOUR", "600"))
+TICK = float(os.getenv("SCHEDULER_TICK", "60"))
+INTERVAL = float(os.getenv("SCHEDULER_INTERVAL", "86400"))
+ACTIVE_INTERVAL = float(os.getenv("SCHEDULER_ACTIVE_INTERVAL", "21600"))
+ACTIVE_THRESHOLD = int(os.getenv("SCHEDULER_ACTIVE_THRESHOLD", "5"))
+RETRY_BASE = float(os.getenv("SCHEDULER_RETRY_BASE", "300"))
+RETRY_MAX = float(os.getenv("SCHEDULER_RETRY_MAX", "21600"))
+BATCH = int(os.getenv("SCHEDULER_BATCH", "20"))
+# 从未成功同步的学者无法估算请求数时使用的默认值
+DEFAULT_COST = 20
+
+
+class RequestBudget:
+    """
+    每小时请求预算：容量为 per_hour 的令牌桶，以每秒 per_hour/3600 的速率恢复。
+    与 aminer.ratelimit.TokenBucket 不同，调度器需要先查看余量再一次扣减多个令牌。
+    """
+
+    def __init__(self, per_hour: int, clock=time.monotonic):
+        self.per_hour = per_hour
+        self._clock = clock
+        self._tokens = float(per_hour)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def available(self) -> float:
+        """当前可用的请求数。"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.per_hour, self._tokens + (now - self._updated_at) * self.per_hour / 3600)
+            self._updated_at = now
+            return self._tokens
+
+    def spend(self, requests: float):
+        """扣减请求数（可为负数以退回多扣的部分），余量可以暂时为负。"""
+        self.available()
+        with self._lock:
+            self._tokens = min(self.per_hour, self._tokens - requests)
+
+
+def estimate_requests(result: dict) -> int:
+    """
+    根据 sync.sync_scholar 的返回结果（或 SyncLog.message 中的同一内容）估算发出的AMiner请求数：
+    学者详情1次，论文/专利各为轻量列表页数加详情页数。
+    """
+    requests = 1 if result.get("detail") is not None else 0
+    for kind in ("papers", "patents"):
+        stats = result.get(kind)
+        if stats:
+            requests += max(1, math.ceil(stats.get("listed", 0) / scholar_sync.LIST_PAGE_SIZE)) + stats.get("detail_pages", 0)
+    return requests
+
+
+def load_states(db, now: datetime) -> list:
+    """
+    读取全部学者的同步状态。
+    返回：
+        list[dict]: 每个学者一项：
+            {
+                "scholar_id": int,
+                "last_success": datetime,  # 上次成功同步时间，从未成功时为None
+                "reference": datetime,     # 计算到期时间的起点：last_success，从未成功时为学者的 updated_at
+                "failures": int,           # 上次成功之后的连续失败次数
+                "last_failure": datetime,  # 最近一次失败时间
+                "activity": int,           # 近两年（今年与去年）的论文与专利数
+                "cost": int                # 预计请求数（取自上次成功同步的统计）
+            }
+    """
+    last_success = (
+        select(SyncLog.scholar_id, func.max(SyncLog.created_at).label("at"))
+        .where(SyncLog.status == "success")
+        .group_by(SyncLog.scholar_id)
+        .subquery()
+    )
+    states = {
+        row.id: {
+            "scholar_id": row.id, "last_success": row.at, "reference": row.at or row.updated_at or row.created_at,
+            "failures": 0, "last_failure": None, "activity": 0, "cost": DEFAULT_COST,
+        }
+        for row in db.execute(
+            select(Scholar.id, Scholar.updated_at, Scholar.created_at, last_success.c.at)
+            .outerjoin(last_success, last_success.c.scholar_id == Scholar.id)
+        )
+    }
+    failures = db.execute(
+        select(SyncLog.scholar_id, func.count(), func.max(SyncLog.created_at))
+        .outerjoin(last_success, last_success.c.scholar_id == SyncLog.scholar_id)
+        .where(SyncLog.status == "fail", or_(last_success.c.at.is_(None), SyncLog.created_at > last_success.c.at))
+        .group_by(SyncLog.scholar_id)
+    )
+    for scholar_id, count, at in failures:
+        if scholar_id in states:
+            states[scholar_id].update(failures=count, last_failure=at)
+    messages = db.execute(
+        select(SyncLog.scholar_id, SyncLog.message)
+        .join(last_success, and_(last_success.c.scholar_id == SyncLog.scholar_id, last_success.c.at == SyncLog.created_at))
+        .where(SyncLog.status == "success")
+    )
+    for scholar_id, message in messages:
+        try:
+            states[scholar_id]["cost"] = estimate_requests(json.loads(message))
+        except (KeyError, ValueError, TypeError, AttributeError):
+            pass
+    since = now.year - 1
+    recent = [
+        select(Paper.scholar_id, func.count()).where(Paper.year >= since).group_by(Paper.scholar_id),
+        select(Patent.scholar_id, func.count()).where(Patent.pub_date >= str(since)).group_by(Patent.scholar_id),
+    ]
+    for query in recent:
+        for scholar_id, count in db.execute(query):
+            if scholar_id in states:
+                states[scholar_id]["activity"] += count
+    return list(states.values())
+
+
+class RefreshScheduler:
+    """
+    陈旧度驱动的刷新调度器。
+    参数：
+        session_factory: 返回数据库会话的工厂（如 sessionmaker）。
+        budget_per_hour (int): 每小时AMiner请求预算。
+        interval / active_interval (float): 普通/活跃学者的刷新间隔秒数。
+        active_threshold (int): 近两年成果数达到该值视为活跃学者。
+        retry_base / retry_max (float): 失败重试的首次等待秒数与退避上限（每次失败翻倍）。
+        batch (int): 每个周期最多同步的学者数。
+        concurrency (int): 同时同步的学者数。
+        tick (float): run_forever 的周期秒数。
+    """
+
+    def __init__(self, session_factory, budget_per_hour: int = BUDGET_PER_HOUR, interval: float = INTERVAL,
+                 active_interval: float = ACTIVE_INTERVAL, active_threshold: int = ACTIVE_THRESHOLD,
+                 retry_base: float = RETRY_BASE, retry_max: float = RETRY_MAX, batch: int = BATCH,
+                 concurrency: int = scholar_sync.SYNC_CONCURRENCY, tick: float = TICK):
+        self.session_factory = session_factory
+        self.budget = RequestBudget(budget_per_hour)
+        self.interval = interval
+        self.active_interval = active_interval
+        self.active_threshold = active_threshold
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.batch = batch
+        self.concurrency = concurrency
+        self.tick = tick
+        self._task = None
+        self._counters = {"runs": 0, "synced": 0, "failed": 0, "requests": 0, "last_run_at": None}
+
+    def due_at(self, state: dict) -> datetime:
+        """学者的下次刷新时间：失败后按退避时间重试，否则为 reference 加刷新间隔。"""
+        if state["failures"] and state["last_failure"] is not None:
+            backoff = min(self.retry_base * 2 ** (state["failures"] - 1), self.retry_max)
+            return state["last_failure"] + timedelta(seconds=backoff)
+        if state["reference"] is None:
+            return datetime.min
+        active = state["activity"] >= self.active_threshold
+        return state["reference"] + timedelta(seconds=self.active_interval if active else self.interval)
+
+    def queue(self, db=None, now: datetime = None) -> tuple:
+        """
+        计算到期队列。
+        参数：
+            db: 数据库会话，默认新建。
+            now (datetime): 当前时间，默认取数据库 now()。
+        返回：
+            (list[dict], datetime): (按逾期时长倒序、相同时按活跃度倒序排列的到期学者，每项在状态上增加 lag 秒数；数据库当前时间)。
+        """
+        close = db is None
+        db = db or self.session_factory()
+        try:
+            if now is None:
+                now = db.execute(select(func.now())).scalar()
+            # PostgreSQL 的 now() 为 timestamptz，按会话时区返回带时区的时间；DateTime 列为不带时区的会话时区时间，
+            # 去掉时区（保留会话时区的钟面时间）后再比较
+            if now.tzinfo is not None:
+                now = now.replace(tzinfo=None)
+            due = []
+            for state in load_states(db, now):
+                at = self.due_at(state)
+                if at <= now:
+                    state["lag"] = (now - at).total_seconds() if at > datetime.min else None
+                    due.append(state)
+        finally:
+            if close:
+                db.close()
+        # 从未有时间戳的学者（lag 为None）排在最前
+        due.sort(key=lambda s: (s["lag"] is not None, -(s["lag"] or 0), -s["activity"]))
+        return due, now
+
+    def select_batch(self, queue: list) -> list:
+        """按队列顺序在预算内选择本周期同步的学者，预算不足时停止（不跳过队首去选更便宜的学者）。"""
+        selected = []
+        available = self.budget.available()
+        for state in queue[:self.batch]:
+            # 预计请求数超过整个预算时，等预算恢复满再执行，避免永远排不上
+            cost = min(state["cost"], self.budget.per_hour)
+            if cost > available:
+                break
+            available -= cost
+            selected.append(state)
+        return selected
+
+    async def run_once(self) -> list:
+        """
+        执行一个调度周期：计算到期队列，在预算内并发同步。
+        返回：
+            list[dict]: 本周期的同步结果，结构见 sync.sync_scholars。
+        """
+        queue, _ = await asyncio.to_thread(self.queue)
+        selected = self.select_batch(queue)
+        if not selected:
+            return []
+        estimated = sum(state["cost"] for state in selected)
+        self.budget.spend(estimated)
+        results = await scholar_sync.sync_scholars(
+            self.session_factory, [state["scholar_id"] for state in selected], concurrency=self.concurrency)
+        # 按实际请求数修正预算；失败的同步按预计值计
+        costs = {state["scholar_id"]: state["cost"] for state in selected}
+        actual = sum(estimate_requests(r) if r["status"] == "success" else costs[r["scholar_id"]] for r in results)
+        self.budget.spend(actual - estimated)
+        self._counters["runs"] += 1
+        self._counters["synced"] += sum(1 for r in results if r["status"] == "success")
+        self._counters["failed"] += sum(1 for r in results if r["status"] != "success")
+        self._counters["requests"] += actual
+        self._counters["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        return results
+
+    async def run_forever(self):
+        """每 tick 秒执行一个周期，单个周期出错时记录日志后继续。"""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("调度周期执行失败")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        """在当前事件循环中后台运行调度器。"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        """
+        返回调度器指标：
+            {
+                "running": bool,            # 本进程内调度器是否在运行
+                "queue_depth": int,         # 当前到期待刷新的学者数
+                "max_lag": float,           # 最大逾期秒数（从未同步且无时间戳的学者不计入）
+                "mean_lag": float,          # 平均逾期秒数
+                "budget_available": float,  # 当前可用的请求预算
+                "budget_per_hour": int,
+                "runs": int, "synced": int, "failed": int, "requests": int,  # 本进程累计
+                "last_run_at": str          # 最近一个周期的时间（UTC）
+            }
+        """
+        queue, _ = self.queue()
+        lags = [s["lag"] for s in queue if s["lag"] is not None]
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_depth": len(queue),
+            "max_lag": max(lags) if lags else 0.0,
+            "mean_lag": sum(lags) / len(lags) if lags else 0.0,
+            "budget_available": round(self.budget.available(), 1),
+            "budget_per_hour": self.budget.per_hour,
+            **self._counters,
+        }
+
+
+def main():
+    """独立 worker：python -m backend.app.scheduler [--once]。"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.persistence.migrate import upgrade
+
+    parser = argparse.ArgumentParser(description="学者数据后台刷新 worker")
+    parser.add_argument("--once", action="store_true", help="只执行一个调度周期后退出")
+    parser.add_argument("--budget", type=int, default=BUDGET_PER_HOUR, help="每小时AMiner请求预算")
+    parser.add_argument("--tick", type=float, default=TICK, help="调度周期秒数")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("请设置DATABASE_URL环境变量")
+    engine = create_engine(database_url)
+    upgrade(engine)
+    scheduler = RefreshScheduler(sessionmaker(bind=engine), budget_per_hour=args.budget, tick=args.tick)
+    if args.once:
+        results = asyncio.run(scheduler.run_once())
+        logger.info("同步完成：%s", json.dumps(scheduler.metrics(), ensure_ascii=False))
+        return results
+    asyncio.run(scheduler.run_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+backend/app/schemas.py
+
+学者、论文、专利的输入模型，接口（main.py）与批量导入（persistence/bulk_import.py）共用；
+定义在单独的模块中，批量导入无需导入 main（创建数据库引擎、执行迁移并构建FastAPI应用）。
+
+包含的对象及简要介绍：
+- ScholarIn: 新增学者的字段与默认值。
+- PaperIn: 新增论文的字段与默认值，authors/urls 等JSON字段为JSON字符串。
+- PatentIn: 新增专利的字段与默认值，title/inventor 等JSON字段为JSON字符串。
+
+注意事项：
+- 批量导入按这些模型的字段确定列、类型与缺失字段的默认值，修改字段时导入随之变化。
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ScholarIn(BaseModel):
+    aminer_id: str
+    name: str
+    name_zh: Optional[str] = ""
+    avatar: Optional[str] = ""
+    nation: Optional[str] = ""
+    indices: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    links: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    profile: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    tags: Optional[List[str]] = Field(default_factory=list)
+    tags_score: Optional[List[int]] = Field(default_factory=list)
+    tags_zh: Optional[List[str]] = Field(default_factory=list)
+    num_followed: Optional[int] = 0
+    num_upvoted: Optional[int] = 0
+    num_viewed: Optional[int] = 0
+    gender: Optional[str] = ""
+    homepage: Optional[str] = ""
+    position: Optional[str] = ""
+    position_zh: Optional[str] = ""
+    work: Optional[str] = ""
+    work_zh: Optional[str] = ""
+    note: Optional[str] = ""
+
+
+class PaperIn(BaseModel):
+    aminer_id: str
+    scholar_id: int
+    title: str
+    abstract: str = ""
+    authors: str = ""
+    year: int = 0
+    lang: str = ""
+    num_citation: int = 0
+    pdf: str = ""
+    urls: str = ""
+    versions: str = ""
+    create_time: str = ""
+    update_times: str = ""
+
+
+class PatentIn(BaseModel):
+    aminer_id: str
+    scholar_id: int
+    title: str
+    abstract: str = ""
+    app_date: str = ""
+    app_num: str = ""
+    applicant: str = ""
+    assignee: str = ""
+    country: str = ""
+    cpc: str = ""
+    inventor: str = ""
+    ipc: str = ""
+    ipcr: str = ""
+    pct: str = ""
+    priority: str = ""
+    pub_date: str = ""
+    pub_kind: str = ""
+    pub_num: str = ""
+    pub_search_id: str = ""
@@ -0,0 +1,319 @@
+"""
+backend/app/sync.py
+
+服务端学者同步引擎：拉取AMiner学者详情、论文与专利，在一个事务中写入 Scholar/Paper/Patent，并记录 SyncLog。
+论文/专利采用两阶段拉取：
+第一阶段以 needDetails=False 拉取轻量列表（论文只含 id/title/year/num_citation，专利只含 id/title/pubDate/pubNum），
+与数据库中已有的 Paper.aminer_id / Patent.aminer_id 比对，得到新增与发生变化的条目；
+第二阶段只请求包含这些条目的详情页（needDetails=True，排序与列表相同），解码为 aminer/records.py 的记录后
+写入新增条目并更新变化的条目。
+已入库大部分成果的学者每次刷新只需下载轻量列表与少量详情页，不再重复下载摘要、versions 等大字段；
+数据也不再经由浏览器中转（前端拉取后再 POST /api/papers/batch）。
+
+包含的对象及简要介绍：
+- diff_listing: 比对轻量列表与已入库条目，返回需要拉取详情的条目位置。
+- fetch_details: 按位置请求详情页，返回拉取到的 {aminer_id: hit}。
+- sync_scholar: 同步单个学者（详情、论文、专利），写入数据库与 SyncLog，返回统计信息。
+- sync_scholars: 以并发上限同步多个学者，单个学者失败不影响其他学者。
+
+环境变量：
+- SYNC_LIST_PAGE_SIZE: 轻量列表的每页条数，默认1000。
+- SYNC_DETAIL_PAGE_SIZE: 详情页的每页条数，默认20。越小则只需少量新条目时多下载的无关条目越少，但请求数越多。
+- SYNC_DETAIL_CONCURRENCY: 单个学者同时进行的详情页请求数，默认16（与网关合并的默认批大小相同）。
+- SYNC_CONCURRENCY: sync_scholars 同时同步的学者数，默认4。
+
+注意事项：
+- 论文以 title、num_citation 判断变化，专利以 pubDate、pubNum 判断变化（轻量列表中只有这些字段可比对）。
+- 详情页与列表按相同排序分页；若 AMiner 在两次请求之间调整了顺序，找不到的条目会再请求相邻页，
+  仍找不到的计入 missing，下次同步时重试。
+- aminer_id 全局唯一，已被其他学者入库的条目视为已存在，更新时不修改其 scholar_id。
+- 同步直接请求AMiner，不经过后端的响应缓存；论文检索交由 aminer/batching.py 的共享合并器，
+  并发同步多个学者（sync_scholars、后台调度器）时，各学者的论文列表页/详情页请求合并为少量网关POST。
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+import aminer.async_api as aminer_async
+from aminer import batching
+from aminer.records import PaperHit, PatentHit
+from backend.app.persistence.models import Paper, Patent, Scholar, SyncLog
+from backend.app.persistence.upsert import bulk_upsert
+
+LIST_PAGE_SIZE = int(os.getenv("SYNC_LIST_PAGE_SIZE", "1000"))
+DETAIL_PAGE_SIZE = int(os.getenv("SYNC_DETAIL_PAGE_SIZE", "20"))
+DETAIL_CONCURRENCY = int(os.getenv("SYNC_DETAIL_CONCURRENCY", "16"))
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "4"))
+SYNC_ACTION = "refresh"
+# 按 aminer_id 查询已入库条目时每条 IN 语句的参数个数
+_ID_CHUNK = 500
+
+# (hit字段名, 列名)：轻量列表中参与变化比对的字段
+PAPER_COMPARE_FIELDS = (("title", "title"), ("num_citation", "num_citation"))
+PATENT_COMPARE_FIELDS = (("pubDate", "pub_date"), ("pubNum", "pub_num"))
+
+
+def diff_listing(listing: list, existing: dict, fields) -> tuple:
+    """
+    比对轻量列表与已入库条目。
+    参数：
+        listing (list[dict]): 轻量列表hit，按检索顺序排列。
+        existing (dict): {aminer_id: {列名: 值}}，已入库条目中参与比对的列。
+        fields (tuple): (hit字段名, 列名) 对，任一字段不同即视为变化；hit中缺少的字段不参与比对。
+    返回：
+        (dict, set): ({列表位置: aminer_id}，其中需要拉取详情的条目；发生变化的 aminer_id 集合)。
+        不在 existing 中的条目为新增。
+    """
+    wanted = {}
+    changed = set()
+    for position, hit in enumerate(listing):
+        aminer_id = hit.get("id")
+        if not aminer_id:
+            continue
+        stored = existing.get(aminer_id)
+        if stored is None:
+            wanted[position] = aminer_id
+        elif any(key in hit and (hit[key] or None) != (stored[column] or None) for key, column in fields):
+            wanted[position] = aminer_id
+            changed.add(aminer_id)
+    return wanted, changed
+
+
+async def fetch_details(fetch, wanted: dict, page_size: int, concurrency: int = DETAIL_CONCURRENCY) -> tuple:
+    """
+    只请求包含 wanted 条目的详情页（最多 concurrency 页同时进行），返回其中 wanted 条目的完整hit。
+    每页到达后立即只保留 wanted 条目，内存占用与详情页总数无关。
+    参数：
+        fetch (callable): async fetch(page) -> {"hitList": [...], "hitsTotal": int}，每页 page_size 条。
+        wanted (dict): {列表位置: aminer_id}。
+        page_size (int): 详情页每页条数。
+        concurrency (int): 同时进行的详情页请求数上限。
+    返回：
+        (dict, int): ({aminer_id: hit}, 请求的详情页数)。
+    异常：
+        任一页请求失败时取消其余请求并抛出异常。
+    """
+    ids = set(wanted.values())
+    found = {}
+    requested = set()
+
+    async def worker(pages):
+        # 各 worker 共用同一个页码迭代器，固定数量的协程依次取页
+        for page in pages:
+            result = await fetch(page)
+            for hit in result.get("hitList") or []:
+                if hit.get("id") in ids:
+                    found[hit["id"]] = hit
+
+    async def load(pages):
+        pages = sorted(set(pages) - requested)
+        requested.update(pages)
+        remaining = iter(pages)
+        tasks = [asyncio.ensure_future(worker(remaining)) for _ in range(min(concurrency, len(pages)))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    await load(position // page_size for position in wanted)
+    missing = [position for position, aminer_id in wanted.items() if aminer_id not in found]
+    if missing:
+        # 两次请求之间排序发生变化时，条目可能移动到相邻页
+        await load(page for position in missing for page in (position // page_size - 1, position // page_size + 1) if page >= 0)
+    return found, len(requested)
+
+
+def _existing_rows(db, model, aminer_ids: list, fields) -> dict:
+    """按 aminer_id 分批查询已入库条目，返回 {aminer_id: {列名: 值}}。"""
+    columns = [getattr(model, column) for _, column in fields]
+    existing = {}
+    for start in range(0, len(aminer_ids), _ID_CHUNK):
+        chunk = aminer_ids[start:start + _ID_CHUNK]
+        for row in db.query(model.aminer_id, *columns).filter(model.aminer_id.in_(chunk)):
+            existing[row[0]] = {column: value for (_, column), value in zip(fields, row[1:])}
+    return existing
+
+
+class _Kind:
+    """论文或专利的同步配置。"""
+
+    def __init__(self, model, iter_pages, search, fields, record, batched=False):
+        self.model = model
+        self.iter_pages = iter_pages
+        self.search = search
+        self.fields = fields
+        self.record = record
+        # 检索是否经由网关，可与其他学者的请求合并发送（专利检索不经由网关）
+        self.batched = batched
+
+
+PAPERS = _Kind(Paper, aminer_async.iter_paper_pages, aminer_async.search_papers_by_scholar_free, PAPER_COMPARE_FIELDS, PaperHit,
+               batched=True)
+PATENTS = _Kind(Patent, aminer_async.iter_patent_pages, aminer_async.search_patents_by_scholar_free, PATENT_COMPARE_FIELDS, PatentHit)
+
+
+def _read_existing(session_factory, model, aminer_ids: list, fields) -> dict:
+    with session_factory() as db:
+        return _existing_rows(db, model, aminer_ids, fields)
+
+
+async def _plan(session_factory, aminer_id: str, kind: _Kind, list_page_size: int, detail_page_size: int) -> dict:
+    """两阶段拉取：轻量列表 -> 比对 -> 详情页，返回待写入的记录与统计信息，不修改数据库。"""
+    options = {"batcher": batching.get_gateway_batcher()} if kind.batched else {}
+    listing = []
+    async for page in kind.iter_pages(aminer_id, page_size=list_page_size, needDetails=False, **options):
+        listing.extend(page["hitList"])
+    ids = [hit["id"] for hit in listing if hit.get("id")]
+    existing = await asyncio.to_thread(_read_existing, session_factory, kind.model, ids, kind.fields)
+    wanted, changed = diff_listing(listing, existing, kind.fields)
+
+    async def fetch(page):
+        return await kind.search(aminer_id, size=detail_page_size, needDetails=True, page=page, **options)
+
+    found, pages = await fetch_details(fetch, wanted, detail_page_size) if wanted else ({}, 0)
+    wanted_ids = set(wanted.values())
+    return {
+        "records": [kind.record.from_json(hit) for hit in found.values()],
+        "stats": {
+            "listed": len(listing),
+            "new": len(wanted_ids - changed),
+            "changed": len(changed),
+            "detail_pages": pages,
+            "fetched": len(found),
+            "missing": len(wanted_ids - found.keys()),
+        },
+    }
+
+
+def _apply(db, model, records: list, scholar_id: int):
+    """在当前事务中写入记录：已存在的 aminer_id 更新（不修改 scholar_id），其余插入。"""
+    bulk_upsert(db, model, [record.to_orm_kwargs(scholar_id) for record in records], mode="update", returning=False)
+
+
+def _write(session_factory, scholar_id: int, detail, plans: dict, result: dict):
+    """
+    单个事务写入学者详情、论文、专利与成功的 SyncLog；并发同步插入同一 aminer_id 冲突时重试一次。
+    异常：
+        LookupError: 学者在拉取期间被删除。
+    """
+    with session_factory() as db:
+        for attempt in range(2):
+            try:
+                scholar = db.get(Scholar, scholar_id)
+                if scholar is None:
+                    raise LookupError(f"学者不存在: {scholar_id}")
+                if detail is not None:
+                    for key, value in detail.to_orm_kwargs().items():
+                        if key != "aminer_id":
+                            setattr(scholar, key, value)
+                for kind, plan in plans.items():
+                    _apply(db, kind.model, plan["records"], scholar_id)
+                db.add(SyncLog(scholar_id=scholar_id, action=SYNC_ACTION, status="success", message=json.dumps(result)))
+                db.commit()
+                return
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+
+
+def _write_failure(session_factory, scholar_id: int, message: str):
+    with session_factory() as db:
+        db.add(SyncLog(scholar_id=scholar_id, action=SYNC_ACTION, status="fail", message=message))
+        db.commit()
+
+
+async def sync_scholar(session_factory, scholar_id: int, detail: bool = True, papers: bool = True, patents: bool = True,
+                       list_page_size: int = LIST_PAGE_SIZE, detail_page_size: int = DETAIL_PAGE_SIZE) -> dict:
+    """
+    同步单个学者：并发拉取学者详情、论文与专利（论文/专利为两阶段拉取），在一个事务中写入数据库，
+    并写入一条 SyncLog（action=refresh）。数据库操作在线程池中执行，不阻塞事件循环。
+    参数：
+        session_factory: 返回数据库会话的工厂（如 sessionmaker），每次数据库操作使用独立会话。
+        scholar_id (int): 本地学者ID。
+        detail / papers / patents (bool): 是否同步学者详情 / 论文 / 专利。
+        list_page_size / detail_page_size (int): 轻量列表与详情页的每页条数。
+    返回：
+        dict: {
+            "scholar_id": int,
+            "status": "success",
+            "detail": bool,        # 是否更新了学者详情（AMiner无该学者时为False）
+            "papers": dict,        # 论文统计，结构见 _plan（listed/new/changed/detail_pages/fetched/missing），未同步时为None
+            "patents": dict,       # 专利统计，同上
+            "duration": float      # 耗时（秒）
+        }
+        同一内容以JSON写入 SyncLog.message。
+    异常：
+        LookupError: 学者不存在（含拉取期间被删除）。
+        AMiner请求或写入失败时写入 status=fail 的 SyncLog（message 为错误信息）并抛出原异常，论文/专利不做修改。
+    """
+    started = time.perf_counter()
+    scholar = await asyncio.to_thread(_load_scholar, session_factory, scholar_id)
+    if scholar is None:
+        raise LookupError(f"学者不存在: {scholar_id}")
+    kinds = [kind for kind, enabled in ((PAPERS, papers), (PATENTS, patents)) if enabled]
+    try:
+        person, *plans = await asyncio.gather(
+            aminer_async.get_person_detail_by_id(scholar.aminer_id, as_records=True) if detail else _none(),
+            *(_plan(session_factory, scholar.aminer_id, kind, list_page_size, detail_page_size) for kind in kinds),
+        )
+        plans = dict(zip(kinds, plans))
+        result = {
+            "scholar_id": scholar_id,
+            "status": "success",
+            "detail": person is not None,
+            "papers": plans[PAPERS]["stats"] if PAPERS in plans else None,
+            "patents": plans[PATENTS]["stats"] if PATENTS in plans else None,
+        }
+        result["duration"] = round(time.perf_counter() - started, 3)
+        await asyncio.to_thread(_write, session_factory, scholar_id, person, plans, result)
+    except LookupError:
+        # 学者已被删除，不再为其写入 SyncLog
+        raise
+    except Exception as e:
+        await asyncio.to_thread(_write_failure, session_factory, scholar_id, f"{type(e).__name__}: {e}")
+        raise
+    return result
+
+
+async def _none():
+    return None
+
+
+def _load_scholar(session_factory, scholar_id: int):
+    with session_factory() as db:
+        scholar = db.get(Scholar, scholar_id)
+        if scholar is not None:
+            db.expunge(scholar)
+        return scholar
+
+
+async def sync_scholars(session_factory, scholar_ids, concurrency: int = SYNC_CONCURRENCY, **kwargs) -> list:
+    """
+    并发同步多个学者，同时进行的学者同步不超过 concurrency 个（AMiner 请求另受客户端的按主机限速与并发上限约束）。
+    参数：
+        scholar_ids (Iterable[int]): 本地学者ID。
+        concurrency (int): 同时同步的学者数。
+        kwargs: 传给 sync_scholar 的其余参数。
+    返回：
+        list[dict]: 按输入顺序的同步结果；成功时同 sync_scholar，
+        失败时为 {"scholar_id": int, "status": "fail", "error": str, "duration": float}。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(scholar_id):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                return await sync_scholar(session_factory, scholar_id, **kwargs)
+            except Exception as e:
+                return {"scholar_id": scholar_id, "status": "fail", "error": str(e),
+                        "duration": round(time.perf_counter() - started, 3)}
+
+    return list(await asyncio.gather(*(run(scholar_id) for scholar_id in scholar_ids)))
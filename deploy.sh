@@ -6,7 +6,12 @@
 
 git pull
 
-docker compose up -d --build
+docker compose build
+
+# 新增索引以 CONCURRENTLY 方式在上线前建好，不阻塞写入；应用启动时的升级随后为空操作
+docker compose run --rm backend python -m backend.app.persistence.migrate upgrade --concurrently
+
+docker compose up -d
 
 sudo rm -rf /www/server/nginx/proxy_cache_dir/*
 
@@ -20,7 +25,12 @@ echo "Deploy completed"#!/bin/bash
 
 git pull
 
-docker compose up -d --build
+docker compose build
+
+# 新增索引以 CONCURRENTLY 方式在上线前建好，不阻塞写入；应用启动时的升级随后为空操作
+docker compose run --rm backend python -m backend.app.persistence.migrate upgrade --concurrently
+
+docker compose up -d
 
 sudo rm -rf /www/server/nginx/proxy_cache_dir/*
 
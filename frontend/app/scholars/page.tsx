@@ -23,44 +23,6 @@ import Link from "next/link"
 import type { Scholar } from "../types/api-types"
 import { useSearchParams } from "next/navigation"
 
-// 1. 定义PaperRaw和PatentRaw类型
-
-type PaperRaw = {
-  id: string;
-  title?: string;
-  abstract?: string;
-  authors?: object[];
-  year?: number;
-  lang?: string;
-  n_citation?: number;
-  pdf?: string;
-  urls?: object[];
-  versions?: object[];
-  create_time?: string;
-  update_times?: object[];
-};
-
-type PatentRaw = {
-  id: string;
-  title?: object;
-  abstract?: object;
-  app_date?: string;
-  app_num?: string;
-  applicant?: object[];
-  assignee?: object[];
-  country?: string;
-  cpc?: object[];
-  inventor?: object[];
-  ipc?: object[];
-  ipcr?: object[];
-  pct?: object[];
-  priority?: object[];
-  pub_date?: string;
-  pub_kind?: string;
-  pub_num?: string;
-  pub_search_id?: string;
-};
-
 export default function ScholarsPage() {
   const searchParams = useSearchParams();
   const [scholars, setScholars] = useState<Scholar[]>([])
@@ -341,80 +303,13 @@ export default function ScholarsPage() {
                                         if (!scholarSaveRes.ok) throw new Error('学者保存失败')
                                         const scholarSaved = await scholarSaveRes.json()
                                         const localScholarId = scholarSaved.id
-                                        setFetchStep("拉取论文...")
-                                        // 3. 拉取论文
-                                        const papersRes = await fetch(`/api/scholars/${selectedScholar.id}/papers?size=1000`, {
-                                          headers: { Authorization: `Basic ${btoa('admin:admin')}` }
-                                        })
-                                        if (!papersRes.ok) throw new Error('论文拉取失败')
-                                        const papersData = await papersRes.json()
-                                        const papers: PaperRaw[] = papersData.hitList || papersData || []
-                                        setFetchStep(`保存论文（共${papers.length}篇）...`)
-                                        // 4. 持久化论文
-                                        if (papers.length > 0) {
-                                          const paperBodies = papers.map((p: PaperRaw) => ({
-                                            aminer_id: p.id,
-                                            scholar_id: localScholarId,
-                                            title: p.title || '',
-                                            abstract: p.abstract || '',
-                                            authors: JSON.stringify(p.authors || []),
-                                            year: p.year || 0,
-                                            lang: p.lang || '',
-                                            num_citation: p.n_citation || 0,
-                                            pdf: p.pdf || '',
-                                            urls: JSON.stringify(p.urls || []),
-                                            versions: JSON.stringify(p.versions || []),
-                                            create_time: p.create_time || '',
-                                            update_times: JSON.stringify(p.update_times || [])
-                                          }))
-                                          setFetchStep(`批量保存论文（共${paperBodies.length}篇）...`)
-                                          const res = await fetch('/api/papers/batch', {
-                                            method: 'POST',
-                                            headers: { 'Content-Type': 'application/json', Authorization: `Basic ${btoa('admin:admin')}` },
-                                            body: JSON.stringify(paperBodies)
-                                          })
-                                          if (!res.ok) throw new Error('论文批量保存失败')
-                                        }
-                                        setFetchStep("拉取专利...")
-                                        // 5. 拉取专利
-                                        const patentsRes = await fetch(`/api/scholars/${selectedScholar.id}/patents?size=1000`, {
+                                        setFetchStep("同步论文与专利...")
+                                        // 3. 由后端拉取论文与专利并入库（仅拉取新增或变化条目的详情）
+                                        const syncRes = await fetch(`/api/scholars/${localScholarId}/sync?detail=false`, {
+                                          method: 'POST',
                                           headers: { Authorization: `Basic ${btoa('admin:admin')}` }
                                         })
-                                        if (!patentsRes.ok) throw new Error('专利拉取失败')
-                                        const patentsData = await patentsRes.json()
-                                        const patents: PatentRaw[] = patentsData.hitList || patentsData || []
-                                        setFetchStep(`保存专利（共${patents.length}项）...`)
-                                        // 6. 持久化专利
-                                        if (patents.length > 0) {
-                                          const patentBodies = patents.map((pt: PatentRaw) => ({
-                                            aminer_id: pt.id,
-                                            scholar_id: localScholarId,
-                                            title: JSON.stringify(pt.title || {}),
-                                            abstract: JSON.stringify(pt.abstract || {}),
-                                            app_date: pt.app_date || '',
-                                            app_num: pt.app_num || '',
-                                            applicant: JSON.stringify(pt.applicant || []),
-                                            assignee: JSON.stringify(pt.assignee || []),
-                                            country: pt.country || '',
-                                            cpc: JSON.stringify(pt.cpc || []),
-                                            inventor: JSON.stringify(pt.inventor || []),
-                                            ipc: JSON.stringify(pt.ipc || []),
-                                            ipcr: JSON.stringify(pt.ipcr || []),
-                                            pct: JSON.stringify(pt.pct || []),
-                                            priority: JSON.stringify(pt.priority || []),
-                                            pub_date: pt.pub_date || '',
-                                            pub_kind: pt.pub_kind || '',
-                                            pub_num: pt.pub_num || '',
-                                            pub_search_id: pt.pub_search_id || ''
-                                          }))
-                                          setFetchStep(`批量保存专利（共${patentBodies.length}项）...`)
-                                          const res = await fetch('/api/patents/batch', {
-                                            method: 'POST',
-                                            headers: { 'Content-Type': 'application/json', Authorization: `Basic ${btoa('admin:admin')}` },
-                                            body: JSON.stringify(patentBodies)
-                                          })
-                                          if (!res.ok) throw new Error('专利批量保存失败')
-                                        }
+                                        if (!syncRes.ok) throw new Error('论文与专利同步失败')
                                         setFetchStep("全部完成！")
                                         setFetching(false)
                                         setFetchDone(true)
@@ -1,3 +1,14 @@
 import sys
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) 
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_aminer_state():
+    """每个测试前清空AMiner响应缓存与熔断器状态，避免用例之间互相影响。"""
+    from aminer.cache import default_cache
+    from aminer.resilience import reset_breakers
+    default_cache.clear()
+    reset_breakers()
@@ -0,0 +1,118 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app
+from backend.app import counts
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+# 测试自己的引擎未注册 track_changes，经它写入的数据不会使缓存失效
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+HEADERS = {"Authorization": basic_auth_header("admin", "admin")}
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表与计数缓存，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+    counts.clear_count_cache()
+
+@pytest.fixture
+def scholar_id():
+    session = Session()
+    scholar = Scholar(aminer_id="C1", name="C")
+    session.add(scholar)
+    session.flush()
+    session.add_all([Paper(aminer_id=f"c{i}", scholar_id=scholar.id, title="t", year=2020 + i % 2) for i in range(6)])
+    session.commit()
+    scholar_id = scholar.id
+    session.close()
+    return scholar_id
+
+def total(params):
+    resp = client.get("/api/papers/list", params=dict(params, size=1), headers=HEADERS)
+    assert resp.status_code == 200
+    return resp.json()["total"]
+
+def app_session():
+    from backend.app.main import SessionLocal
+    return SessionLocal.session_factory()
+
+def test_count_modes(scholar_id):
+    """
+    测试 count 参数：exact 与原行为一致，none 不计数，estimated 在非 PostgreSQL 上退化为精确计数。
+    """
+    assert total({}) == total({"count": "exact"}) == 6
+    assert total({"count": "none"}) is None
+    assert total({"count": "estimated", "year": 2020}) == 3
+    resp = client.get("/api/scholars/list", params={"count": "none"}, headers=HEADERS)
+    assert resp.json()["total"] is None and len(resp.json()["data"]) == 1
+    assert client.get("/api/papers/list", params={"count": "approx"}, headers=HEADERS).status_code == 422
+
+def test_cached_count_invalidated_on_commit(scholar_id):
+    """
+    测试缓存计数按筛选条件区分，经后端提交写入后失效，回滚的写入不影响缓存。
+    """
+    assert total({"count": "cached"}) == 6
+    assert total({"count": "cached", "year": 2021}) == 3
+    # 未经后端引擎的写入：缓存不变
+    session = Session()
+    session.add(Paper(aminer_id="c-untracked", scholar_id=scholar_id, title="t", year=2021))
+    session.commit()
+    session.close()
+    assert total({"count": "cached"}) == 6
+    assert total({"count": "exact"}) == 7
+    # 回滚的写入不使缓存失效
+    db = app_session()
+    db.add(Paper(aminer_id="c-rollback", scholar_id=scholar_id, title="t"))
+    db.flush()
+    db.rollback()
+    db.close()
+    assert total({"count": "cached", "year": 2021}) == 3
+    # 经后端写入后失效
+    resp = client.post("/api/papers", json={"aminer_id": "c-new", "scholar_id": scholar_id, "title": "t", "year": 2021},
+                       headers=HEADERS)
+    assert resp.status_code == 201
+    assert total({"count": "cached"}) == 8
+    assert total({"count": "cached", "year": 2021}) == 5
+
+def test_cached_count_ttl(scholar_id, monkeypatch):
+    """
+    测试缓存计数超过 COUNT_CACHE_TTL 后重新计数（覆盖无法感知的其他进程写入）。
+    """
+    monkeypatch.setattr(counts, "COUNT_CACHE_TTL", 0)
+    assert total({"count": "cached"}) == 6
+    session = Session()
+    session.add(Paper(aminer_id="c-other", scholar_id=scholar_id, title="t"))
+    session.commit()
+    session.close()
+    assert total({"count": "cached"}) == 7
+
+def test_explain_statement_compiles_for_postgresql():
+    """
+    测试估计计数使用的 EXPLAIN 语句在 PostgreSQL 方言下的编译结果。
+    """
+    statement = select(Paper.id).where(Paper.year == 2020)
+    sql = str(counts._Explain(statement).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT papers.id")
+    assert "papers.year = %(year_1)s" in sql
@@ -0,0 +1,109 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys, os, json, gzip, csv, io, codecs
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app, paper_to_dict
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from backend.app.export import export_rows
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+HEADERS = {"Authorization": basic_auth_header("admin", "admin")}
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def dataset():
+    session = Session()
+    scholar = Scholar(aminer_id="E1", name="E")
+    session.add(scholar)
+    session.flush()
+    for i in range(250):
+        session.add(Paper(aminer_id=f"e{i}", scholar_id=scholar.id, title=f"论文,{i}", year=2020 + i % 2,
+                          lang="zh" if i % 5 == 0 else "en", num_citation=i, authors=json.dumps([{"name": "A"}])))
+    for i in range(3):
+        session.add(Patent(aminer_id=f"ep{i}", scholar_id=scholar.id, title=json.dumps({"zh": ["专利"]}),
+                           country="CN" if i else "US", pub_date="2021-01-01"))
+    session.commit()
+    scholar_id = scholar.id
+    session.close()
+    return scholar_id
+
+def test_export_papers_ndjson_matches_list(dataset):
+    """
+    测试论文NDJSON导出：行内容与 /api/papers/list 的 data 一致，筛选参数相同。
+    """
+    resp = client.get("/api/export/papers", params={"year": 2020, "min_citation": 10}, headers=HEADERS)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="papers.ndjson"' in resp.headers["content-disposition"]
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    listed = client.get("/api/papers/list", params={"year": 2020, "min_citation": 10, "size": 100}, headers=HEADERS).json()
+    assert len(rows) == listed["total"] == 120
+    assert rows[:100] == listed["data"]
+    assert client.get("/api/export/papers").status_code in (401, 403)
+    assert client.get("/api/export/papers", params={"format": "xml"}, headers=HEADERS).status_code == 422
+
+def test_export_csv_gzip(dataset):
+    """
+    测试CSV导出与gzip压缩：表头为输出字段，列表字段为JSON文本，含逗号的值正确转义。
+    """
+    resp = client.get("/api/export/papers", params={"format": "csv", "gzip": True, "lang": "zh"}, headers=HEADERS)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert 'filename="papers.csv.gz"' in resp.headers["content-disposition"]
+    text = gzip.decompress(resp.content).decode("utf-8-sig")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert len(rows) == 50
+    assert rows[0]["title"] == "论文,0" and rows[0]["lang"] == "zh"
+    assert json.loads(rows[0]["authors"]) == [{"name": "A"}]
+    resp = client.get("/api/export/patents", params={"format": "csv", "country": "CN"}, headers=HEADERS)
+    rows = list(csv.DictReader(io.StringIO(resp.content.decode("utf-8-sig"))))
+    assert [row["aminer_id"] for row in rows] == ["ep1", "ep2"] and rows[0]["pubDate"] == "2021-01-01"
+
+def test_export_rows_streams_in_batches(dataset):
+    """
+    测试 export_rows 按批次产生输出块，而不是一次性读取全部结果。
+    """
+    statement = select(*Paper.__table__.c).order_by(Paper.id)
+    chunks = list(export_rows(Session, statement, paper_to_dict, "ndjson", batch_size=100))
+    assert len(chunks) == 3
+    assert sum(chunk.count(b"\n") for chunk in chunks) == 250
+    compressed = list(export_rows(Session, statement, paper_to_dict, "ndjson", compress=True, batch_size=100))
+    assert gzip.decompress(b"".join(compressed)) == b"".join(chunks)
+
+def test_export_csv_empty_has_header(dataset):
+    """
+    测试没有匹配行时CSV导出仍包含BOM与表头（列同 /api/papers/list 的 data 元素），gzip 压缩时同样如此。
+    """
+    resp = client.get("/api/export/papers", params={"format": "csv", "year": 1900}, headers=HEADERS)
+    assert resp.status_code == 200
+    assert resp.content.startswith(codecs.BOM_UTF8)
+    lines = resp.content.decode("utf-8-sig").splitlines()
+    assert len(lines) == 1
+    assert lines[0].split(",") == list(client.get("/api/papers/list", headers=HEADERS).json()["data"][0])
+    resp = client.get("/api/export/patents", params={"format": "csv", "gzip": True, "country": "JP"}, headers=HEADERS)
+    lines = gzip.decompress(resp.content).decode("utf-8-sig").splitlines()
+    assert len(lines) == 1 and "pubDate" in lines[0].split(",")
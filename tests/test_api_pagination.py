@@ -0,0 +1,135 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+HEADERS = {"Authorization": basic_auth_header("admin", "admin")}
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def papers():
+    """23篇论文，年份有重复且含 NULL。"""
+    session = Session()
+    scholars = [Scholar(aminer_id=f"K{i}", name=f"K{i}") for i in range(12)]
+    session.add_all(scholars)
+    session.flush()
+    for i in range(23):
+        session.add(Paper(aminer_id=f"k{i}", scholar_id=scholars[0].id, title=f"t{i}",
+                          year=None if i % 7 == 0 else 2015 + i % 4, num_citation=i))
+    session.commit()
+    session.close()
+
+def walk(url, params, size):
+    """按游标翻完全部页，返回 (所有行的 aminer_id, 页数)。"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, size=size, **({"cursor": cursor} if cursor else {}))
+        resp = client.get(url, params=query, headers=HEADERS)
+        assert resp.status_code == 200
+        body = resp.json()
+        ids += [row["aminer_id"] for row in body["data"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+def test_cursor_walk_matches_sorted_order(papers):
+    """
+    测试按排序键加ID的游标分页：翻完全部页的顺序与完整排序一致，排序值相同与 NULL 的行不重不漏。
+    """
+    session = Session()
+    rows = session.query(Paper).all()
+    session.close()
+    expected = [p.aminer_id for p in sorted(rows, key=lambda p: (p.year is None, -(p.year or 0), -p.id))]
+    ids, pages = walk("/api/papers/list", {"sort": "-year"}, 5)
+    assert ids == expected and pages == 5
+    ids, _ = walk("/api/papers/list", {"sort": "year"}, 4)
+    assert ids == [p.aminer_id for p in sorted(rows, key=lambda p: (p.year is None, p.year or 0, p.id))]
+    ids, _ = walk("/api/papers/list", {"min_citation": 10}, 3)
+    assert ids == [f"k{i}" for i in range(10, 23)]
+
+def test_offset_mode_compatible(papers):
+    """
+    测试 offset 分页仍可用，且返回的 next_cursor 可继续以游标翻页。
+    """
+    first = client.get("/api/papers/list", params={"size": 10, "offset": 10}, headers=HEADERS).json()
+    assert first["total"] == 23
+    assert [row["aminer_id"] for row in first["data"]] == [f"k{i}" for i in range(10, 20)]
+    rest = client.get("/api/papers/list", params={"size": 10, "cursor": first["next_cursor"]}, headers=HEADERS).json()
+    assert [row["aminer_id"] for row in rest["data"]] == ["k20", "k21", "k22"]
+    assert rest["next_cursor"] is None
+
+def test_invalid_cursor(papers):
+    """
+    测试无效游标、排序方式不一致的游标以及与 offset 同时使用时返回400。
+    """
+    cursor = client.get("/api/papers/list", params={"size": 5, "sort": "year"}, headers=HEADERS).json()["next_cursor"]
+    assert client.get("/api/papers/list", params={"cursor": cursor, "sort": "-year"}, headers=HEADERS).status_code == 400
+    assert client.get("/api/papers/list", params={"cursor": "bm90LWpzb24"}, headers=HEADERS).status_code == 400
+    assert client.get("/api/papers/list", params={"cursor": "%%%"}, headers=HEADERS).status_code == 400
+    assert client.get("/api/papers/list", params={"cursor": cursor, "offset": 5, "sort": "year"}, headers=HEADERS).status_code == 400
+    assert client.get("/api/papers/list", params={"sort": "title"}, headers=HEADERS).status_code == 422
+
+def test_crafted_cursor_rejected(papers):
+    """
+    测试游标键长度或值类型与排序方式不一致的伪造游标返回400，而不是进入SQL。
+    """
+    from backend.app.pagination import encode_cursor
+    bad = {
+        "year": [[{"a": 1}, 5], [[2015], 5], [2015], [2015, 5, 6], [True, 5], ["2015", 5], [2015, "5"],
+                 [2015, None], [2015.5, 5], [2015, 5.0]],
+        "id": [[], [None], [{"a": 1}], [5, 6], [False]],
+        "-pub_date": [[5, 1], [["2020"], 1], ["2020-01-01"]],
+    }
+    for sort, keys in bad.items():
+        url = "/api/patents/list" if "pub_date" in sort else "/api/papers/list"
+        for key in keys:
+            params = {"cursor": encode_cursor(sort, key), "sort": sort}
+            assert client.get(url, params=params, headers=HEADERS).status_code == 400, (sort, key)
+    for sort, key in (("year", [2015, 5]), ("year", [None, 5]), ("id", [5])):
+        params = {"cursor": encode_cursor(sort, key), "sort": sort}
+        assert client.get("/api/papers/list", params=params, headers=HEADERS).status_code == 200
+    params = {"cursor": encode_cursor("-pub_date", ["2020-01-01", 1]), "sort": "-pub_date"}
+    assert client.get("/api/patents/list", params=params, headers=HEADERS).status_code == 200
+
+def test_scholars_and_patents_cursor(papers):
+    """
+    测试学者（按ID倒序）与专利列表的游标分页。
+    """
+    ids, pages = walk("/api/scholars/list", {}, 5)
+    assert ids == [f"K{i}" for i in reversed(range(12))] and pages == 3
+    session = Session()
+    scholar_id = session.query(Scholar).first().id
+    session.add_all([Patent(aminer_id=f"kp{i}", scholar_id=scholar_id, title="{}", pub_date=f"2020-0{i % 3 + 1}-01")
+                     for i in range(7)])
+    session.commit()
+    session.close()
+    ids, _ = walk("/api/patents/list", {"sort": "-pub_date"}, 2)
+    assert ids == ["kp5", "kp2", "kp4", "kp1", "kp6", "kp3", "kp0"]
@@ -709,4 +709,81 @@ def test_batch_create_patents():
     assert resp.status_code == 409
     # 未认证
     resp = client.post("/api/patents/batch", json=patents)
-    assert resp.status_code in (401, 403) 
\ No newline at end of file
+    assert resp.status_code in (401, 403) 
+
+def test_batch_upsert_modes():
+    """
+    测试 /api/papers/batch 的 mode 参数：skip 只返回新插入的，update 覆盖已存在的，
+    update_if_changed 只更新有变化的；更新不修改 scholar_id，批次内重复以最后一条为准。
+    """
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    scholar_id = client.post("/api/scholars", json={"aminer_id": "U1", "name": "U"}, headers=headers).json()["id"]
+    other_id = client.post("/api/scholars", json={"aminer_id": "U2", "name": "V"}, headers=headers).json()["id"]
+    papers = [{"aminer_id": f"up{i}", "scholar_id": scholar_id, "title": f"t{i}", "authors": json.dumps([{"name": "A"}])}
+              for i in range(3)]
+    resp = client.post("/api/papers/batch", json=papers, headers=headers)
+    assert resp.status_code == 201
+    assert [p["aminer_id"] for p in resp.json()] == ["up0", "up1", "up2"]
+    # 默认 skip：已存在的跳过
+    resp = client.post("/api/papers/batch", json=papers + [dict(papers[0], aminer_id="up3")], headers=headers)
+    assert [p["aminer_id"] for p in resp.json()] == ["up3"]
+    # update_if_changed：只有 up1 有变化（含JSON列）
+    changed = [dict(papers[0]), dict(papers[1], authors=json.dumps([{"name": "B"}]), scholar_id=other_id)]
+    resp = client.post("/api/papers/batch?mode=update_if_changed", json=changed, headers=headers)
+    assert [p["aminer_id"] for p in resp.json()] == ["up1"]
+    assert json.loads(resp.json()[0]["authors"]) == [{"name": "B"}]
+    assert resp.json()[0]["scholar_id"] == scholar_id
+    # update：全部覆盖，批次内重复以最后一条为准
+    resp = client.post("/api/papers/batch?mode=update",
+                       json=[dict(papers[0], title="x"), dict(papers[0], title="y"), papers[2]], headers=headers)
+    assert [(p["aminer_id"], p["title"]) for p in resp.json()] == [("up0", "y"), ("up2", "t2")]
+    session = Session()
+    assert session.query(Paper).filter(Paper.scholar_id == scholar_id).count() == 4
+    session.close()
+    assert client.post("/api/papers/batch?mode=replace", json=papers, headers=headers).status_code == 422
+
+
+def test_update_if_changed_ignores_json_formatting():
+    """
+    测试 update_if_changed 按解析后的值比较JSON列：空格与键顺序不同的相同JSON不算变化，内容变化才更新。
+    """
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    scholar_id = client.post("/api/scholars", json={"aminer_id": "J1", "name": "J"}, headers=headers).json()["id"]
+    paper = {"aminer_id": "jp0", "scholar_id": scholar_id, "title": "t",
+             "authors": '[{"name": "A", "org": "O"}]', "update_times": '{"b": 1, "a": 2}'}
+    assert client.post("/api/papers/batch", json=[paper], headers=headers).status_code == 201
+    same = dict(paper, authors='[{"org":"O","name":"A"}]', update_times='{"a":2,"b":1}')
+    resp = client.post("/api/papers/batch?mode=update_if_changed", json=[same], headers=headers)
+    assert resp.json() == []
+    resp = client.post("/api/papers/batch?mode=update_if_changed",
+                       json=[dict(same, authors='[{"org":"O","name":"B"}]')], headers=headers)
+    assert [json.loads(p["authors"]) for p in resp.json()] == [[{"name": "B", "org": "O"}]]
+
+def test_bulk_upsert_statement_count():
+    """
+    测试批量写入按绑定参数上限分为少量多行语句，而不是逐行写入；回退路径语义一致。
+    """
+    from sqlalchemy import event
+    from backend.app.persistence.upsert import bulk_upsert, _fallback_upsert
+    session = Session()
+    scholar = Scholar(aminer_id="U3", name="W")
+    session.add(scholar)
+    session.commit()
+    rows = [{"aminer_id": f"bulk{i}", "scholar_id": scholar.id, "title": f"t{i}", "year": 2020} for i in range(10000)]
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        written = bulk_upsert(session, Paper, rows, mode="update")
+        session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(written) == 10000 and written[0]["id"]
+    # 5列、SQLite参数上限32766 -> 每条语句6553行
+    assert len(statements) == 2
+    changed = [dict(rows[0], year=2021), rows[1], dict(rows[0], aminer_id="bulk-new")]
+    written = _fallback_upsert(session, Paper, changed, "update_if_changed", "aminer_id", ("scholar_id",), True)
+    session.commit()
+    assert [row["aminer_id"] for row in written] == ["bulk0", "bulk-new"]
+    assert session.query(Paper).filter(Paper.aminer_id == "bulk0").one().year == 2021
+    session.close()
@@ -89,4 +89,83 @@ def test_patents_permission():
     权限场景：未认证用户访问，返回401。
     """
     resp = client.get(f"/api/scholars/{SCHOLAR_ID}/patents")
-    assert resp.status_code == 401 or resp.status_code == 403 
\ No newline at end of file
+    assert resp.status_code == 401 or resp.status_code == 403 
+
+# --- 分页流式输出测试（不访问AMiner） ---
+def test_papers_streamed_across_pages(monkeypatch):
+    """
+    论文接口按页拉取并流式输出，结构与一次性返回一致，且遵守size上限。
+    """
+    import aminer.async_api as aminer_async
+    calls = []
+
+    async def fake_search(scholar_id, size=10, needDetails=True, page=0, batcher=None):
+        calls.append((page, size))
+        start = page * size
+        return {"hitList": [{"id": f"P{i}", "title": f"论文{i}"} for i in range(start, min(start + size, 250))], "hitsTotal": 250}
+
+    monkeypatch.setattr(aminer_async, "search_papers_by_scholar_free", fake_search)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get(f"/api/scholars/{SCHOLAR_ID}/papers?size=120&page_size=50", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["hitsTotal"] == 250
+    assert [p["id"] for p in data["hitList"]] == [f"P{i}" for i in range(120)]
+    assert "truncated" not in data
+    assert calls == [(0, 50), (1, 50), (2, 50)]
+
+
+def test_papers_first_page_error(monkeypatch):
+    """
+    首页拉取失败时返回500，而不是返回被截断的200响应。
+    """
+    import aminer.async_api as aminer_async
+
+    async def failing_search(scholar_id, size=10, needDetails=True, page=0, batcher=None):
+        raise Exception("AMiner API请求失败，状态码: 502")
+
+    monkeypatch.setattr(aminer_async, "search_papers_by_scholar_free", failing_search)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get(f"/api/scholars/{SCHOLAR_ID}/papers", headers=headers)
+    assert resp.status_code == 500
+
+
+def test_papers_later_page_error(monkeypatch):
+    """
+    首页之后的页拉取失败时，响应仍为合法JSON，但带 truncated 与 error 字段，调用方可判断结果不完整。
+    """
+    import aminer.async_api as aminer_async
+
+    async def flaky_search(scholar_id, size=10, needDetails=True, page=0, batcher=None):
+        if page == 1:
+            raise Exception("AMiner API请求失败，状态码: 502")
+        start = page * size
+        return {"hitList": [{"id": f"P{i}"} for i in range(start, start + size)], "hitsTotal": 250}
+
+    monkeypatch.setattr(aminer_async, "search_papers_by_scholar_free", flaky_search)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get(f"/api/scholars/{SCHOLAR_ID}/papers?size=120&page_size=50", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["truncated"] is True and "502" in data["error"]
+    assert [p["id"] for p in data["hitList"]] == [f"P{i}" for i in range(50)]
+    assert data["hitsTotal"] == 250
+
+
+def test_patents_streamed_across_pages(monkeypatch):
+    """
+    专利接口读取首页总数后并发拉取剩余页，按页码顺序流式输出。
+    """
+    import aminer.async_api as aminer_async
+
+    async def fake_search(scholar_id, size=10, needDetails=True, page=0, query=""):
+        start = page * size
+        return {"hitList": [{"id": f"T{i}"} for i in range(start, min(start + size, 130))], "hitsTotal": 130}
+
+    monkeypatch.setattr(aminer_async, "search_patents_by_scholar_free", fake_search)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get(f"/api/scholars/{SCHOLAR_ID}/patents?size=1000&page_size=20", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["hitsTotal"] == 130
+    assert [p["id"] for p in data["hitList"]] == [f"T{i}" for i in range(130)]
@@ -180,4 +180,73 @@ def test_scholars_list_permission():
     权限场景：未认证用户访问，返回401。
     """
     resp = client.get("/api/scholars/list", params={"size": 2, "offset": 0})
-    assert resp.status_code == 401 or resp.status_code == 403 
\ No newline at end of file
+    assert resp.status_code == 401 or resp.status_code == 403 
+
+def test_bulk_person_details(monkeypatch):
+    """
+    批量详情接口：合并请求，返回可直接用于创建学者的数据，并列出缺失ID。
+    """
+    import aminer.async_api as aminer_async
+    person = load_real_persons()[0]
+    calls = []
+
+    async def fake_details(ids, chunk_size=50):
+        calls.append((list(ids), chunk_size))
+        return {"data": {person["id"]: person}, "missing": [i for i in ids if i != person["id"]]}
+
+    monkeypatch.setattr(aminer_async, "get_person_details_by_ids", fake_details)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.post("/api/scholars/aminer/details?chunk_size=20", json=[person["id"], "missing_id"], headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert calls == [([person["id"], "missing_id"], 20)]
+    assert data["missing"] == ["missing_id"]
+    assert data["data"][0]["aminer_id"] == person["id"]
+    resp = client.post("/api/scholars", json=data["data"][0], headers=headers)
+    assert resp.status_code == 201
+    # 未认证
+    resp = client.post("/api/scholars/aminer/details", json=[person["id"]])
+    assert resp.status_code in (401, 403)
+
+def test_scholar_detail_circuit_open(monkeypatch):
+    """
+    AMiner主机熔断时快速失败：返回503并带Retry-After头，诊断接口可查看熔断器状态。
+    """
+    import aminer.async_api as aminer_async
+    from aminer.resilience import CircuitOpenError
+
+    async def fake_detail(person_id):
+        raise CircuitOpenError("datacenter.aminer.cn", 12.3)
+
+    monkeypatch.setattr(aminer_async, "get_person_detail_by_id", fake_detail)
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get("/api/scholars/aminer/some_id/detail", headers=headers)
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "13"
+    resp = client.get("/api/diagnostics/aminer", headers=headers)
+    assert resp.status_code == 200
+    assert "breakers" in resp.json() and "cache" in resp.json()
+
+def test_concurrent_detail_lookups_coalesced(monkeypatch):
+    """
+    同一学者详情的并发请求只访问一次AMiner，其余请求共享结果。
+    """
+    import asyncio
+    import aminer.async_api as aminer_async
+    from backend.app.main import call_aminer
+    calls = []
+
+    async def fake_detail(person_id):
+        calls.append(person_id)
+        await asyncio.sleep(0.05)
+        return {"id": person_id}
+
+    monkeypatch.setattr(aminer_async, "get_person_detail_by_id", fake_detail)
+
+    async def run():
+        return await asyncio.gather(*[
+            call_aminer("person_detail", aminer_async.get_person_detail_by_id, "p1") for _ in range(5)
+        ])
+
+    assert asyncio.run(run()) == [{"id": "p1"}] * 5
+    assert calls == ["p1"]
@@ -0,0 +1,282 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys, os, json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+from aminer import api as aminer_api
+from aminer.fake_server import FakeAMinerData, serve_in_thread
+
+PERSON_ID = "56066a5245cedb339687488b"
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+HEADERS = {"Authorization": basic_auth_header("admin", "admin")}
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def fake_aminer(monkeypatch):
+    """启动AMiner替身服务（每位学者约60篇论文、20项专利），并将aminer_api指向它。"""
+    monkeypatch.setenv("AMINER_TOKEN", "fake-token")
+    data = FakeAMinerData(seed=3, scholars=0, papers_per_scholar=60, patents_per_scholar=20)
+    server, base_url = serve_in_thread(data=data)
+    for name in ("DATACENTER_URL", "APIV2_URL", "SEARCH_URL"):
+        monkeypatch.setattr(aminer_api, name, base_url)
+    yield server, data
+    server.shutdown()
+    server.server_close()
+
+def create_scholar(aminer_id: str = PERSON_ID) -> int:
+    session = Session()
+    scholar = Scholar(aminer_id=aminer_id, name="placeholder")
+    session.add(scholar)
+    session.commit()
+    scholar_id = scholar.id
+    session.close()
+    return scholar_id
+
+def test_sync_fetches_details_only_for_new_and_changed(fake_aminer):
+    """
+    测试两阶段同步：首次同步写入全部论文与专利；之后只为新增或变化的条目请求详情页。
+    """
+    server, data = fake_aminer
+    scholar_id = create_scholar()
+    paper_total = data.paper_count(PERSON_ID)
+    patent_total = data.patent_count(PERSON_ID)
+    resp = client.post(f"/api/scholars/{scholar_id}/sync?detail_page_size=20", headers=HEADERS)
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["papers"]["listed"] == result["papers"]["new"] == result["papers"]["fetched"] == paper_total
+    assert result["papers"]["detail_pages"] == -(-paper_total // 20)
+    assert result["patents"]["new"] == patent_total
+    session = Session()
+    assert session.query(Paper).filter_by(scholar_id=scholar_id).count() == paper_total
+    paper = session.query(Paper).filter_by(aminer_id=data.paper(PERSON_ID, 0, paper_total)["id"]).one()
+    assert isinstance(json.loads(paper.authors), list) and paper.abstract
+    patent = session.query(Patent).filter_by(aminer_id=data.patent(PERSON_ID, 0, patent_total)["id"]).one()
+    assert patent.pub_num == data.patent(PERSON_ID, 0, patent_total)["pubNum"]
+
+    # 删除最后一篇论文、修改第3篇论文的引用数，再次同步只请求这两篇所在的详情页
+    assert paper_total > 20
+    deleted = data.paper(PERSON_ID, paper_total - 1, paper_total)
+    stale = data.paper(PERSON_ID, 3, paper_total)
+    session.query(Paper).filter_by(aminer_id=deleted["id"]).delete()
+    session.query(Paper).filter_by(aminer_id=stale["id"]).update({"num_citation": stale["num_citation"] + 1})
+    session.commit()
+    resp = client.post(f"/api/scholars/{scholar_id}/sync?detail_page_size=20&patents=false", headers=HEADERS)
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["patents"] is None
+    assert result["papers"] == {"listed": paper_total, "new": 1, "changed": 1, "detail_pages": 2, "fetched": 2, "missing": 0}
+    session.expire_all()
+    assert session.query(Paper).filter_by(aminer_id=deleted["id"]).count() == 1
+    assert session.query(Paper).filter_by(aminer_id=stale["id"]).one().num_citation == stale["num_citation"]
+
+    # 没有变化时不请求任何详情页
+    resp = client.post(f"/api/scholars/{scholar_id}/sync", headers=HEADERS)
+    assert resp.json()["papers"]["detail_pages"] == 0
+    assert resp.json()["patents"]["detail_pages"] == 0
+    session.close()
+
+def test_sync_unknown_scholar_and_aminer_error(fake_aminer):
+    """
+    测试学者不存在返回404；AMiner请求失败时返回500且不写入数据。
+    """
+    server, data = fake_aminer
+    resp = client.post("/api/scholars/999999/sync", headers=HEADERS)
+    assert resp.status_code == 404
+    scholar_id = create_scholar()
+    server.error_rate = 1.0
+    resp = client.post(f"/api/scholars/{scholar_id}/sync?patents=false", headers=HEADERS)
+    assert resp.status_code in (500, 503)
+    session = Session()
+    assert session.query(Paper).count() == 0
+    log = session.query(SyncLog).filter_by(scholar_id=scholar_id).one()
+    assert log.action == "refresh" and log.status == "fail" and "503" in log.message
+    session.close()
+    resp = client.post(f"/api/scholars/{scholar_id}/sync")
+    assert resp.status_code in (401, 403)
+
+def test_fetch_details_follows_reordered_items():
+    """
+    测试详情页与轻量列表顺序不一致时，会再请求相邻页找到条目。
+    """
+    import asyncio
+    from backend.app.sync import diff_listing, fetch_details, PAPER_COMPARE_FIELDS
+    listing = [{"id": f"p{i}", "title": f"t{i}", "num_citation": i} for i in range(30)]
+    existing = {f"p{i}": {"title": f"t{i}", "num_citation": i} for i in range(30) if i != 9}
+    existing["p20"]["num_citation"] = 0
+    wanted, changed = diff_listing(listing, existing, PAPER_COMPARE_FIELDS)
+    assert wanted == {9: "p9", 20: "p20"} and changed == {"p20"}
+    # 详情请求时 p9 已移动到第1页
+    details = [dict(hit, abstract="a") for hit in listing]
+    details.insert(12, details.pop(9))
+    requested = []
+
+    async def fetch(page):
+        requested.append(page)
+        return {"hitList": details[page * 10:(page + 1) * 10], "hitsTotal": len(details)}
+
+    found, pages = asyncio.run(fetch_details(fetch, wanted, 10))
+    assert set(found) == {"p9", "p20"} and found["p9"]["abstract"] == "a"
+    assert requested == [0, 2, 1] and pages == 3
+
+def test_fetch_details_bounded_concurrency():
+    """
+    测试详情页请求数很多时，同时进行的请求不超过 concurrency，全部页仍被请求；任一页失败时取消其余请求。
+    """
+    import asyncio
+    from backend.app.sync import fetch_details
+    wanted = {position: f"p{position}" for position in range(0, 2000, 10)}
+    in_flight = [0, 0]
+
+    async def fetch(page):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0)
+        in_flight[0] -= 1
+        return {"hitList": [{"id": f"p{page * 10}"}], "hitsTotal": 2000}
+
+    found, pages = asyncio.run(fetch_details(fetch, wanted, 10, concurrency=4))
+    assert len(found) == 200 and pages == 200
+    assert in_flight[1] == 4
+    started = []
+
+    async def failing(page):
+        started.append(page)
+        await asyncio.sleep(0)
+        if page == 30:
+            raise RuntimeError("boom")
+        return {"hitList": [{"id": f"p{page * 10}"}], "hitsTotal": 2000}
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(fetch_details(failing, wanted, 10, concurrency=4))
+    assert len(started) < 100
+
+def test_sync_writes_scholar_detail_and_sync_log(fake_aminer):
+    """
+    测试同步更新学者详情，并写入包含条数与耗时的成功SyncLog。
+    """
+    server, data = fake_aminer
+    scholar_id = create_scholar()
+    resp = client.post(f"/api/scholars/{scholar_id}/sync", headers=HEADERS)
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["status"] == "success" and result["detail"] is True and result["duration"] >= 0
+    session = Session()
+    assert session.get(Scholar, scholar_id).name == data.person(PERSON_ID)["name"]
+    log = session.query(SyncLog).filter_by(scholar_id=scholar_id).one()
+    assert log.action == "refresh" and log.status == "success"
+    assert json.loads(log.message) == result
+    session.close()
+
+def test_batch_sync_runs_scholars_concurrently(fake_aminer, monkeypatch):
+    """
+    测试批量同步全部学者：并发上限生效，单个学者失败不影响其他学者。
+    """
+    import asyncio
+    from backend.app import sync as scholar_sync
+    server, data = fake_aminer
+    ids = [create_scholar(aminer_id) for aminer_id in (PERSON_ID, "0" * 24, "1" * 24)]
+    missing_id = create_scholar("not-an-aminer-id")
+    resp = client.post("/api/sync?concurrency=2", headers=HEADERS)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["scholar_id"] for r in body["results"]] == sorted(ids + [missing_id])
+    assert body["success"] == 4 and body["fail"] == 0
+    by_id = {r["scholar_id"]: r for r in body["results"]}
+    assert by_id[missing_id]["detail"] is False and by_id[missing_id]["papers"]["listed"] == 0
+    session = Session()
+    assert session.query(Paper).count() == sum(data.paper_count(a) for a in (PERSON_ID, "0" * 24, "1" * 24))
+    assert session.query(SyncLog).filter_by(status="success").count() == 4
+    session.close()
+
+    # 并发上限
+    running, peak = [0], [0]
+
+    async def fake_sync(session_factory, scholar_id, **kwargs):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        if scholar_id == ids[0]:
+            raise RuntimeError("boom")
+        return {"scholar_id": scholar_id, "status": "success"}
+
+    monkeypatch.setattr(scholar_sync, "sync_scholar", fake_sync)
+    results = asyncio.run(scholar_sync.sync_scholars(None, ids + [missing_id], concurrency=2))
+    assert peak[0] == 2
+    assert results[0]["status"] == "fail" and results[0]["error"] == "boom"
+    assert [r["status"] for r in results[1:]] == ["success"] * 3
+
+def test_batch_sync_merges_paper_requests(fake_aminer, monkeypatch):
+    """
+    测试同时刷新多个学者时，各学者的论文检索经网关合并器合并为一次POST。
+    """
+    import asyncio
+    from aminer import batching
+    from backend.app import sync as scholar_sync
+    server, data = fake_aminer
+    ids = [create_scholar(aminer_id) for aminer_id in ("2" * 24, "3" * 24, "4" * 24)]
+    # 首次同步写入全部论文，之后的刷新只请求每个学者的一页轻量列表
+    asyncio.run(scholar_sync.sync_scholars(Session, ids, detail=False, patents=False))
+    server.requests.clear()
+    batchers = []
+
+    def get_gateway_batcher():
+        if not batchers:
+            batchers.append(batching.GatewayBatcher(max_batch=16, max_wait=0.2))
+        return batchers[0]
+
+    monkeypatch.setattr(batching, "get_gateway_batcher", get_gateway_batcher)
+    results = asyncio.run(scholar_sync.sync_scholars(Session, ids, concurrency=3, detail=False, patents=False))
+    assert [r["status"] for r in results] == ["success"] * 3
+    assert [r["papers"]["listed"] for r in results] == [data.paper_count(a) for a in ("2" * 24, "3" * 24, "4" * 24)]
+    assert server.requests["/n"] == 1
+    assert batchers[0].requests_sent == 1 and batchers[0].actions_sent == 3
+
+def test_sync_scholar_deleted_before_write(fake_aminer, monkeypatch):
+    """
+    测试拉取期间学者被删除时抛出 LookupError（接口返回404），不写入论文与 SyncLog。
+    """
+    import asyncio
+    from backend.app import sync as scholar_sync
+    scholar_id = create_scholar()
+    write = scholar_sync._write
+
+    def delete_then_write(session_factory, *args):
+        with session_factory() as db:
+            db.query(Scholar).filter_by(id=scholar_id).delete()
+            db.commit()
+        return write(session_factory, *args)
+
+    monkeypatch.setattr(scholar_sync, "_write", delete_then_write)
+    with pytest.raises(LookupError):
+        asyncio.run(scholar_sync.sync_scholar(Session, scholar_id, patents=False))
+    session = Session()
+    assert session.query(Paper).count() == 0
+    assert session.query(SyncLog).count() == 0
+    session.close()
@@ -0,0 +1,148 @@
+import pytest
+import sys, os, json, gzip, csv
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app  # noqa: F401  确保表已创建
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from backend.app.persistence import bulk_import
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def scholar_id():
+    session = Session()
+    scholar = Scholar(aminer_id="S1", name="S")
+    session.add(scholar)
+    session.commit()
+    scholar_id = scholar.id
+    session.close()
+    return scholar_id
+
+def write_ndjson(path, rows):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+def test_import_ndjson_gz(tmp_path, scholar_id):
+    """
+    测试导入 gzip 压缩的 NDJSON 论文：缺失字段取 PaperIn 默认值，分块提交并报告进度，完成后重复运行不再导入。
+    """
+    path = str(tmp_path / "papers.ndjson.gz")
+    rows = [{"aminer_id": f"p{i}", "scholar_id": scholar_id, "title": f"标题\t{i}", "authors": json.dumps([{"name": "A"}]),
+             "id": 999, "year": 2000 + i % 20} for i in range(250)]
+    write_ndjson(path, rows + [dict(rows[0], title="last")])
+    reports = []
+    result = bulk_import.import_file(engine, "papers", path, chunk_size=100, progress=lambda s: reports.append(s["records"]))
+    assert reports == [100, 200, 251]
+    assert result["done"] and result["records"] == 251 and result["inserted"] == 250
+    session = Session()
+    assert session.query(Paper).count() == 250
+    paper = session.query(Paper).filter(Paper.aminer_id == "p1").one()
+    assert paper.title == "标题\t1" and json.loads(paper.authors) == [{"name": "A"}]
+    assert paper.abstract == "" and paper.num_citation == 0 and paper.id != 999
+    session.close()
+    again = bulk_import.import_file(engine, "papers", path, chunk_size=100)
+    assert again["records"] == 251 and again["rate"] == 0
+    # update 模式：覆盖已存在的
+    write_ndjson(path, [dict(rows[0], title="new")])
+    result = bulk_import.import_file(engine, "papers", path, mode="update", restart=True)
+    assert result["written"] == 1 and result["inserted"] == 0
+    session = Session()
+    assert session.query(Paper).filter(Paper.aminer_id == "p0").one().title == "new"
+    session.close()
+
+def test_import_csv_scholars(tmp_path):
+    """
+    测试导入学者CSV：空单元格取默认值，结构化字段为JSON文本，支持含换行的引号字段。
+    """
+    path = str(tmp_path / "scholars.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["aminer_id", "name", "tags", "num_viewed", "work"])
+        writer.writerow(["a1", "张三", json.dumps(["AI"]), "7", "line1\nline2"])
+        writer.writerow(["a2", "李四", "", "", ""])
+    result = bulk_import.import_file(engine, "scholars", path)
+    assert result["records"] == 2 and result["inserted"] == 2
+    session = Session()
+    a1 = session.query(Scholar).filter(Scholar.aminer_id == "a1").one()
+    a2 = session.query(Scholar).filter(Scholar.aminer_id == "a2").one()
+    assert a1.tags == ["AI"] and a1.num_viewed == 7 and a1.work == "line1\nline2"
+    assert a2.tags == [] and a2.num_viewed == 0 and a2.indices == {}
+    session.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(",缺少ID,,,\n")
+    with pytest.raises(ValueError):
+        bulk_import.import_file(engine, "scholars", path, restart=True)
+
+def test_import_resumes_after_failure(tmp_path, scholar_id, monkeypatch):
+    """
+    测试断点续传：分块失败后状态停留在上一个已提交分块，重新运行从该位置继续；输入文件变化时拒绝续传。
+    """
+    path = str(tmp_path / "patents.ndjson")
+    write_ndjson(path, [{"aminer_id": f"t{i}", "scholar_id": scholar_id, "title": "{}"} for i in range(30)])
+    real_upsert = bulk_import.bulk_upsert
+    calls = []
+
+    def failing_upsert(db, model, rows, mode):
+        calls.append(rows[0]["aminer_id"])
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return real_upsert(db, model, rows, mode=mode)
+
+    monkeypatch.setattr(bulk_import, "bulk_upsert", failing_upsert)
+    with pytest.raises(RuntimeError):
+        bulk_import.import_file(engine, "patents", path, chunk_size=10)
+    with open(path + ".import-state.json", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["records"] == 10 and not state["done"]
+    result = bulk_import.import_file(engine, "patents", path, chunk_size=10)
+    assert calls == ["t0", "t10", "t10", "t20"]
+    assert result["resumed_from"] == state["offset"] and result["records"] == 30 and result["inserted"] == 30
+    session = Session()
+    assert session.query(Patent).count() == 30
+    session.close()
+    write_ndjson(path, [{"aminer_id": "t99", "scholar_id": scholar_id, "title": "{}"}])
+    with pytest.raises(ValueError):
+        bulk_import.import_file(engine, "patents", path)
+
+def test_read_records_offset_and_copy_line(tmp_path):
+    """
+    测试按位置继续读取（CSV 仍读取表头），以及 COPY 文本格式的转义。
+    """
+    path = str(tmp_path / "x.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("aminer_id,name\na,1\nb,2\n")
+    records = list(bulk_import.read_records(path))
+    assert [r for r, _ in records] == [{"aminer_id": "a", "name": "1"}, {"aminer_id": "b", "name": "2"}]
+    assert list(bulk_import.read_records(path, offset=records[0][1])) == records[1:]
+    encoders = bulk_import._json_encoders(Paper.__table__, ["title", "pdf", "authors", "urls"])
+    row = {"title": "a\tb\\c\nd", "pdf": None, "authors": '[{"name": "张三"}]', "urls": ""}
+    line = bulk_import._copy_line(row, encoders, 3)
+    # JSONText 列按结构化JSON写入，不可解析的字符串写为JSON字符串
+    assert line == 'a\\tb\\\\c\\nd\t\\N\t[{"name": "张三"}]\t""\t3\n'
+
+def test_bulk_import_does_not_import_api():
+    """
+    测试导入命令不依赖接口层：导入 bulk_import 不会导入 main（创建引擎、执行迁移、构建应用）。
+    """
+    import subprocess
+    code = "import sys, backend.app.persistence.bulk_import; assert 'backend.app.main' not in sys.modules"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
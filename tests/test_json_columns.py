@@ -0,0 +1,100 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.app.main import app
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from backend.app.persistence.types import json_array_contains
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+HEADERS = {"Authorization": basic_auth_header("admin", "admin")}
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def scholar_id():
+    session = Session()
+    scholar = Scholar(aminer_id="J1", name="J")
+    session.add(scholar)
+    session.commit()
+    scholar_id = scholar.id
+    session.close()
+    return scholar_id
+
+def test_author_and_inventor_filters(scholar_id):
+    for i, names in enumerate([["张三", "李四"], ["李四"], ["王五"]]):
+        resp = client.post("/api/papers", json={
+            "aminer_id": f"jp{i}", "scholar_id": scholar_id, "title": f"t{i}",
+            "authors": json.dumps([{"name": name, "org": "o"} for name in names], ensure_ascii=False),
+        }, headers=HEADERS)
+        assert resp.status_code == 201
+        resp = client.post("/api/patents", json={
+            "aminer_id": f"jt{i}", "scholar_id": scholar_id, "title": "{}",
+            "inventor": json.dumps([{"name": name} for name in names], ensure_ascii=False),
+        }, headers=HEADERS)
+        assert resp.status_code == 201
+    # 非JSON的旧数据（默认值 ""）不参与匹配，也不报错
+    client.post("/api/papers", json={"aminer_id": "jp9", "scholar_id": scholar_id, "title": "t9"}, headers=HEADERS)
+
+    resp = client.get("/api/papers/list", params={"author": "李四"}, headers=HEADERS)
+    assert resp.status_code == 200
+    assert sorted(item["aminer_id"] for item in resp.json()["data"]) == ["jp0", "jp1"]
+    resp = client.get("/api/papers/list", params={"author": "李"}, headers=HEADERS)
+    assert resp.json()["total"] == 0
+    resp = client.get("/api/patents/list", params={"inventor": "王五"}, headers=HEADERS)
+    assert [item["aminer_id"] for item in resp.json()["data"]] == ["jt2"]
+
+def test_json_text_round_trip(scholar_id):
+    session = Session()
+    session.add(Paper(aminer_id="r1", scholar_id=scholar_id, title="t", authors='[{"name": "张三"}]', urls=""))
+    session.commit()
+    # 库中为结构化JSON，读取时为JSON字符串
+    assert session.execute(select(Paper.__table__.c.authors)).scalar() == '[{"name": "张三"}]'
+    raw = session.connection().exec_driver_sql("SELECT authors, urls FROM papers").one()
+    assert json.loads(raw[0]) == [{"name": "张三"}]
+    assert raw[1] == '""'
+    paper = session.query(Paper).one()
+    assert paper.urls == ""
+    session.close()
+
+def test_postgresql_jsonb_and_gin_index():
+    dialect = postgresql.dialect()
+    ddl = str(CreateTable(Paper.__table__).compile(dialect=dialect))
+    assert "authors JSONB" in ddl
+    assert "indices JSONB" in str(CreateTable(Scholar.__table__).compile(dialect=dialect))
+    index = next(i for i in Paper.__table__.indexes if i.name == "ix_papers_authors_gin")
+    assert str(CreateIndex(index).compile(dialect=dialect)) == \
+        "CREATE INDEX ix_papers_authors_gin ON papers USING gin (authors jsonb_path_ops)"
+    sql = str(select(Paper.id).where(json_array_contains(Paper.authors, "name", "张三")).compile(dialect=dialect))
+    assert "papers.authors @> CAST(" in sql and "AS JSONB)" in sql
+
+def test_gin_index_not_created_on_sqlite():
+    with engine.connect() as conn:
+        names = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "ix_papers_authors_gin" not in names
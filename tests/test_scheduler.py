@@ -0,0 +1,140 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys, os, json, asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from datetime import datetime, timedelta, timezone
+from backend.app.main import app
+from backend.app.persistence.models import Scholar, Paper, Patent, SyncLog
+from backend.app import scheduler as refresh_scheduler
+from backend.app import sync as scholar_sync
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+load_dotenv()
+
+client = TestClient(app)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+engine = create_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+def basic_auth_header(username: str, password: str) -> str:
+    import base64
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """每个测试前清理所有表，保证测试隔离。"""
+    session = Session()
+    session.query(Paper).delete()
+    session.query(Patent).delete()
+    session.query(SyncLog).delete()
+    session.query(Scholar).delete()
+    session.commit()
+    session.close()
+
+def db_now() -> datetime:
+    # SQLite 的 CURRENT_TIMESTAMP 为UTC时间
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def add_scholar(session, name, logs=(), recent_papers=0) -> int:
+    """新增学者及其同步日志，logs 为 (status, 距今秒数, 统计) 列表。"""
+    scholar = Scholar(aminer_id=name, name=name)
+    session.add(scholar)
+    session.flush()
+    for status, age, stats in logs:
+        session.add(SyncLog(scholar_id=scholar.id, action="refresh", status=status,
+                            message=json.dumps(stats) if stats else "error", created_at=db_now() - timedelta(seconds=age)))
+    for i in range(recent_papers):
+        session.add(Paper(aminer_id=f"{name}-p{i}", scholar_id=scholar.id, title="t", year=db_now().year))
+    session.commit()
+    return scholar.id
+
+STATS = {"detail": True, "papers": {"listed": 10, "detail_pages": 2}, "patents": {"listed": 3, "detail_pages": 0}}
+
+@pytest.fixture
+def scholars():
+    session = Session()
+    ids = {
+        "fresh": add_scholar(session, "fresh", [("success", 600, STATS)]),
+        "stale": add_scholar(session, "stale", [("success", 2 * 86400, STATS)]),
+        # 活跃学者刷新间隔为6小时
+        "active": add_scholar(session, "active", [("success", 7 * 3600, STATS)], recent_papers=5),
+        # 失败两次，退避 300*2=600 秒，最近一次失败在30分钟前 -> 到期
+        "retry": add_scholar(session, "retry", [("success", 3 * 86400, STATS), ("fail", 7200, None), ("fail", 1800, None)]),
+        # 最近一次失败在1分钟前 -> 未到期
+        "backoff": add_scholar(session, "backoff", [("success", 3 * 86400, STATS), ("fail", 7200, None), ("fail", 60, None)]),
+    }
+    session.close()
+    return ids
+
+def test_request_budget_refills_per_hour():
+    """
+    测试每小时预算按时间平滑恢复，且不超过容量。
+    """
+    now = [0.0]
+    budget = refresh_scheduler.RequestBudget(3600, clock=lambda: now[0])
+    budget.spend(3600)
+    assert budget.available() == 0
+    now[0] += 10
+    assert budget.available() == pytest.approx(10)
+    budget.spend(-10000)
+    assert budget.available() == 3600
+
+def test_queue_ordered_by_staleness_with_backoff(scholars):
+    """
+    测试到期队列：未到期与退避中的学者不入队，其余按逾期时长倒序；活跃学者使用更短的刷新间隔。
+    """
+    scheduler = refresh_scheduler.RefreshScheduler(Session, retry_base=300)
+    queue, _ = scheduler.queue()
+    assert [s["scholar_id"] for s in queue] == [scholars["stale"], scholars["active"], scholars["retry"]]
+    by_id = {s["scholar_id"]: s for s in queue}
+    assert by_id[scholars["active"]]["activity"] == 5
+    assert by_id[scholars["retry"]]["failures"] == 2
+    # 1 次详情 + 论文/专利各1页列表 + 2页详情
+    assert by_id[scholars["stale"]]["cost"] == refresh_scheduler.estimate_requests(STATS) == 5
+    assert 86400 - 60 < by_id[scholars["stale"]]["lag"] < 86400 + 60
+
+def test_queue_with_timezone_aware_now(scholars):
+    """
+    测试 PostgreSQL 的 now()（timestamptz，带时区）与不带时区的 DateTime 列比较：结果与不带时区时相同。
+    """
+    scheduler = refresh_scheduler.RefreshScheduler(Session, retry_base=300)
+    queue, now = scheduler.queue(now=datetime.now(timezone.utc))
+    assert now.tzinfo is None
+    assert [s["scholar_id"] for s in queue] == [scholars["stale"], scholars["active"], scholars["retry"]]
+
+def test_run_once_respects_budget(scholars, monkeypatch):
+    """
+    测试单个周期在预算内按队列顺序同步，并按实际请求数修正预算与指标。
+    """
+    synced = []
+
+    async def fake_sync_scholars(session_factory, scholar_ids, concurrency):
+        synced.extend(scholar_ids)
+        return [dict(STATS, scholar_id=i, status="success") for i in scholar_ids]
+
+    monkeypatch.setattr(scholar_sync, "sync_scholars", fake_sync_scholars)
+    scheduler = refresh_scheduler.RefreshScheduler(Session, budget_per_hour=12, retry_base=300)
+    results = asyncio.run(scheduler.run_once())
+    # 每个学者预计5次请求，预算12只够前两个
+    assert synced == [scholars["stale"], scholars["active"]]
+    assert len(results) == 2
+    metrics = scheduler.metrics()
+    assert metrics["synced"] == 2 and metrics["requests"] == 10 and metrics["runs"] == 1
+    assert metrics["budget_available"] == pytest.approx(2, abs=0.1)
+    # 假同步没有写入 SyncLog，队列不变
+    assert metrics["queue_depth"] == 3 and metrics["max_lag"] > 86000
+
+def test_scheduler_diagnostics(scholars):
+    """
+    测试调度器诊断接口返回队列深度与延迟。
+    """
+    headers = {"Authorization": basic_auth_header("admin", "admin")}
+    resp = client.get("/api/diagnostics/scheduler", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["running"] is False
+    assert data["queue_depth"] >= 2 and data["max_lag"] > 0
+    assert client.get("/api/diagnostics/scheduler").status_code in (401, 403)